@@ -0,0 +1,73 @@
+"""Power Pit batch entrypoint: resumable rendering of scene × seed grids."""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from powerpit.batch import DEFAULT_RETRIES, MANIFEST_NAME, expand_jobs, run_batch
+from powerpit.logging_utils import configure_logging
+
+LOGGER = logging.getLogger(__name__)
+
+
+def parse_seeds(text: str) -> list[int]:
+    """`"1-5,9"` → `[1, 2, 3, 4, 5, 9]`."""
+
+    seeds: list[int] = []
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        seeds.extend(range(int(first), int(last or first) + 1))
+    return seeds
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Power Pit — rendu en batch reprenable")
+    parser.add_argument("scenes", nargs="+", help="Fichiers YAML de scène")
+    parser.add_argument("--seeds", default=None, help="Seeds à rendre pour chaque scène, ex. 1-100 ou 3,7,9")
+    parser.add_argument("--out-dir", required=True, help="Dossier des clips (SCENE_sSEED.mp4)")
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help=f"Manifeste JSON lines des jobs (défaut: OUT_DIR/{MANIFEST_NAME}) ; une relance saute les jobs terminés",
+    )
+    parser.add_argument("--workers", type=int, default=2, help="Nombre de workers préchauffés")
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Relances d'un job dont le worker a planté (défaut: %(default)s)",
+    )
+    parser.add_argument("--retry-failed", action="store_true", help="Relance aussi les jobs en échec d'un run précédent")
+    parser.add_argument("--resolution", type=int, default=None, help="Petit côté de la vidéo en pixels")
+    parser.add_argument("--cache-dir", default=None, help="Cache de rendu partagé par tous les jobs")
+    parser.add_argument("--report", default=None, help="Écrit le rapport de débit agrégé en JSON")
+    parser.add_argument("--verbose", action="store_true", help="Active le logging debug")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    configure_logging(verbose=args.verbose)
+
+    seeds = parse_seeds(args.seeds) if args.seeds else [None]
+    jobs = expand_jobs(args.scenes, seeds, args.out_dir)
+    manifest = args.manifest or Path(args.out_dir) / MANIFEST_NAME
+    options = {key: value for key in ("cache_dir", "resolution") if (value := getattr(args, key)) is not None}
+    report = run_batch(
+        jobs,
+        manifest,
+        workers=args.workers,
+        retries=max(0, args.retries),
+        retry_failed=args.retry_failed,
+        options=options,
+    )
+    LOGGER.info("Batch: %s", report.summary())
+    if args.report:
+        Path(args.report).write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Simulation throughput benchmark over the bundled and crowd scenes.
+
+    python benchmarks/bench_simulation.py               # toutes les scènes
+    python benchmarks/bench_simulation.py --ticks 30 scenes/crowd/ring_256.yaml
+    python benchmarks/bench_simulation.py --solver jacobi scenes/crowd/grid_1024.yaml
+    python benchmarks/bench_simulation.py --backend inhouse --backend vectorized --backend pymunk scenes/*.yaml
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from powerpit.scene import load_scene_config  # noqa: E402
+from powerpit.backends import BACKENDS, create_backend  # noqa: E402
+
+DEFAULT_SCENES = sorted(str(path.relative_to(ROOT)) for path in (ROOT / "scenes").rglob("*.yaml"))
+
+
+@dataclass
+class BenchResult:
+    scene: str
+    backend: str
+    balls: int
+    load_ms: float
+    ticks: int
+    ticks_per_second: float
+
+
+def bench_scene(
+    path: str, ticks: int, seed: int = 0, solver: str | None = None, backend: str | None = None
+) -> BenchResult:
+    start = time.perf_counter()
+    scene = load_scene_config(ROOT / path, seed=seed)
+    load_ms = (time.perf_counter() - start) * 1000.0
+    if solver is not None:
+        scene = dataclasses.replace(scene, solver=solver)
+
+    simulation = create_backend(scene, backend=backend)
+    simulation.step()  # warm-up (allocations, first-touch)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.step()
+    elapsed = time.perf_counter() - start
+    return BenchResult(
+        scene=path,
+        backend=backend or scene.backend,
+        balls=len(simulation.balls),
+        load_ms=load_ms,
+        ticks=ticks,
+        ticks_per_second=ticks / elapsed if elapsed > 0 else float("inf"),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de la simulation Power Pit")
+    parser.add_argument("scenes", nargs="*", default=DEFAULT_SCENES, help="Scènes YAML (défaut: toutes)")
+    parser.add_argument("--ticks", type=int, default=5, help="Ticks mesurés par scène")
+    parser.add_argument("--seed", type=int, default=0, help="Seed des générateurs de spawn")
+    parser.add_argument(
+        "--solver", choices=["sequential", "jacobi"], default=None, help="Solveur des contacts (défaut: celui de la scène)"
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="Backend physique à mesurer, répétable pour comparer (défaut: celui de la scène)",
+    )
+    parser.add_argument("--json", action="store_true", help="Sortie JSON lines")
+    args = parser.parse_args(argv)
+
+    for path in args.scenes:
+        for backend in args.backend or [None]:
+            result = bench_scene(path, args.ticks, seed=args.seed, solver=args.solver, backend=backend)
+            if args.json:
+                print(json.dumps(asdict(result)))
+            else:
+                print(
+                    f"{result.scene:<36} {result.backend:<10} balls={result.balls:>5}  "
+                    f"load={result.load_ms:7.1f} ms  {result.ticks_per_second:10.1f} ticks/s"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
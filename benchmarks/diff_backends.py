@@ -0,0 +1,70 @@
+"""Trajectory diff of a physics backend against the reference simulation.
+
+    python benchmarks/diff_backends.py                                   # vectorized vs inhouse, scènes fournies
+    python benchmarks/diff_backends.py --backend pymunk scenes/circle_holes.yaml
+    python benchmarks/diff_backends.py --video-dir out/diff scenes/circle_buffs.yaml
+
+Le code de sortie vaut 1 dès qu'une scène dépasse la tolérance ou diffère sur un
+événement (KO, buff, contact balle/balle ou balle/bumper), pour bloquer une régression en CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from powerpit.backends import BACKENDS  # noqa: E402
+from powerpit.scene import load_scene_config  # noqa: E402
+from powerpit.simulation import simulate_frames  # noqa: E402
+from powerpit.trajectory_diff import (  # noqa: E402
+    DEFAULT_EVENT_SLACK,
+    DEFAULT_TOLERANCE,
+    compare_snapshots,
+    render_diff_video,
+)
+
+DEFAULT_SCENES = sorted(str(path.relative_to(ROOT)) for path in (ROOT / "scenes").glob("*.yaml"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff de trajectoires entre backends physiques Power Pit")
+    parser.add_argument("scenes", nargs="*", default=DEFAULT_SCENES, help="Scènes YAML (défaut: scènes fournies)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="vectorized", help="Backend comparé")
+    parser.add_argument("--reference", choices=sorted(BACKENDS), default="inhouse", help="Backend de référence")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Écart de position toléré")
+    parser.add_argument(
+        "--event-slack", type=int, default=DEFAULT_EVENT_SLACK, help="Décalage toléré d'un événement (frames)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed des générateurs de spawn")
+    parser.add_argument("--video-dir", default=None, help="Écrit une vidéo côte à côte par scène dans ce dossier")
+    parser.add_argument("--json", action="store_true", help="Sortie JSON lines")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in args.scenes:
+        scene = load_scene_config(ROOT / path, seed=args.seed)
+        reference = list(simulate_frames(scene, backend=args.reference))
+        candidate = list(simulate_frames(scene, backend=args.backend))
+        diff = compare_snapshots(
+            reference, candidate, args.tolerance, args.event_slack, names=(args.reference, args.backend)
+        )
+        failures += not diff.passed
+        if args.json:
+            print(json.dumps({"scene": path, **diff.to_dict()}))
+        else:
+            print(f"{'OK  ' if diff.passed else 'ÉCHEC'} {path}: {diff.summary()}")
+        if args.video_dir is not None:
+            video = Path(args.video_dir) / f"{Path(path).stem}_{args.backend}_vs_{args.reference}.mp4"
+            render_diff_video(scene, reference, candidate, video, diff)
+            if not args.json:
+                print(f"     vidéo: {video}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
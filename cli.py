@@ -2,9 +2,18 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import logging
 
-from powerpit import build_rng, load_scene_config, render_scene
+from powerpit import load_scene_config, render_scene
+from powerpit.cache import DEFAULT_MAX_BYTES, RenderCache
+from powerpit.highlights import DEFAULT_HIGHLIGHT_SECONDS, DEFAULT_THUMBNAILS, THUMBNAIL_FORMATS, HighlightConfig
+from powerpit.live import run_live
+from powerpit.outputs import OutputSpecError, default_deliverables, parse_output_spec
+from powerpit.profiling import RenderProfiler
+from powerpit.render import ORIENTATIONS, REFERENCE_SHORT_SIDE, RenderSettings, frame_size_for
+from powerpit.replay import DEFAULT_REPLAY_SPEED, DEFAULT_REPLAY_WINDOW
+from powerpit.tiles import DEFAULT_TILE_HEIGHT
 from powerpit.logging_utils import configure_logging
 
 LOGGER = logging.getLogger(__name__)
@@ -14,24 +23,192 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Power Pit video generator (M1)")
     parser.add_argument("--scene", required=True, help="Chemin du fichier YAML de scène")
     parser.add_argument("--seed", type=int, default=None, help="Seed RNG (optionnel)")
-    parser.add_argument("--out", required=True, help="Chemin de sortie MP4")
+    parser.add_argument("--out", default=None, help="Chemin de sortie MP4 (requis sauf avec --live)")
     parser.add_argument("--verbose", action="store_true", help="Active le logging debug")
     parser.add_argument(
         "--show",
         action="store_true",
         help="Affiche la fenêtre de prévisualisation pendant l'export si pygame est disponible",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--resolution",
+        type=int,
+        default=REFERENCE_SHORT_SIDE,
+        help="Petit côté de la vidéo en pixels (1080 par défaut)",
+    )
+    parser.add_argument(
+        "--orientation",
+        choices=sorted(ORIENTATIONS),
+        default="vertical",
+        help="Cadrage: vertical 9:16 (défaut), horizontal 16:9 ou carré",
+    )
+    parser.add_argument(
+        "--supersample",
+        type=int,
+        choices=[1, 2, 3, 4],
+        default=1,
+        help="Rastérise à N× la résolution puis réduit (anticrénelage de toute la frame)",
+    )
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Brouillon rapide à demi-résolution (1/4 de la surface) pour passer des seeds en revue",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Aperçu en direct (pygame) rechargé à chaque modification de la scène, sans export ; "
+        "espace: pause, ←/→: ±1 s",
+    )
+    parser.add_argument("--trails", action="store_true", help="Active les trails colorés par équipe")
+    parser.add_argument("--glow", action="store_true", help="Active le halo lumineux (bloom)")
+    parser.add_argument(
+        "--raster-threads",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Threads de rastérisation par bandes horizontales (0: un par cœur ; même image qu'en séquentiel)",
+    )
+    parser.add_argument(
+        "--tile-height",
+        type=int,
+        default=DEFAULT_TILE_HEIGHT,
+        metavar="PX",
+        help=f"Hauteur des tuiles de rastérisation, en pixels de raster (défaut: {DEFAULT_TILE_HEIGHT})",
+    )
+    parser.add_argument(
+        "--also",
+        action="append",
+        default=[],
+        metavar="CHEMIN[,size=LxH][,fps=N][,codec=C][,preset=P][,frames=A-B]",
+        help=(
+            "Sortie supplémentaire encodée depuis le même rendu (répétable) ; .y4m: flux YUV4MPEG2 "
+            "(fichier, pipe nommé ou --also=-.y4m pour stdout), .frames: frame store mappé en mémoire"
+        ),
+    )
+    parser.add_argument(
+        "--deliverables",
+        action="store_true",
+        help="Ajoute une preview MP4 demi-résolution et une miniature WebP à côté de --out",
+    )
+    parser.add_argument(
+        "--highlights",
+        action="store_true",
+        help="Choisit miniatures et extrait depuis les données de simulation (impacts, frôlements, KO) et les écrit "
+        "à côté de --out (_thumbN, _highlight.mp4, _highlights.json)",
+    )
+    parser.add_argument("--thumbnails", type=int, default=DEFAULT_THUMBNAILS, help="Nombre de miniatures (--highlights)")
+    parser.add_argument(
+        "--thumbnail-format", choices=sorted(THUMBNAIL_FORMATS), default="png", help="Format des miniatures"
+    )
+    parser.add_argument(
+        "--highlight-seconds",
+        type=float,
+        default=DEFAULT_HIGHLIGHT_SECONDS,
+        help="Durée de l'extrait (défaut: %(default)s s)",
+    )
+    parser.add_argument(
+        "--end-when-settled",
+        type=float,
+        default=None,
+        metavar="SECONDES",
+        help="Termine le clip quand toutes les balles sont au repos depuis cette durée",
+    )
+    parser.add_argument("--hud", action="store_true", help="Affiche timer, score, seed et nom d'arène")
+    parser.add_argument(
+        "--interpolate",
+        type=int,
+        choices=[1, 2, 3, 4],
+        default=1,
+        metavar="N",
+        help="Frames de sortie par frame simulée, interpolées (2: 60 fps depuis une scène à 30 fps)",
+    )
+    parser.add_argument(
+        "--hitstop",
+        type=float,
+        default=0.0,
+        metavar="SECONDES",
+        help="Fige l'image sur les chocs violents (0.08 à 0.12 conseillé)",
+    )
+    parser.add_argument(
+        "--shake",
+        type=float,
+        default=0.0,
+        metavar="GAIN",
+        help="Tremblement de l'image en pixels par unité d'impulsion de contact (ex. 1.5)",
+    )
+    parser.add_argument(
+        "--ko-replay",
+        action="store_true",
+        help="Insère un replay ralenti après chaque KO (relu depuis l'historique, sans re-simulation)",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=DEFAULT_REPLAY_SPEED,
+        help="Vitesse des replays KO (défaut: %(default)s)",
+    )
+    parser.add_argument(
+        "--replay-window",
+        type=float,
+        default=DEFAULT_REPLAY_WINDOW,
+        metavar="SECONDES",
+        help="Durée d'historique conservée, donc durée rejouée (défaut: %(default)s)",
+    )
+    parser.add_argument("--profile", action="store_true", help="Affiche le temps passé par étape du rendu")
+    parser.add_argument(
+        "--precision",
+        choices=["float32", "float64"],
+        default=None,
+        help="Précision de la physique (remplace le champ 'precision' de la scène)",
+    )
+    parser.add_argument(
+        "--solver",
+        choices=["sequential", "jacobi"],
+        default=None,
+        help="Solveur des contacts balle-balle (remplace le champ 'solver' de la scène)",
+    )
+    parser.add_argument(
+        "--solver-iterations",
+        type=int,
+        default=None,
+        help="Itérations du solveur 'jacobi' par tick",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["inhouse", "vectorized", "pymunk"],
+        default=None,
+        help="Backend physique (remplace le champ 'backend' de la scène; 'pymunk' requiert pymunk)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Dossier du cache de rendu: un clip déjà rendu (même scène, seed, réglages, version) est réutilisé",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help="Taille maximale du cache en Mo (éviction LRU)",
+    )
+    args = parser.parse_args()
+    if args.out is None and not args.live:
+        parser.error("l'option --out est requise (sauf avec --live)")
+    return args
 
 
 def main() -> int:
     args = parse_args()
     configure_logging(verbose=args.verbose)
 
-    rng = build_rng(args.seed)
-    LOGGER.debug("RNG initialisé avec seed=%s", rng.seed())
-
-    scene = load_scene_config(args.scene)
+    overrides = {
+        field: value
+        for field, value in (("precision", args.precision), ("solver", args.solver), ("backend", args.backend))
+        if value is not None
+    }
+    if args.solver_iterations is not None:
+        overrides["solver_iterations"] = max(1, args.solver_iterations)
+    scene = dataclasses.replace(load_scene_config(args.scene, seed=args.seed), **overrides)
     LOGGER.info(
         "Scène chargée — name=%s, arena=%s, duration=%.2fs, fps=%d",
         scene.name,
@@ -40,7 +217,56 @@ def main() -> int:
         scene.frame_rate,
     )
 
-    output = render_scene(scene, args.out, show_preview=args.show)
+    cache = RenderCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024**2) if args.cache_dir else None
+    short_side = args.resolution // 2 if args.draft else args.resolution
+    settings = RenderSettings(
+        frame_size=frame_size_for(short_side, args.orientation),
+        supersample=args.supersample,
+        trails=args.trails,
+        glow=args.glow,
+        hud=args.hud,
+        settle_after=args.end_when_settled,
+        interpolate=args.interpolate,
+        hitstop=args.hitstop,
+        shake=args.shake,
+        ko_replay=args.ko_replay,
+        replay_speed=args.replay_speed,
+        replay_window=args.replay_window,
+        raster_threads=max(0, args.raster_threads),
+        tile_height=max(1, args.tile_height),
+    )
+    if args.live:
+        return run_live(args.scene, seed=args.seed, settings=settings, overrides=overrides)
+    try:
+        outputs = [parse_output_spec(text) for text in args.also]
+    except OutputSpecError as exc:
+        LOGGER.error("%s", exc)
+        return 2
+    if args.deliverables:
+        outputs += default_deliverables(args.out, settings.frame_size, settings.output_frame_rate(scene))
+    highlights = (
+        HighlightConfig(
+            thumbnails=max(0, args.thumbnails),
+            thumbnail_format=args.thumbnail_format,
+            duration=args.highlight_seconds,
+        )
+        if args.highlights
+        else None
+    )
+    profiler = RenderProfiler() if args.profile else None
+    output = render_scene(
+        scene,
+        args.out,
+        show_preview=args.show,
+        seed=args.seed,
+        settings=settings,
+        cache=cache,
+        profiler=profiler,
+        outputs=outputs,
+        highlights=highlights,
+    )
+    if profiler is not None:
+        profiler.log(LOGGER)
     LOGGER.info("Clip exporté: %s", output)
     return 0
 
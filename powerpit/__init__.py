@@ -3,6 +3,8 @@
 from .rng import build_rng
 from .scene import SceneConfig, load_scene_config
 
+__version__ = "0.1.0"
+
 __all__ = ["SceneConfig", "load_scene_config", "render_scene", "build_rng"]
 
 
@@ -0,0 +1,301 @@
+"""Pluggable physics backends sharing one snapshot format.
+
+A backend is anything with the `PhysicsBackend` shape: `step()` advances one
+`DT` tick and `capture()` returns a `SimulationSnapshot`, so rendering,
+trajectories and replays do not care which one ran (when
+`supports_checkpoints`, `clone()` copies the state for the live preview's
+checkpoints). Three are provided:
+
+``inhouse``
+    `Simulation` as is (pairwise solver, or Jacobi with ``solver: jacobi``).
+``vectorized``
+    Jacobi ball-ball contacts plus array-wide wall and bumper passes: no
+    per-ball Python loop, for crowds.
+``pymunk``
+    Chipmunk2D through pymunk, whose C-level spatial hash handles the
+    broadphase. Optional: requires ``pip install "pymunk>=7"``; its
+    trajectories differ from ``inhouse`` (see `powerpit.trajectory_diff`).
+
+Select one with ``backend:`` in the scene file or ``--backend`` on the CLI.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+from typing import Callable, Protocol
+
+import numpy as np
+
+from .holes import NO_HOLE, boundary_points
+from .scene import HoleConfig, SceneConfig
+from .simulation import DT, BallState, Simulation, SimulationSnapshot, bumper_contact
+
+BALL_COLLISION = 1
+WALL_COLLISION = 2
+HOLE_COLLISION = 3
+WALL_SEGMENTS = 192  # segments approximating the arena wall for pymunk
+WALL_THICKNESS = 0.05
+SPATIAL_HASH_MIN_CELLS = 1000
+PYMUNK_MIN_MAJOR = 7  # pymunk.batch, Space.on_collision and Arbiter.process_collision
+PYMUNK_REQUIRED = (
+    "Le backend 'pymunk' requiert pymunk >= 7 (pymunk.batch, Space.on_collision). "
+    "Installez ou mettez à jour via 'pip install \"pymunk>=7\"'."
+)
+
+
+class PhysicsBackend(Protocol):
+    """What the render pipeline needs from a physics engine."""
+
+    scene: SceneConfig
+    time: float
+    supports_checkpoints: bool  # whether `clone` is available
+
+    def step(self) -> None: ...
+
+    def capture(self, frame_index: int) -> SimulationSnapshot: ...
+
+    def clone(self) -> "PhysicsBackend": ...
+
+
+class VectorizedSimulation(Simulation):
+    """`Simulation` with every contact pass expressed over whole arrays."""
+
+    def __init__(self, scene: SceneConfig, precision: str | None = None):
+        super().__init__(dataclasses.replace(scene, solver="jacobi"), precision=precision)
+
+    def _solve_arena_walls(self, passing: np.ndarray | None = None) -> None:
+        mask = self.active if passing is None else self.active & ~passing
+        rows = np.flatnonzero(mask)
+        if not rows.size:
+            return
+        arena = self.arena
+        if arena.type == "circle":
+            assert arena.radius is not None
+            flat = np.zeros(2)
+            corner = float(arena.radius)
+        elif arena.type == "stadium":
+            assert arena.width is not None and arena.height is not None and arena.corner_radius is not None
+            corner = float(arena.corner_radius)
+            flat = np.array([arena.width / 2.0 - corner, arena.height / 2.0 - corner])
+            if (flat < 0).any():
+                raise RuntimeError("Paramètres 'stadium' invalides: corner_radius trop grand.")
+        else:  # pragma: no cover - guarded earlier
+            raise RuntimeError(f"Type d'arène non géré: {arena.type}")
+
+        # Both arenas are rounded rectangles: push balls back towards the
+        # nearest point of the inner flat rectangle.
+        positions = self.positions[rows]
+        offset = positions - np.clip(positions, -flat, flat)
+        dist = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+        limit = corner - self.scene.ball_radius
+        out = dist > limit
+        if not out.any():
+            return
+        rows, offset, dist = rows[out], offset[out], dist[out]
+        normal = np.where((dist > 1e-9)[:, None], offset / np.maximum(dist, 1e-9)[:, None], np.array([1.0, 0.0]))
+        self.positions[rows] -= normal * (dist - limit)[:, None]
+        along = np.einsum("ij,ij->i", self.velocities[rows], normal)
+        bounce = along > 0
+        self.velocities[rows[bounce]] -= normal[bounce] * (along[bounce] * (1.0 + self.restitution))[:, None]
+
+    def _solve_bumpers(self) -> None:
+        rows = np.flatnonzero(self.active)
+        if not rows.size:
+            return
+        limit = self.scene.ball_radius
+        for index, bumper in enumerate(self.bumpers):
+            delta = self.positions[rows] - bumper.position
+            dist = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+            hit = dist < bumper.radius + limit
+            if not hit.any():
+                continue
+            touched, delta, dist = rows[hit], delta[hit], dist[hit]
+            self._contacts.append(np.stack([touched, np.full_like(touched, bumper_contact(index))], axis=1))
+            normal = np.where((dist > 1e-9)[:, None], delta / np.maximum(dist, 1e-9)[:, None], np.array([1.0, 0.0]))
+            self.positions[touched] += normal * (bumper.radius + limit - dist)[:, None]
+            along = np.einsum("ij,ij->i", self.velocities[touched], normal)
+            bounce = along < 0
+            if bounce.any():
+                touched, normal, along = touched[bounce], normal[bounce], along[bounce]
+                self.velocities[touched] -= normal * (along * (1.0 + bumper.restitution))[:, None]
+                impulses = -along * (1.0 + bumper.restitution) / self.inv_mass[touched]
+                self._peak_impulse = max(self._peak_impulse, float(impulses.max()))
+
+
+class PymunkSimulation(Simulation):
+    """Chipmunk2D (pymunk) physics mirrored into the `Simulation` arrays.
+
+    Friction maps to the space damping and restitution to shape elasticities
+    (pymunk multiplies the elasticities of both shapes). Hole segments let
+    balls faster than `v_min_ko` through; KOs, scores, buffs and events then
+    reuse the in-house bookkeeping. Chipmunk's space (cached arbiters,
+    contact warm starting) cannot be copied, so there are no checkpoints.
+    """
+
+    supports_checkpoints = False
+
+    def __init__(self, scene: SceneConfig, precision: str | None = None):
+        try:
+            import pymunk
+            import pymunk.batch
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(PYMUNK_REQUIRED) from exc
+        if int(pymunk.version.split(".")[0]) < PYMUNK_MIN_MAJOR:  # pragma: no cover - pymunk.batch came with 7.0
+            raise RuntimeError(PYMUNK_REQUIRED)
+        self._pymunk = pymunk
+        self.space = pymunk.Space()
+        self.space.damping = scene.friction ** (1.0 / DT)  # velocity *= damping ** dt at each step
+        self._bodies: list = []
+        self._body_ids = np.zeros(0, dtype=np.int64)  # `body.id` of each row
+        self._id_order = np.zeros(0, dtype=np.intp)
+        self._batch = pymunk.batch.Buffer()
+        self._batch_fields = (
+            pymunk.batch.BodyFields.BODY_ID | pymunk.batch.BodyFields.POSITION | pymunk.batch.BodyFields.VELOCITY
+        )
+        self._elasticity = math.sqrt(scene.restitution)
+        self._body_rows: dict = {}  # pymunk.Body -> row
+        self._bumper_shapes: dict = {}  # pymunk.Circle -> bumper index
+        self._touching: list[tuple[int, int]] = []  # pairs reported by the current `space.step`
+        super().__init__(scene, precision=precision)
+        # Chipmunk's spatial hash (cells of one ball diameter) replaces the default bounding-box tree.
+        self.space.use_spatial_hash(2.0 * scene.ball_radius, max(SPATIAL_HASH_MIN_CELLS, 4 * len(self.balls)))
+        for ball in self.balls:
+            self._add_body(ball)
+        self._build_space_walls()
+        self.space.on_collision(BALL_COLLISION, HOLE_COLLISION, pre_solve=self._through_hole)
+        self.space.on_collision(BALL_COLLISION, None, post_solve=self._record_impulse)
+
+    def add_ball(self, team_index: int, position: tuple[float, float], velocity: tuple[float, float]) -> BallState:
+        ball = super().add_ball(team_index, position, velocity)
+        self._add_body(ball)
+        return ball
+
+    def step(self) -> None:
+        self.space.step(DT)
+        self._read_bodies()
+        if self._touching:
+            self._contacts.append(np.array(self._touching, dtype=np.int64))
+            self._touching.clear()
+        self.time += DT
+
+        if self._holes is not None:
+            self._hole_index = self._holes.classify(self.positions)
+            before = self.active.copy()
+            self._register_kos(self.active & (self._hole_index != NO_HOLE))
+            for index in np.flatnonzero(before & ~self.active):
+                body = self._bodies[index]
+                self.space.remove(body, *body.shapes)
+        if self._buffs is not None:
+            self.events.extend(self._buffs.step(self))
+            # Push back only the masses and speed factors the buffs changed this tick.
+            for index in self._buffs.changed:
+                if self.active[index]:
+                    body = self._bodies[index]
+                    body.mass = self.balls[index].mass
+                    body.position_func = self._position_func(float(self._buffs.speed_factor[index]))
+
+    def _position_func(self, factor: float):  # noqa: ANN202 - pymunk callback
+        """Body position update moving `factor` times faster than the velocity (Speed+)."""
+
+        update = self._pymunk.Body.update_position
+        if factor == 1.0:
+            return update
+        return lambda body, dt: update(body, dt * factor)
+
+    def _read_bodies(self) -> None:
+        """Copy every body's position and velocity into the arrays in one batch.
+
+        Chipmunk lists the bodies in its own order (KO'd bodies are removed,
+        the static body of the walls is listed too), so rows are found back
+        from the body ids.
+        """
+
+        self._batch.clear()
+        self._pymunk.batch.get_space_bodies(self.space, self._batch_fields, self._batch)
+        ids = np.frombuffer(self._batch.int_buf(), dtype=np.int64)
+        if not ids.size:
+            return
+        state = np.frombuffer(self._batch.float_buf(), dtype=np.float64).reshape(ids.size, 4)
+        found = np.searchsorted(self._body_ids, ids, sorter=self._id_order)
+        rows = self._id_order[np.minimum(found, self._id_order.size - 1)]
+        known = self._body_ids[rows] == ids
+        self.positions[rows[known]] = state[known, 0:2]
+        self.velocities[rows[known]] = state[known, 2:4]
+
+    def _add_body(self, ball: BallState) -> None:
+        pymunk = self._pymunk
+        body = pymunk.Body(ball.mass, pymunk.moment_for_circle(ball.mass, 0.0, ball.radius))
+        body.position = tuple(float(value) for value in ball.position)
+        body.velocity = tuple(float(value) for value in ball.velocity)
+        shape = pymunk.Circle(body, ball.radius)
+        shape.elasticity = self._elasticity
+        shape.friction = 0.0
+        shape.collision_type = BALL_COLLISION
+        self.space.add(body, shape)
+        self._body_rows[body] = len(self._bodies)
+        self._bodies.append(body)
+        self._body_ids = np.append(self._body_ids, body.id)
+        self._id_order = np.argsort(self._body_ids)
+
+    def _build_space_walls(self) -> None:
+        pymunk = self._pymunk
+        static = self.space.static_body
+        # The whole wall, sampled like a single 360° hole, pushed out by the segment thickness.
+        points = boundary_points(self.arena, HoleConfig(id="", angle=180.0, width=360.0), samples=WALL_SEGMENTS + 1)
+        norms = np.linalg.norm(points, axis=1, keepdims=True)
+        points = points * (1.0 + WALL_THICKNESS / norms)
+        middles = (points[:-1] + points[1:]) / 2.0
+        in_hole = (
+            self._holes.classify(middles) != NO_HOLE if self._holes is not None else np.zeros(len(middles), dtype=bool)
+        )
+        shapes = []
+        for start, end, hole in zip(points[:-1], points[1:], in_hole):
+            segment = pymunk.Segment(static, tuple(start), tuple(end), WALL_THICKNESS)
+            segment.elasticity = self._elasticity
+            segment.friction = 0.0
+            segment.collision_type = HOLE_COLLISION if hole else WALL_COLLISION
+            shapes.append(segment)
+        for index, bumper in enumerate(self.bumpers):
+            circle = pymunk.Circle(static, bumper.radius, tuple(float(value) for value in bumper.position))
+            self._bumper_shapes[circle] = index
+            circle.elasticity = bumper.restitution / max(self._elasticity, 1e-6)
+            circle.friction = 0.0
+            circle.collision_type = WALL_COLLISION
+            shapes.append(circle)
+        self.space.add(*shapes)
+
+    def _through_hole(self, arbiter, space, data) -> None:  # noqa: ANN001 - pymunk callback
+        body = arbiter.bodies[0]
+        velocity = body.velocity
+        factor = self._buffs.speed_factor[self._body_rows[body]] if self._buffs is not None else 1.0
+        if (velocity.x * velocity.x + velocity.y * velocity.y) * factor * factor > self._v_min_ko_sq:
+            arbiter.process_collision = False
+
+    def _record_impulse(self, arbiter, space, data) -> None:  # noqa: ANN001 - pymunk callback
+        ball, other = arbiter.shapes
+        row = self._body_rows[ball.body]
+        if other in self._bumper_shapes:
+            self._touching.append((row, bumper_contact(self._bumper_shapes[other])))
+        elif other.collision_type == BALL_COLLISION:
+            other_row = self._body_rows[other.body]
+            self._touching.append((min(row, other_row), max(row, other_row)))
+        impulse = arbiter.total_impulse.length
+        if impulse > self._peak_impulse:
+            self._peak_impulse = impulse
+
+
+BACKENDS: dict[str, Callable[..., Simulation]] = {
+    "inhouse": Simulation,
+    "vectorized": VectorizedSimulation,
+    "pymunk": PymunkSimulation,
+}
+
+
+def create_backend(scene: SceneConfig, precision: str | None = None, backend: str | None = None) -> PhysicsBackend:
+    """Instantiate `backend` (the scene's `backend` field by default)."""
+
+    name = backend or scene.backend
+    if name not in BACKENDS:
+        raise ValueError(f"Backend physique '{name}' non supporté (options: {sorted(BACKENDS)}).")
+    return BACKENDS[name](scene, precision=precision)
@@ -0,0 +1,327 @@
+"""Resumable batch rendering with a durable per-job manifest.
+
+A batch is a list of `(scene, seed, output)` jobs rendered by a pool of warm
+`WorkerProcess`es. Every state change is appended to a JSON lines manifest and
+synced to disk before the batch moves on, so a run that dies halfway restarts
+where it stopped: jobs whose last record is `done` (and whose clip still
+exists) are skipped, the others run again. Records carry the runner options
+(`resolution`, `cache_dir`...): a job recorded under other options is
+treated as new, so rerunning a batch with another resolution renders again.
+Each `done` record carries the numbers needed for capacity planning:
+simulation, raster and encode time, frames, output size and the worker's
+peak RSS during the job.
+
+A worker that crashes (killed, out of memory) is respawned and its job is
+retried at most `retries` times; an exception raised by the job is final,
+since rendering is deterministic and would fail again.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from .service import Runner, WorkerProcess
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RETRIES = 2
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def run_batch_job(
+    scene: str,
+    seed: int | None,
+    output: str,
+    cache_dir: str | None = None,
+    resolution: int | None = None,
+) -> dict[str, Any]:
+    """Worker-side runner: render one clip and measure it."""
+
+    from .cache import RenderCache
+    from .profiling import RenderProfiler
+    from .render import RenderSettings, frame_size_for, render_scene
+    from .scene import load_scene_config
+
+    _reset_peak_rss()
+    start = time.perf_counter()
+    config = load_scene_config(scene, seed=seed)
+    settings = RenderSettings(frame_size=frame_size_for(resolution)) if resolution else RenderSettings()
+    profiler = RenderProfiler()
+    cache = RenderCache(cache_dir) if cache_dir else None
+    path = render_scene(config, output, seed=seed, settings=settings, cache=cache, profiler=profiler)
+    encode = profiler.stages.get("encode")
+    return {
+        "wall_s": time.perf_counter() - start,
+        "sim_s": profiler.total("simulation"),
+        "raster_s": profiler.total("raster"),
+        "encode_s": profiler.total("encode"),
+        "frames": encode.calls if encode is not None else 0,
+        "output_bytes": path.stat().st_size,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """One clip of the batch; `id` is stable across runs."""
+
+    scene: str
+    output: str
+    seed: int | None = None
+
+    @property
+    def id(self) -> str:
+        key = json.dumps([self.scene, self.seed, self.output])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        return {"scene": self.scene, "seed": self.seed, "output": self.output}
+
+
+def expand_jobs(scenes: Iterable[str | Path], seeds: Sequence[int | None], out_dir: str | Path) -> list[BatchJob]:
+    """Every scene × seed combination, written to `out_dir/<scene>_s<seed>.mp4`."""
+
+    out_dir = Path(out_dir)
+    jobs = []
+    for scene in scenes:
+        stem = Path(scene).stem
+        for seed in seeds:
+            name = f"{stem}.mp4" if seed is None else f"{stem}_s{seed}.mp4"
+            jobs.append(BatchJob(scene=str(scene), output=str(out_dir / name), seed=seed))
+    return jobs
+
+
+class BatchManifest:
+    """Append-only JSON lines log of job states; the last line of a job wins."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Close a line torn by a crash so the next record starts on its own line.
+        if self.path.exists() and self.path.stat().st_size:
+            with self.path.open("rb+") as handle:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    handle.write(b"\n")
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Latest record of every job (a line cut short by a crash is ignored)."""
+
+        records: dict[str, dict[str, Any]] = {}
+        if not self.path.exists():
+            return records
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    LOGGER.warning("Ligne de manifeste illisible ignorée: %.60s", line.strip())
+                    continue
+                records[record["id"]] = record
+        return records
+
+    def record(self, job: BatchJob, status: str, attempt: int, **fields: Any) -> dict[str, Any]:
+        """Append and sync a state change of `job`."""
+
+        record = {"id": job.id, **asdict(job), "status": status, "attempt": attempt, "time": time.time(), **fields}
+        line = json.dumps(record) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+        return record
+
+
+@dataclass
+class BatchReport:
+    """Aggregate throughput of a batch run; totals cover the clips it rendered."""
+
+    jobs: int
+    done: int
+    failed: int
+    skipped: int  # done by an earlier run
+    retries: int
+    wall_s: float
+    sim_s: float
+    raster_s: float
+    encode_s: float
+    frames: int
+    output_bytes: int
+    peak_rss_mb: float
+
+    @property
+    def rendered(self) -> int:
+        """Clips rendered by this run."""
+
+        return self.done - self.skipped
+
+    @property
+    def clips_per_hour(self) -> float:
+        return self.rendered * 3600.0 / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.wall_s if self.wall_s > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "clips_per_hour": self.clips_per_hour, "frames_per_second": self.frames_per_second}
+
+    def summary(self) -> str:
+        return (
+            f"{self.done}/{self.jobs} clips terminés ({self.skipped} déjà faits, {self.failed} en échec, "
+            f"{self.retries} relances) en {self.wall_s:.1f}s — {self.clips_per_hour:.0f} clips/h, "
+            f"{self.frames_per_second:.0f} frames/s ; simulation {self.sim_s:.1f}s, raster {self.raster_s:.1f}s, "
+            f"encodage {self.encode_s:.1f}s ; {self.output_bytes / 1024**2:.1f} Mo, pic RSS {self.peak_rss_mb:.0f} Mo"
+        )
+
+
+def run_batch(
+    jobs: Sequence[BatchJob],
+    manifest: BatchManifest | str | Path,
+    workers: int = 2,
+    retries: int = DEFAULT_RETRIES,
+    runner: Runner = run_batch_job,
+    warm: bool = True,
+    retry_failed: bool = False,
+    options: dict[str, Any] | None = None,
+) -> BatchReport:
+    """Render the jobs not already done according to `manifest`.
+
+    `options` are extra keyword arguments for `runner` (e.g. `cache_dir`);
+    they are stored in every record, and earlier records made under other
+    options are ignored. Failed jobs of earlier runs are kept failed unless
+    `retry_failed`.
+    """
+
+    if workers <= 0:
+        raise ValueError("Le batch doit avoir au moins un worker.")
+    if not isinstance(manifest, BatchManifest):
+        manifest = BatchManifest(manifest)
+    options = json.loads(json.dumps(options or {}, default=str))  # as read back from the manifest
+    record = functools.partial(manifest.record, options=options)
+    previous = manifest.load()
+    start = time.perf_counter()
+
+    pending: queue.Queue[tuple[BatchJob, int]] = queue.Queue()
+    skipped = failed = 0
+    for job in dict.fromkeys(jobs):  # drop duplicates, keep order
+        last = previous.get(job.id)
+        if last is not None and last.get("options", {}) != options:
+            last = None  # recorded under other options: another clip
+        status = last["status"] if last else None
+        if status == "done" and Path(job.output).exists():
+            skipped += 1
+            continue
+        if status == "failed" and not retry_failed:
+            failed += 1
+            continue
+        # An interrupted run ("running") or a crash still has its attempt counted.
+        attempt = last["attempt"] if last and status in {"running", "crashed"} else 0
+        if attempt > retries:
+            record(job, "failed", attempt, error="tentatives épuisées")
+            failed += 1
+            continue
+        pending.put((job, attempt + 1))
+    LOGGER.info(
+        "Batch: %d jobs, %d déjà faits, %d en échec, %d à rendre (%d workers)",
+        len(jobs),
+        skipped,
+        failed,
+        pending.qsize(),
+        workers,
+    )
+
+    counts = {"failed": failed, "retries": 0}
+    rendered: list[dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def dispatch(worker: WorkerProcess) -> None:
+        while True:
+            try:
+                job, attempt = pending.get_nowait()
+            except queue.Empty:
+                return
+            record(job, "running", attempt, pid=worker.pid)
+            status, detail = worker.run({**job.payload, **options})
+            if status == "ok":
+                done = record(job, "done", attempt, **(detail if isinstance(detail, dict) else {}))
+                LOGGER.info("Job %s terminé (%s)", job.id, job.output)
+                with lock:
+                    rendered.append(done)
+            elif status == "crashed" and attempt <= retries:
+                record(job, "crashed", attempt, error=str(detail))
+                LOGGER.warning("Job %s: %s, nouvelle tentative %d/%d", job.id, detail, attempt, retries)
+                with lock:
+                    counts["retries"] += 1
+                pending.put((job, attempt + 1))
+            else:
+                record(job, "failed", attempt, error=str(detail))
+                LOGGER.error("Job %s en échec: %s", job.id, detail)
+                with lock:
+                    counts["failed"] += 1
+
+    pool = [WorkerProcess(runner, warm=warm) for _ in range(min(workers, pending.qsize()))]
+    threads = [
+        threading.Thread(target=dispatch, args=(worker,), name=f"powerpit-batch-{idx}", daemon=True)
+        for idx, worker in enumerate(pool)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        for worker in pool:
+            worker.close()
+
+    return BatchReport(
+        jobs=skipped + counts["failed"] + len(rendered),
+        done=skipped + len(rendered),
+        failed=counts["failed"],
+        skipped=skipped,
+        retries=counts["retries"],
+        wall_s=time.perf_counter() - start,
+        sim_s=sum(record.get("sim_s", 0.0) for record in rendered),
+        raster_s=sum(record.get("raster_s", 0.0) for record in rendered),
+        encode_s=sum(record.get("encode_s", 0.0) for record in rendered),
+        frames=sum(record.get("frames", 0) for record in rendered),
+        output_bytes=sum(record.get("output_bytes", 0) for record in rendered),
+        peak_rss_mb=max((record.get("peak_rss_mb", 0.0) for record in rendered), default=0.0),
+    )
+
+
+def _reset_peak_rss() -> None:
+    """Restart the kernel's peak-RSS counter of this process (Linux ≥ 4.0)."""
+
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass  # elsewhere the peak covers the worker's whole life
+
+
+def _peak_rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024.0**2 if sys.platform == "darwin" else peak / 1024.0
@@ -0,0 +1,179 @@
+"""Buff tokens (Speed+, Mass+, Life+): spawning, pickup and timed effects.
+
+Tokens live in fixed-capacity arrays and every pickup of a tick is resolved by
+one broadcast distance test between the live balls and the tokens. Timed
+effects are per-ball factor/expiry arrays, expired with a single vectorized
+comparison, so the per-tick cost stays flat as balls and buffs accumulate.
+
+Speed+ never touches the stored velocities: `speed_factor` scales each ball's
+displacement during integration, so collisions keep exchanging the unboosted
+momentum and nothing is lost or gained when the buff expires.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .holes import outside_arena
+from .scene import BuffsConfig
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .simulation import Simulation
+
+EMPTY_SLOT = -1
+FREE_POINT_CANDIDATES = 64  # candidate positions drawn at once when placing a token or ball
+
+
+@dataclass
+class BuffEvent:
+    """A ball picked up a buff token."""
+
+    time: float
+    kind: str
+    ball_index: int
+    ball_name: str
+    team_index: int
+
+
+class BuffSystem:
+    """Token arrays and per-ball timed effects of one simulation."""
+
+    def __init__(self, config: BuffsConfig, ball_count: int, rng: np.random.Generator):
+        self.config = config
+        self.rng = rng
+        self.kinds = [buff.kind for buff in config.types]
+        weights = np.array([buff.weight for buff in config.types], dtype=float)
+        self._probabilities = weights / weights.sum()
+
+        self.token_positions = np.zeros((config.max_tokens, 2), dtype=float)
+        self.token_kinds = np.full(config.max_tokens, EMPTY_SLOT, dtype=np.int16)
+        self.speed_factor = np.ones(ball_count)
+        self.speed_until = np.full(ball_count, np.inf)
+        self.mass_factor = np.ones(ball_count)
+        self.mass_until = np.full(ball_count, np.inf)
+        self.next_spawn = self._interval()
+        self.changed: list[int] = []  # balls whose speed or mass factor changed during the last step
+
+    def grow(self, count: int) -> None:
+        """Extend the per-ball arrays for `count` newly added balls."""
+
+        self.speed_factor = np.concatenate([self.speed_factor, np.ones(count)])
+        self.speed_until = np.concatenate([self.speed_until, np.full(count, np.inf)])
+        self.mass_factor = np.concatenate([self.mass_factor, np.ones(count)])
+        self.mass_until = np.concatenate([self.mass_until, np.full(count, np.inf)])
+
+    def tokens(self) -> list[tuple[str, tuple[float, float]]]:
+        return [
+            (self.kinds[kind], (float(position[0]), float(position[1])))
+            for kind, position in zip(self.token_kinds, self.token_positions)
+            if kind != EMPTY_SLOT
+        ]
+
+    def step(self, simulation: "Simulation") -> list[BuffEvent]:
+        now = simulation.time
+        self.changed = []
+        self._expire(simulation, now)
+        if now >= self.next_spawn:
+            self._spawn_token(simulation)
+            self.next_spawn = now + self._interval()
+        if not (self.token_kinds != EMPTY_SLOT).any():
+            return []
+        return self._pickups(simulation, now)
+
+    # ----------------------------------------------------------------- effects
+    def _expire(self, simulation: "Simulation", now: float) -> None:
+        expired = self.speed_until <= now
+        if expired.any():
+            self.changed.extend(np.flatnonzero(expired).tolist())
+            self.speed_factor[expired] = 1.0
+            self.speed_until[expired] = np.inf
+        expired = self.mass_until <= now
+        if expired.any():
+            self.mass_factor[expired] = 1.0
+            self.mass_until[expired] = np.inf
+            for index in np.flatnonzero(expired).tolist():
+                self.changed.append(index)
+                simulation.set_mass(index, simulation.scene.ball_mass)
+
+    def _pickups(self, simulation: "Simulation", now: float) -> list[BuffEvent]:
+        slots = np.flatnonzero(self.token_kinds != EMPTY_SLOT)
+        live = np.flatnonzero(simulation.active)
+        if not live.size:
+            return []
+        delta = simulation.positions[live, None, :] - self.token_positions[None, slots, :]
+        reach = simulation.scene.ball_radius + self.config.token_radius
+        hits = np.einsum("ijk,ijk->ij", delta, delta) < reach * reach  # (balls, tokens)
+        if not hits.any():
+            return []
+
+        events = []
+        for column in np.flatnonzero(hits.any(axis=0)):
+            slot = slots[column]
+            index = int(live[np.argmax(hits[:, column])])  # lowest ball index wins
+            buff = self.config.types[self.token_kinds[slot]]
+            self.token_kinds[slot] = EMPTY_SLOT
+            ball = simulation.balls[index]
+            if buff.kind == "speed":
+                self.speed_factor[index] = min(self.speed_factor[index] * buff.factor, buff.cap)
+                self.changed.append(index)
+                self.speed_until[index] = now + buff.duration
+            elif buff.kind == "mass":
+                new = min(self.mass_factor[index] * buff.factor, buff.cap)
+                self.mass_factor[index] = new
+                self.mass_until[index] = now + buff.duration
+                simulation.set_mass(index, simulation.scene.ball_mass * new)
+                self.changed.append(index)
+            elif buff.kind == "life":
+                speed = float(np.linalg.norm(ball.velocity) * self.speed_factor[index])
+                self._spawn_ball(simulation, ball.team_index, speed)
+            events.append(BuffEvent(now, buff.kind, index, ball.name, ball.team_index))
+        return events
+
+    # ----------------------------------------------------------------- spawning
+    def _interval(self) -> float:
+        low, high = self.config.spawn_every
+        return float(self.rng.uniform(low, high)) if high > low else low
+
+    def _spawn_token(self, simulation: "Simulation") -> None:
+        free = np.flatnonzero(self.token_kinds == EMPTY_SLOT)
+        if not free.size:
+            return
+        point = self._free_point(simulation, self.config.token_radius)
+        if point is None:
+            return
+        slot = free[0]
+        self.token_positions[slot] = point
+        self.token_kinds[slot] = self.rng.choice(len(self.kinds), p=self._probabilities)
+
+    def _spawn_ball(self, simulation: "Simulation", team_index: int, speed: float) -> None:
+        point = self._free_point(simulation, simulation.scene.ball_radius)
+        if point is None:
+            return
+        angle = self.rng.uniform(0.0, 2.0 * np.pi)
+        velocity = (np.cos(angle) * speed, np.sin(angle) * speed)
+        simulation.add_ball(team_index, (float(point[0]), float(point[1])), velocity)
+
+    def _free_point(self, simulation: "Simulation", radius: float) -> np.ndarray | None:
+        """A random point clear of the walls, bumpers and live balls, or None."""
+
+        arena = simulation.arena
+        half_w, half_h = arena.horizontal_span / 2.0, arena.vertical_span / 2.0
+        candidates = self.rng.uniform((-half_w, -half_h), (half_w, half_h), size=(FREE_POINT_CANDIDATES, 2))
+        ok = ~outside_arena(arena, candidates, margin=radius)
+
+        ball_radius = simulation.scene.ball_radius
+        live = simulation.positions[simulation.active]
+        if live.size:
+            delta = candidates[:, None, :] - live[None, :, :]
+            ok &= (np.einsum("ijk,ijk->ij", delta, delta) >= (radius + ball_radius) ** 2).all(axis=1)
+        for bumper in simulation.bumpers:
+            ok &= ((candidates - bumper.position) ** 2).sum(axis=1) >= (radius + bumper.radius) ** 2
+        taken = self.token_positions[self.token_kinds != EMPTY_SLOT]
+        if taken.size:
+            delta = candidates[:, None, :] - taken[None, :, :]
+            ok &= (np.einsum("ijk,ijk->ij", delta, delta) >= (radius + self.config.token_radius) ** 2).all(axis=1)
+        found = np.flatnonzero(ok)
+        return candidates[found[0]] if found.size else None
@@ -0,0 +1,190 @@
+"""Content-addressed cache for rendered clips.
+
+A clip is identified by a hash of everything that determines its pixels: the
+normalized `SceneConfig`, the seed, the render settings, the package version
+and a hash of the package sources (so a rendering change invalidates the cache
+even without a version bump). When the key is already cached, the clip is
+materialized at the requested output path with a hard link (or a copy across
+filesystems) instead of being simulated and encoded again.
+
+Layout::
+
+    <root>/manifest.json         {key: {size, suffix, created, last_used, ...}}
+    <root>/objects/ab/abcdef….mp4
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+try:  # pragma: no cover - POSIX only
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+MANIFEST_NAME = "manifest.json"
+
+
+def _normalize(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            f.name: _normalize(getattr(value, f.name))
+            for f in dataclasses.fields(value)
+            if f.metadata.get("cache", True)  # e.g. thread counts: they do not change the pixels
+        }
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint() -> str:
+    """Hash of the `powerpit` package sources (`*.py`), computed once per process."""
+
+    root = Path(__file__).resolve().parent
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def render_key(scene: Any, seed: int | None, settings: Any) -> str:
+    """Return the content hash of a render request."""
+
+    from . import __version__
+
+    document = {
+        "scene": _normalize(scene),
+        "seed": 0 if seed is None else int(seed),
+        "settings": _normalize(settings),
+        "version": __version__,
+        "sources": source_fingerprint(),
+    }
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RenderCache:
+    """Size-bounded (LRU) store of rendered clips keyed by `render_key`."""
+
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------ API
+    def fetch(self, key: str, output: str | Path) -> bool:
+        """Materialize the cached clip for `key` at `output`; False on miss."""
+
+        with self._locked() as manifest:
+            entry = manifest.get(key)
+            if entry is None:
+                return False
+            source = self._object_path(key, entry["suffix"])
+            if not source.exists():
+                LOGGER.warning("Entrée de cache orpheline supprimée: %s", key)
+                del manifest[key]
+                return False
+            _materialize(source, Path(output))
+            entry["last_used"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+        return True
+
+    def store(self, key: str, clip: str | Path, **metadata: Any) -> None:
+        """Add a freshly rendered `clip` to the cache and enforce the size bound."""
+
+        clip = Path(clip)
+        size = clip.stat().st_size
+        if size > self.max_bytes:
+            LOGGER.info("Clip trop volumineux pour le cache (%d octets): %s", size, clip)
+            return
+        with self._locked() as manifest:
+            target = self._object_path(key, clip.suffix)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not target.exists():
+                _materialize(clip, target)
+            now = time.time()
+            manifest[key] = {
+                "suffix": clip.suffix,
+                "size": size,
+                "created": now,
+                "last_used": now,
+                "hits": 0,
+                **{name: _normalize(value) for name, value in metadata.items()},
+            }
+            self._evict(manifest)
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        return self._read_manifest()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry["size"] for entry in self._read_manifest().values())
+
+    # ------------------------------------------------------------- internals
+    def _object_path(self, key: str, suffix: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key}{suffix}"
+
+    def _evict(self, manifest: dict[str, dict[str, Any]]) -> None:
+        total = sum(entry["size"] for entry in manifest.values())
+        for key in sorted(manifest, key=lambda k: manifest[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            entry = manifest.pop(key)
+            total -= entry["size"]
+            self._object_path(key, entry["suffix"]).unlink(missing_ok=True)
+            LOGGER.debug("Cache: éviction de %s (%d octets)", key, entry["size"])
+
+    def _read_manifest(self) -> dict[str, dict[str, Any]]:
+        path = self.root / MANIFEST_NAME
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            LOGGER.warning("Manifeste de cache illisible, réinitialisation: %s", path)
+            return {}
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[dict[str, dict[str, Any]]]:
+        """Yield the manifest under an exclusive lock and write it back."""
+
+        with open(self.root / ".lock", "w", encoding="utf-8") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            manifest = self._read_manifest()
+            yield manifest
+            tmp = self.root / f"{MANIFEST_NAME}.tmp"
+            tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.root / MANIFEST_NAME)
+
+
+def _materialize(source: Path, target: Path) -> None:
+    """Hard-link `source` to `target`, falling back to a copy."""
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
@@ -0,0 +1,366 @@
+"""Post-raster visual effects (M5 juice)."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from .raster import BallSprite, accumulate_sprite
+
+DEFAULT_TRAIL_DECAY = 0.85
+DEFAULT_TRAIL_STRENGTH = 0.35
+TRAIL_FLUSH_INTERVAL = 32
+
+
+class TrailLayer:
+    """Team trails kept in a persistent float32 accumulation buffer.
+
+    Each frame the buffer is multiplied by `decay` and the current ball sprites
+    are added on top, so older positions fade exponentially. The per-frame cost
+    is one multiply, one stamp per ball and one additive composite, whatever
+    the visible trail length (~ 1 / (1 - decay) frames). Those passes are
+    restricted to the bounding box of the stamps that are still visible.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        decay: float = DEFAULT_TRAIL_DECAY,
+        strength: float = DEFAULT_TRAIL_STRENGTH,
+    ):
+        if not 0.0 <= decay < 1.0:
+            raise ValueError("Le facteur de décroissance des trails doit être dans [0, 1).")
+        width, height = size
+        self.decay = float(decay)
+        self.strength = float(strength)
+        self.buffer = np.zeros((height, width, 3), dtype=np.float32)
+        self._scratch = np.empty_like(self.buffer)
+        self._frames = 0
+        # A pixel fades below one grey level `lifetime` frames after its last
+        # stamp; under a resting ball it saturates at peak / (1 - decay).
+        peak = max(255.0 * self.strength / (1.0 - self.decay), 1.0)
+        lifetime = math.ceil(math.log(peak) / -math.log(self.decay)) + 1 if self.decay > 0 else 1
+        self._boxes: deque[tuple[int, int, int, int]] = deque(maxlen=lifetime)
+        self._region: tuple[slice, slice] | None = None
+
+    def update(self, stamps: Iterable[tuple[BallSprite, int, int]]) -> None:
+        """Decay the buffer and stamp `(sprite, x0, y0)` for every ball."""
+
+        stamps = list(stamps)
+        if self.track(stamps):
+            self.update_rows(stamps, 0, self.buffer.shape[0])
+
+    def track(self, stamps: list[tuple[BallSprite, int, int]]) -> bool:
+        """Start a frame: move the visible region; False when no trail shows.
+
+        `update` is `track` followed by `update_rows` over the whole buffer;
+        the tiled renderer calls `track` once, then `update_rows` per tile.
+        """
+
+        self._track(stamps)
+        if self._region is None:
+            return False
+        self._frames += 1
+        return True
+
+    def update_rows(self, stamps: Iterable[tuple[BallSprite, int, int]], top: int, bottom: int) -> None:
+        """Decay rows `[top, bottom)` and stamp the parts of `stamps` falling in them."""
+
+        if self._region is None:
+            return
+        rows, cols = self._region
+        band = slice(max(rows.start, top), min(rows.stop, bottom))
+        if band.start < band.stop:
+            region = self.buffer[band, cols]
+            region *= self.decay
+            if self._frames % TRAIL_FLUSH_INTERVAL == 0:
+                # Values below one grey level never show up; zeroing them keeps
+                # the buffer away from slow float32 denormals on long clips.
+                region[region < 1.0] = 0.0
+        strip = self.buffer[top:bottom]
+        for sprite, x0, y0 in stamps:
+            accumulate_sprite(strip, sprite, x0, y0 - top, self.strength)
+
+    def composite(self, frame: np.ndarray, top: int = 0, bottom: int | None = None) -> None:
+        """Add the trails onto the uint8 `frame` in place (saturating), rows `[top, bottom)` only."""
+
+        if self._region is None:
+            return
+        rows, cols = self._region
+        band = slice(max(rows.start, top), rows.stop if bottom is None else min(rows.stop, bottom))
+        if band.start >= band.stop:
+            return
+        target = frame[band, cols]
+        scratch = self._scratch[band, cols]
+        np.add(target, self.buffer[band, cols], out=scratch)
+        np.minimum(scratch, 255.0, out=scratch)
+        target[...] = scratch
+
+    @property
+    def lifetime(self) -> int:
+        """Frames after which a trail has faded below one grey level, even under a resting ball."""
+
+        return self._boxes.maxlen or 1
+
+    @property
+    def region(self) -> tuple[int, int, int, int] | None:
+        """`(x0, y0, x1, y1)` box holding every visible trail pixel, if any."""
+
+        if self._region is None:
+            return None
+        rows, cols = self._region
+        return (cols.start, rows.start, cols.stop, rows.stop)
+
+    def reset(self) -> None:
+        self.buffer.fill(0.0)
+        self._frames = 0
+        self._boxes.clear()
+        self._region = None
+
+    def _track(self, stamps: list[tuple[BallSprite, int, int]]) -> None:
+        height, width = self.buffer.shape[:2]
+        if stamps:
+            x0 = min(x for _, x, _ in stamps)
+            y0 = min(y for _, _, y in stamps)
+            x1 = max(x + sprite.size for sprite, x, _ in stamps)
+            y1 = max(y + sprite.size for sprite, _, y in stamps)
+            self._boxes.append((max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)))
+        elif self._boxes:
+            self._boxes.popleft()
+        if not self._boxes:
+            self._region = None
+            return
+        x0 = min(box[0] for box in self._boxes)
+        y0 = min(box[1] for box in self._boxes)
+        x1 = max(box[2] for box in self._boxes)
+        y1 = max(box[3] for box in self._boxes)
+        if x0 >= x1 or y0 >= y1:
+            self._region = None
+            return
+        if self._region is not None:
+            # Zero what leaves the region so faded pixels never linger outside.
+            rows, cols = self._region
+            self.buffer[rows.start : min(rows.stop, y0), cols] = 0.0
+            self.buffer[max(rows.start, y1) : rows.stop, cols] = 0.0
+            band = slice(max(rows.start, y0), min(rows.stop, y1))
+            self.buffer[band, cols.start : min(cols.stop, x0)] = 0.0
+            self.buffer[band, max(cols.start, x1) : cols.stop] = 0.0
+        self._region = (slice(y0, y1), slice(x0, x1))
+
+
+DEFAULT_GLOW_DOWNSAMPLE = 8
+GLOW_DOWNSAMPLES = (2, 4, 8, 16)
+DEFAULT_GLOW_LEVELS = 3
+DEFAULT_GLOW_THRESHOLD = 80.0
+DEFAULT_GLOW_INTENSITY = 0.9
+
+
+class GlowStage:
+    """Neon glow computed on a downsampled blur pyramid.
+
+    Bright pixels are extracted at 1/`downsample` resolution, blurred with a
+    separable 5-tap binomial kernel on `levels` successively halved images,
+    recombined, then upsampled and added back. Only the initial box
+    downsample and the final (nearest ×2, saturating) additive pass touch full
+    resolution, so the cost per frame is bounded by the frame size. The
+    low-resolution work uses channel-planar `(3, h, w)` arrays so every NumPy
+    pass runs over long contiguous rows.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        downsample: int = DEFAULT_GLOW_DOWNSAMPLE,
+        levels: int = DEFAULT_GLOW_LEVELS,
+        threshold: float = DEFAULT_GLOW_THRESHOLD,
+        intensity: float = DEFAULT_GLOW_INTENSITY,
+    ):
+        if downsample not in GLOW_DOWNSAMPLES:
+            raise ValueError(f"Le facteur de réduction du glow doit valoir {', '.join(map(str, GLOW_DOWNSAMPLES))}.")
+        if levels < 1:
+            raise ValueError("Le glow nécessite au moins un niveau de pyramide.")
+        width, height = size
+        self.size = size
+        self.downsample = downsample
+        self.levels = levels
+        self.threshold = float(threshold)
+        self.intensity = float(intensity)
+        self._scratch = np.empty((height, width * 3), dtype=np.uint16)
+
+    @property
+    def reach(self) -> int:
+        """Distance in full-resolution pixels over which a bright pixel glows."""
+
+        return 2 * self.downsample * 2 ** self.levels
+
+    def downsampled(self, image: np.ndarray) -> np.ndarray:
+        """Box-downsample an `(H, W, 3)` image to planar `(3, h, w)` float32."""
+
+        return np.ascontiguousarray(_box_downsample(image, self.downsample).transpose(2, 0, 1))
+
+    def extract(self, image: np.ndarray, subtract: np.ndarray | None = None) -> np.ndarray:
+        """Return the low-resolution bright-pass of `image`.
+
+        With `subtract` (a previous `downsampled` result), only what changed
+        relative to it contributes, e.g. the balls over a static background.
+        """
+
+        return self.bright_pass(self.downsampled(image), subtract)
+
+    def bright_pass(self, small: np.ndarray, subtract: np.ndarray | None = None) -> np.ndarray:
+        """Threshold a `downsampled` image in place (see `extract`)."""
+
+        if subtract is not None:
+            np.subtract(small, subtract, out=small)
+            np.maximum(small, 0.0, out=small)
+        peak = small.max(axis=0)
+        peak -= self.threshold
+        peak *= 1.0 / max(255.0 - self.threshold, 1.0)
+        np.clip(peak, 0.0, 1.0, out=peak)
+        small *= peak
+        return small
+
+    def blur(self, bright: np.ndarray) -> np.ndarray:
+        """Blur a planar low-resolution bright-pass through the pyramid."""
+
+        pyramid = [_blur5(bright)]
+        for _ in range(1, self.levels):
+            pyramid.append(_blur5(_half(pyramid[-1])))
+        glow = pyramid[-1]
+        for level in reversed(pyramid[:-1]):
+            glow = _upsample2(glow, level.shape[1:])
+            glow += level
+        glow *= self.intensity / self.levels
+        return glow
+
+    def composite(self, frame: np.ndarray, glow: np.ndarray) -> None:
+        """Upsample the planar low-resolution `glow` and add it onto `frame`.
+
+        `frame` may be any `(H, W, 3)` uint8 view (e.g. a region of a larger
+        buffer) matching the image `glow` was extracted from.
+        """
+
+        height, width = frame.shape[:2]
+        self.add_levels(frame, self.expand(glow, height, width))
+
+    def expand(self, glow: np.ndarray, height: int, width: int) -> np.ndarray:
+        """Upsample a planar `glow` for an `(height, width)` image to half resolution, as uint16."""
+
+        factor = self.downsample
+        while factor > 2:
+            factor //= 2
+            glow = _upsample2(glow, (-(-height // factor), -(-width // factor)))
+        np.add(glow, 0.5, out=glow)
+        return glow.astype(np.uint16)
+
+    def add_levels(self, frame: np.ndarray, levels: np.ndarray, scratch_row: int = 0) -> None:
+        """Add half-resolution `levels` (from `expand`) onto `frame`.
+
+        `frame` may be a horizontal band starting on an even row of the glowing
+        image, with the matching rows of `levels`; bands processed concurrently
+        pass distinct `scratch_row`s (their first frame row) so that they use
+        disjoint parts of the scratch buffer.
+        """
+
+        width = frame.shape[1]
+        # The last ×2 step is nearest-neighbour, fused into the saturating
+        # uint16 add: the glow is smooth enough that 2×2 blocks are invisible.
+        rows = np.empty((levels.shape[1], levels.shape[2], 2, 3), dtype=np.uint16)
+        interleaved = levels.transpose(1, 2, 0)
+        rows[:, :, 0] = interleaved
+        rows[:, :, 1] = interleaved
+        rows = rows.reshape(levels.shape[1], levels.shape[2] * 2, 3)[:, :width]
+        for parity in (0, 1):
+            target = frame[parity::2]
+            count = target.shape[0]
+            scratch = self._scratch[scratch_row : scratch_row + count, : width * 3].reshape(count, width, 3)
+            np.add(target, rows[:count], out=scratch)
+            np.minimum(scratch, 255, out=scratch)
+            target[...] = scratch
+
+    def apply(self, frame: np.ndarray, subtract: np.ndarray | None = None) -> None:
+        self.composite(frame, self.blur(self.extract(frame, subtract)))
+
+
+def _box_downsample(image: np.ndarray, factor: int) -> np.ndarray:
+    """Average `factor`×`factor` blocks of an `(H, W, C)` image (edges replicated)."""
+
+    height, width = image.shape[:2]
+    pad_h, pad_w = (-height) % factor, (-width) % factor
+    if pad_h or pad_w:
+        image = np.pad(image, ((0, pad_h), (0, pad_w), (0, 0)), mode="edge")
+    # Strided row sums first (one full-resolution read), then columns on the
+    # already reduced array; uint8 inputs accumulate exactly in uint16.
+    rows = image[0::factor].astype(np.uint16 if image.dtype == np.uint8 else np.float32)
+    for offset in range(1, factor):
+        rows += image[offset::factor]
+    cols = rows[:, 0::factor].astype(np.float32)
+    for offset in range(1, factor):
+        cols += rows[:, offset::factor]
+    cols *= 1.0 / (factor * factor)
+    return cols
+
+
+def _half(planar: np.ndarray) -> np.ndarray:
+    """2×2 box downsample of a planar `(C, h, w)` array (edges replicated)."""
+
+    _, height, width = planar.shape
+    if height % 2 or width % 2:
+        planar = np.pad(planar, ((0, 0), (0, height % 2), (0, width % 2)), mode="edge")
+    out = planar[:, 0::2, 0::2] + planar[:, 1::2, 0::2]
+    out += planar[:, 0::2, 1::2]
+    out += planar[:, 1::2, 1::2]
+    out *= 0.25
+    return out
+
+
+def _blur5(planar: np.ndarray) -> np.ndarray:
+    """Separable [1, 4, 6, 4, 1] / 16 blur of a planar array, edges replicated."""
+
+    return _blur5_axis(_blur5_axis(planar, 1), 2)
+
+
+def _blur5_axis(planar: np.ndarray, axis: int) -> np.ndarray:
+    pad = [(0, 0)] * planar.ndim
+    pad[axis] = (2, 2)
+    padded = np.pad(planar, pad, mode="edge")
+    n = planar.shape[axis]
+
+    def _shift(offset: int) -> np.ndarray:
+        index = [slice(None)] * planar.ndim
+        index[axis] = slice(offset, offset + n)
+        return padded[tuple(index)]
+
+    out = _shift(0) + _shift(4)
+    out += 4.0 * (_shift(1) + _shift(3))
+    out += 6.0 * _shift(2)
+    out *= 1.0 / 16.0
+    return out
+
+
+def _upsample2(planar: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+    """Bilinear ×2 upsample of a planar `(C, h, w)` array, cropped to `shape`."""
+
+    channels, height, width = planar.shape
+    tall = np.empty((channels, 2 * height, width), dtype=np.float32)
+    even, odd = tall[:, 0::2], tall[:, 1::2]
+    np.multiply(planar, 0.75, out=even)
+    np.multiply(planar, 0.75, out=odd)
+    even[:, 1:] += 0.25 * planar[:, :-1]
+    even[:, 0] += 0.25 * planar[:, 0]
+    odd[:, :-1] += 0.25 * planar[:, 1:]
+    odd[:, -1] += 0.25 * planar[:, -1]
+    tall = tall[:, : shape[0]]
+
+    wide = np.empty((channels, tall.shape[1], 2 * width), dtype=np.float32)
+    even, odd = wide[:, :, 0::2], wide[:, :, 1::2]
+    np.multiply(tall, 0.75, out=even)
+    np.multiply(tall, 0.75, out=odd)
+    even[:, :, 1:] += 0.25 * tall[:, :, :-1]
+    even[:, :, 0] += 0.25 * tall[:, :, 0]
+    odd[:, :, :-1] += 0.25 * tall[:, :, 1:]
+    odd[:, :, -1] += 0.25 * tall[:, :, -1]
+    return wide[:, :, : shape[1]]
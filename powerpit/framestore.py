@@ -0,0 +1,141 @@
+"""Memory-mapped frame store shared with external encoders.
+
+One preallocated file holds a small header, a readiness index and a
+`capacity × H × W × 3` block of RGB frames. The renderer appends frames in
+order; other processes open the same file read-only and get NumPy views of
+the frames without copying, while rendering continues:
+
+    store = FrameStore.open("out/clip.frames")
+    while store.wait(next_frame):          # blocks until that frame is written
+        encode(store.frame(next_frame))    # zero-copy view into the mapping
+        next_frame += 1
+
+The header's `ready` counter is published after each frame's pixels and
+index entry, so every frame below it is complete; `index[i]` is the render
+frame number stored in slot `i` (ranges and decimation skip some). Once the
+writer closes, `complete` is set and the unused tail of the file is cut.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = 0x31454D4152465050  # b"PPFRAME1", little-endian
+PAGE = 4096
+# Header fields, as uint64 words at the start of the file.
+_MAGIC, _WIDTH, _HEIGHT, _CAPACITY, _FPS, _READY, _COMPLETE = range(7)
+_HEADER_WORDS = 8
+DEFAULT_POLL = 0.005  # seconds between two readiness checks in `wait`
+
+
+class FrameStoreError(RuntimeError):
+    """Raised when a file is not a frame store or a frame is unavailable."""
+
+
+class FrameStore:
+    """Writer or read-only view of a memory-mapped frame store."""
+
+    def __init__(self, path: str | Path, raw: np.memmap, writable: bool):
+        self.path = Path(path)
+        self._raw = raw
+        self.writable = writable
+        self.header = raw[: _HEADER_WORDS * 8].view(np.uint64)
+        if int(self.header[_MAGIC]) != MAGIC:
+            raise FrameStoreError(f"{self.path}: ce fichier n'est pas un frame store.")
+        self.capacity = int(self.header[_CAPACITY])
+        self.size = (int(self.header[_WIDTH]), int(self.header[_HEIGHT]))
+        self.frame_rate = int(self.header[_FPS])
+        offset = _data_offset(self.capacity)
+        self.index = raw[PAGE:offset].view(np.int64)[: self.capacity]
+        width, height = self.size
+        frame_bytes = width * height * 3
+        # A closed store is cut after its last frame: map what the file holds.
+        available = min(self.capacity, (raw.shape[0] - offset) // frame_bytes)
+        self.frames = raw[offset : offset + available * frame_bytes].reshape(available, height, width, 3)
+
+    @classmethod
+    def create(cls, path: str | Path, capacity: int, size: tuple[int, int], frame_rate: int) -> "FrameStore":
+        """Preallocate a store for up to `capacity` frames of `size` (width, height)."""
+
+        if capacity <= 0:
+            raise ValueError("La capacité du frame store doit être positive.")
+        width, height = size
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        total = _data_offset(capacity) + capacity * width * height * 3
+        raw = np.memmap(path, dtype=np.uint8, mode="w+", shape=(total,))
+        header = raw[: _HEADER_WORDS * 8].view(np.uint64)
+        header[[_WIDTH, _HEIGHT, _CAPACITY, _FPS]] = (width, height, capacity, frame_rate)
+        raw[PAGE : _data_offset(capacity)].view(np.int64)[:capacity] = -1
+        header[_MAGIC] = MAGIC  # last: a reader never sees a half-initialized header
+        return cls(path, raw, writable=True)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "FrameStore":
+        """Map an existing store read-only (it may still be written to)."""
+
+        return cls(path, np.memmap(path, dtype=np.uint8, mode="r"), writable=False)
+
+    @property
+    def ready(self) -> int:
+        """Number of complete frames, all stored in slots `[0, ready)`."""
+
+        return int(self.header[_READY])
+
+    @property
+    def complete(self) -> bool:
+        """True once the writer has closed the store (no more frames will come)."""
+
+        return bool(self.header[_COMPLETE])
+
+    def frame(self, slot: int) -> np.ndarray:
+        """Read-only view of the frame in `slot` (no copy)."""
+
+        if not 0 <= slot < self.ready:
+            raise FrameStoreError(f"Frame {slot} pas encore prête ({self.ready} prêtes).")
+        return self.frames[slot]
+
+    def wait(self, slot: int, timeout: float | None = None, poll: float = DEFAULT_POLL) -> bool:
+        """Block until `slot` is ready; False if the store completed without it or on timeout."""
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while slot >= self.ready:
+            if self.complete or (deadline is not None and time.monotonic() >= deadline):
+                return slot < self.ready
+            time.sleep(poll)
+        return True
+
+    def append(self, frame: np.ndarray, source_index: int) -> bool:
+        """Store the next frame; False (frame dropped) once the store is full."""
+
+        if not self.writable:
+            raise FrameStoreError(f"{self.path}: frame store ouvert en lecture seule.")
+        slot = self.ready
+        if slot >= self.capacity:
+            return False
+        self.frames[slot] = frame
+        self.index[slot] = source_index
+        self.header[_READY] = slot + 1  # publish after the pixels
+        return True
+
+    def close(self) -> None:
+        """Mark the store complete and cut the unused slots (writer), or unmap (reader)."""
+
+        if self.writable:
+            self.header[_COMPLETE] = 1
+            self._raw.flush()
+            used = _data_offset(self.capacity) + self.ready * self.size[0] * self.size[1] * 3
+            self.frames = self.frames[: self.ready]
+            del self._raw
+            os.truncate(self.path, used)
+        self.writable = False
+
+
+def _data_offset(capacity: int) -> int:
+    """Byte offset of the first frame: header page, then the page-aligned index."""
+
+    return PAGE + -(-capacity * 8 // PAGE) * PAGE
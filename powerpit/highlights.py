@@ -0,0 +1,248 @@
+"""Thumbnails and highlight ranges picked from simulation data.
+
+Every captured frame gets a score computed from what the simulation already
+recorded, without looking at pixels: the peak contact impulse of the frame,
+the closest near-miss (a fast ball skimming a wall or a bumper without
+touching it) and KOs. The best frames, kept apart by `min_gap` seconds,
+become thumbnails and the `duration`-second window with the highest total
+becomes the highlight. `FrameScorer` scores the snapshots as they stream by
+and keeps three floats per frame, never the snapshots themselves.
+`render_scene` saves the thumbnails from the frames it rasterizes anyway and
+encodes the highlight as an extra output of the same pass.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+from PIL import Image
+
+from .holes import wall_distance
+from .outputs import OutputFanout, OutputSpec, _downscale
+from .scene import SceneConfig
+from .simulation import KOEvent, SimulationSnapshot
+
+DEFAULT_THUMBNAILS = 3
+DEFAULT_HIGHLIGHT_SECONDS = 3.0
+DEFAULT_MIN_GAP = 1.0  # seconds between two thumbnails
+THUMBNAIL_FORMATS = {"png", "webp"}
+NEAR_MISS_RADII = 1.0  # clearance (in ball radii) under which a pass counts as a near-miss
+KO_SCORE = 2.0  # a KO outweighs the strongest impact or near-miss of the clip
+
+
+@dataclass(frozen=True)
+class HighlightConfig:
+    """What to extract; files are named after the master clip."""
+
+    thumbnails: int = DEFAULT_THUMBNAILS
+    thumbnail_format: str = "png"
+    thumbnail_size: tuple[int, int] | None = None  # (width, height), render size when None
+    duration: float = DEFAULT_HIGHLIGHT_SECONDS
+    min_gap: float = DEFAULT_MIN_GAP
+    clip_size: tuple[int, int] | None = None
+
+
+@dataclass
+class FrameScores:
+    """Per-frame scores, each normalized to [0, 1] over the clip."""
+
+    impulse: np.ndarray  # (F,)
+    near_miss: np.ndarray  # (F,)
+    knockouts: np.ndarray  # (F,) KO count
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.impulse + self.near_miss + KO_SCORE * self.knockouts
+
+    def reason(self, frame: int) -> str:
+        if self.knockouts[frame]:
+            return "ko"
+        return "impact" if self.impulse[frame] >= self.near_miss[frame] else "near-miss"
+
+
+@dataclass
+class HighlightPlan:
+    """Frames picked for the thumbnails and the highlight range (capture frames)."""
+
+    thumbnails: list[int]
+    highlight: tuple[int, int]  # half-open [start, stop)
+    scores: FrameScores
+    frame_rate: int
+    output_range: list[int] = field(default_factory=list)  # [first, stop) in rendered frames, once known
+
+    def to_dict(self) -> dict[str, Any]:
+        total = self.scores.total
+        start, stop = self.highlight
+        return {
+            "thumbnails": [
+                {
+                    "frame": frame,
+                    "time": frame / self.frame_rate,
+                    "score": float(total[frame]),
+                    "reason": self.scores.reason(frame),
+                }
+                for frame in self.thumbnails
+            ],
+            "highlight": {
+                "frames": [start, stop],
+                "start": start / self.frame_rate,
+                "stop": stop / self.frame_rate,
+                "score": float(total[start:stop].sum()),
+                "output_frames": self.output_range or None,
+            },
+        }
+
+
+class FrameScorer:
+    """Raw per-frame scores, accumulated one snapshot at a time."""
+
+    def __init__(self, scene: SceneConfig):
+        self.scene = scene
+        self._impulse: list[float] = []
+        self._near_miss: list[float] = []
+        self._knockouts: list[int] = []
+
+    def add(self, snapshot: SimulationSnapshot) -> None:
+        """Score `snapshot`: its peak impulse, closest near-miss and KO count."""
+
+        balls = snapshot.balls
+        positions = np.array([ball.position for ball in balls], dtype=np.float64).reshape(-1, 2)
+        velocities = np.array([ball.velocity for ball in balls], dtype=np.float64).reshape(-1, 2)
+        active = np.array([ball.active for ball in balls], dtype=bool)
+        radius = self.scene.ball_radius
+        clearance = wall_distance(self.scene.arena, positions) - radius
+        for bumper in self.scene.arena.bumpers:
+            gap = np.linalg.norm(positions - np.asarray(bumper.position), axis=-1) - bumper.radius - radius
+            clearance = np.minimum(clearance, gap)
+        # Only passes that do not touch count: contacts already show up as impulses.
+        closeness = np.where(clearance > 0, np.clip(1.0 - clearance / (NEAR_MISS_RADII * radius), 0.0, 1.0), 0.0)
+        near = np.where(active, closeness * np.sqrt(np.einsum("ni,ni->n", velocities, velocities)), 0.0)
+        self._impulse.append(snapshot.impulse)
+        self._near_miss.append(float(near.max()) if near.size else 0.0)
+        self._knockouts.append(sum(isinstance(event, KOEvent) for event in snapshot.events))
+
+    def scores(self) -> FrameScores:
+        return FrameScores(
+            impulse=_normalized(np.array(self._impulse, dtype=float)),
+            near_miss=_normalized(np.array(self._near_miss, dtype=float)),
+            knockouts=np.array(self._knockouts, dtype=float),
+        )
+
+
+def score_frames(scene: SceneConfig, snapshots: Iterable[SimulationSnapshot]) -> FrameScores:
+    """Impulse, near-miss and KO scores of every snapshot."""
+
+    scorer = FrameScorer(scene)
+    for snapshot in snapshots:
+        scorer.add(snapshot)
+    return scorer.scores()
+
+
+def select_highlights(
+    scene: SceneConfig, snapshots: Iterable[SimulationSnapshot], config: HighlightConfig | None = None
+) -> HighlightPlan:
+    """Pick the thumbnail frames and the best highlight window of `snapshots`."""
+
+    return plan_highlights(scene, score_frames(scene, snapshots), config)
+
+
+def plan_highlights(scene: SceneConfig, scores: FrameScores, config: HighlightConfig | None = None) -> HighlightPlan:
+    """Pick the thumbnail frames and the best highlight window from per-frame `scores`."""
+
+    config = config or HighlightConfig()
+    total = scores.total
+    frames = len(total)
+
+    gap = max(1, int(round(config.min_gap * scene.frame_rate)))
+    picks: list[int] = []
+    for frame in np.argsort(-total, kind="stable"):
+        if len(picks) >= config.thumbnails:
+            break
+        if all(abs(int(frame) - other) >= gap for other in picks):
+            picks.append(int(frame))
+
+    length = min(frames, max(1, int(round(config.duration * scene.frame_rate))))
+    window = np.convolve(total, np.ones(length), mode="valid")  # sum over each [start, start + length)
+    start = int(np.argmax(window)) if window.size else 0
+    return HighlightPlan(
+        thumbnails=sorted(picks),
+        highlight=(start, start + length),
+        scores=scores,
+        frame_rate=scene.frame_rate,
+    )
+
+
+class HighlightExport:
+    """Writes a plan's thumbnails, highlight clip and JSON report during a render."""
+
+    def __init__(
+        self,
+        plan: HighlightPlan,
+        master: str | Path,
+        frame_size: tuple[int, int],
+        frame_rate: int,
+        config: HighlightConfig | None = None,
+    ):
+        self.plan = plan
+        self.config = config or HighlightConfig()
+        if self.config.thumbnail_format not in THUMBNAIL_FORMATS:
+            raise ValueError(
+                f"Format de miniature '{self.config.thumbnail_format}' non supporté "
+                f"(options: {sorted(THUMBNAIL_FORMATS)})."
+            )
+        master = Path(master)
+        self.thumbnail_paths = {
+            frame: master.with_name(f"{master.stem}_thumb{rank + 1}.{self.config.thumbnail_format}")
+            for rank, frame in enumerate(plan.thumbnails)
+        }
+        self.clip_spec = OutputSpec(master.with_name(f"{master.stem}_highlight.mp4"), size=self.config.clip_size)
+        self.report_path = master.with_name(f"{master.stem}_highlights.json")
+        self.frame_size = frame_size
+        self.frame_rate = frame_rate
+        self._clip: OutputFanout | None = None  # opened on the first highlight frame
+        self._written = 0
+
+    def thumbnail(self, frame_index: int, frame: np.ndarray) -> None:
+        """Save `frame` if it is one of the picked thumbnails."""
+
+        path = self.thumbnail_paths.get(frame_index)
+        if path is None:
+            return
+        size = self.config.thumbnail_size
+        if size is not None and size != (frame.shape[1], frame.shape[0]):
+            frame = _downscale(frame, size)
+        Image.fromarray(frame).save(path)
+
+    def write(self, capture_index: int, output_index: int, frame: np.ndarray) -> None:
+        """Encode a rendered frame into the highlight clip when it falls in the range."""
+
+        start, stop = self.plan.highlight
+        if not start <= capture_index < stop:
+            return
+        if not self.plan.output_range:
+            self.plan.output_range = [output_index, output_index]
+        self.plan.output_range[1] = output_index + 1
+        if self._clip is None:
+            self._clip = OutputFanout([self.clip_spec], self.frame_size, self.frame_rate)
+        self._clip.write(self._written, frame)
+        self._written += 1
+
+    def close(self) -> None:
+        """Finish the clip and write the JSON report (picked frames, times, scores, ranges)."""
+
+        if self._clip is not None:
+            self._clip.close()
+        report = self.plan.to_dict()
+        for entry in report["thumbnails"]:
+            entry["path"] = str(self.thumbnail_paths[entry["frame"]])
+        report["highlight"]["path"] = str(self.clip_spec.path) if self._clip is not None else None
+        self.report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def _normalized(values: np.ndarray) -> np.ndarray:
+    peak = float(values.max()) if values.size else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
@@ -0,0 +1,100 @@
+"""Exit holes: angular lookup table and vectorized arena-boundary tests.
+
+Holes are arcs of the arena wall. Classifying every ball against every hole
+costs one `arctan2` over the position array and one lookup into a table of
+`HOLE_BINS` angular bins, whatever the number of balls and holes. Arc edges
+are therefore resolved to 360 / `HOLE_BINS` degrees.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from .scene import ArenaConfig, HoleConfig
+
+HOLE_BINS = 3600  # 0.1° bins
+NO_HOLE = -1
+
+
+class HoleTable:
+    """Map polar angles to the index of the hole covering them (or `NO_HOLE`)."""
+
+    def __init__(self, holes: Sequence[HoleConfig], bins: int = HOLE_BINS):
+        self.holes = list(holes)
+        self.bins = bins
+        self.table = np.full(bins, NO_HOLE, dtype=np.int16)
+        # A bin belongs to a hole when its centre lies inside the arc.
+        centers = (np.arange(bins) + 0.5) * (360.0 / bins)
+        for index, hole in enumerate(self.holes):
+            offset = (centers - hole.angle + 180.0) % 360.0 - 180.0
+            self.table[np.abs(offset) <= hole.width / 2.0] = index
+        self._scale = bins / (2.0 * math.pi)
+
+    def classify(self, positions: np.ndarray) -> np.ndarray:
+        """Hole index under each `(x, y)` position's polar angle, shape `(N,)`."""
+
+        angles = np.arctan2(positions[:, 1], positions[:, 0])
+        # Shift to positive angles so that the integer cast floors.
+        bins = ((angles + 2.0 * math.pi) * self._scale).astype(np.intp) % self.bins
+        return self.table[bins]
+
+
+def outside_arena(arena: ArenaConfig, positions: np.ndarray, margin: float = 0.0) -> np.ndarray:
+    """Boolean mask of the positions lying beyond the arena wall moved in by `margin`."""
+
+    x = positions[:, 0]
+    y = positions[:, 1]
+    if arena.type == "circle":
+        assert arena.radius is not None
+        limit = arena.radius - margin
+        return x * x + y * y > limit * limit
+    if arena.type == "stadium":
+        assert arena.width is not None and arena.height is not None
+        assert arena.corner_radius is not None
+        flat_w = arena.width / 2.0 - arena.corner_radius
+        flat_h = arena.height / 2.0 - arena.corner_radius
+        dx = np.maximum(np.abs(x) - flat_w, 0.0)
+        dy = np.maximum(np.abs(y) - flat_h, 0.0)
+        limit = arena.corner_radius - margin
+        return dx * dx + dy * dy > limit * limit
+    raise RuntimeError(f"Type d'arène non géré pour les trous: {arena.type}")
+
+
+def wall_distance(arena: ArenaConfig, positions: np.ndarray) -> np.ndarray:
+    """Distance from each `(..., 2)` position to the arena wall (negative beyond it)."""
+
+    if arena.type == "circle":
+        assert arena.radius is not None
+        return arena.radius - np.sqrt(np.einsum("...i,...i->...", positions, positions))
+    if arena.type == "stadium":
+        assert arena.width is not None and arena.height is not None
+        assert arena.corner_radius is not None
+        flat = np.array([arena.width / 2.0 - arena.corner_radius, arena.height / 2.0 - arena.corner_radius])
+        # Rounded-rectangle distance: outside the inner flat rectangle, the
+        # gap to its nearest point; inside it, to its nearest side.
+        beyond = np.abs(positions) - flat
+        offset = np.maximum(beyond, 0.0)
+        inner = np.minimum(beyond.max(axis=-1), 0.0)
+        return arena.corner_radius - np.sqrt(np.einsum("...i,...i->...", offset, offset)) - inner
+    raise RuntimeError(f"Type d'arène non géré pour les trous: {arena.type}")
+
+
+def boundary_points(arena: ArenaConfig, hole: HoleConfig, samples: int = 48) -> np.ndarray:
+    """`(samples, 2)` points of the arena wall spanned by `hole` (for drawing)."""
+
+    half = math.radians(hole.width) / 2.0
+    center = math.radians(hole.angle)
+    angles = np.linspace(center - half, center + half, samples)
+    directions = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    # Bisect the wall distance along each ray with the same predicate as the KO test.
+    low = np.zeros(samples)
+    high = np.full(samples, max(arena.horizontal_span, arena.vertical_span))
+    for _ in range(40):
+        middle = (low + high) / 2.0
+        outside = outside_arena(arena, directions * middle[:, None])
+        high = np.where(outside, middle, high)
+        low = np.where(outside, low, middle)
+    return directions * high[:, None]
@@ -0,0 +1,185 @@
+"""HUD overlay (timer, scores, seed, arena name) composed from glyph atlases.
+
+Text is never rendered through PIL per frame: each font/size/colour gets a
+glyph atlas rasterized once, strings are assembled by copying atlas slices,
+and a HUD field is only re-composed when its text changes (the timer once per
+second, scores rarely). Every frame then only blends a few small patches.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import string
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from .raster import blend_premultiplied
+
+HUD_CHARSET = string.ascii_letters + string.digits + string.punctuation + " éèêàâçùûôîï·—–"
+HUD_TEXT_COLOR = (235, 240, 255)
+HUD_MUTED_COLOR = (150, 165, 200)
+HUD_BANNER_COLOR = (255, 80, 110)
+HUD_FONT_RATIO = 0.04  # font size relative to the short side of the frame
+HUD_MARGIN_RATIO = 0.6  # margin relative to the font size
+
+Segment = tuple[str, tuple[int, int, int]]  # (text, colour)
+
+
+class GlyphAtlas:
+    """Every glyph of `HUD_CHARSET` rasterized once into a single strip."""
+
+    def __init__(self, font: ImageFont.FreeTypeFont | ImageFont.ImageFont, color: tuple[int, int, int]):
+        ascent, descent = font.getmetrics()
+        self.height = ascent + descent
+        self.color = color
+        self._slices: dict[str, tuple[int, int, int]] = {}  # char -> (x0, width, advance)
+
+        cells = []
+        cursor = 0
+        for char in HUD_CHARSET:
+            left, _, right, _ = font.getbbox(char)
+            advance = int(math.ceil(font.getlength(char)))
+            offset = max(0, -left)
+            width = max(advance, right + offset, 1)
+            cells.append((char, cursor, offset))
+            self._slices[char] = (cursor, width, advance)
+            cursor += width + 1
+
+        mask = Image.new("L", (cursor, self.height), 0)
+        draw = ImageDraw.Draw(mask)
+        for char, x0, offset in cells:
+            draw.text((x0 + offset, 0), char, font=font, fill=255)
+        self.coverage = np.asarray(mask, dtype=np.float32) / 255.0
+        self._fallback = self._slices["?"]
+
+    def measure(self, text: str) -> int:
+        return sum(self._slices.get(char, self._fallback)[2] for char in text)
+
+    def compose_into(self, coverage: np.ndarray, text: str, x: int) -> int:
+        """Max-combine the glyphs of `text` into `coverage` from column `x`."""
+
+        for char in text:
+            x0, width, advance = self._slices.get(char, self._fallback)
+            stop = min(x + width, coverage.shape[1])
+            if stop > x:
+                target = coverage[:, x:stop]
+                np.maximum(target, self.coverage[:, x0 : x0 + stop - x], out=target)
+            x += advance
+        return x
+
+
+@functools.lru_cache(maxsize=32)
+def glyph_atlas(font_path: str | None, size: int, color: tuple[int, int, int]) -> GlyphAtlas:
+    """Shared atlas per font/size/colour, built on first use."""
+
+    if font_path is None:
+        font = ImageFont.load_default(size=size)
+    else:
+        font = ImageFont.truetype(font_path, size=size)
+    return GlyphAtlas(font, color)
+
+
+@dataclass
+class HudField:
+    segments: tuple[Segment, ...]
+    rgb: np.ndarray  # (h, w, 3) float32, premultiplied
+    inv_alpha: np.ndarray  # (h, w, 1) float32
+    x0: int
+    y0: int
+
+
+class HudOverlay:
+    """Top-of-frame HUD: arena name, timer, seed, team scores and an optional banner.
+
+    `update` re-composes only the fields whose text changed; `draw` blends the
+    cached patches into the frame.
+    """
+
+    def __init__(
+        self,
+        frame_size: tuple[int, int],
+        arena_name: str,
+        seed: int | None,
+        teams: Sequence[tuple[str, tuple[int, int, int]]],
+        duration: float,
+        font_path: str | None = None,
+        font_size: int | None = None,
+    ):
+        self.frame_size = frame_size
+        self.teams = list(teams)
+        self.duration = duration
+        self.font_path = font_path
+        self.font_size = font_size or max(12, int(round(min(frame_size) * HUD_FONT_RATIO)))
+        self.margin = int(round(self.font_size * HUD_MARGIN_RATIO))
+        self.recompositions = 0
+        self._fields: dict[str, HudField] = {}
+
+        self._set("arena", ((arena_name, HUD_TEXT_COLOR),), anchor="left", row=0)
+        seed_text = "—" if seed is None else str(seed)
+        self._set("seed", (("seed ", HUD_MUTED_COLOR), (seed_text, HUD_TEXT_COLOR)), anchor="right", row=0)
+
+    def update(self, time: float, scores: Sequence[int] | None = None, banner: str | None = None) -> None:
+        remaining = max(0, int(math.ceil(self.duration - time - 1e-9)))
+        minutes, seconds = divmod(remaining, 60)
+        self._set("timer", ((f"{minutes:02d}:{seconds:02d}", HUD_TEXT_COLOR),), anchor="center", row=0)
+
+        scores = list(scores) if scores is not None else [0] * len(self.teams)
+        segments: list[Segment] = []
+        for index, ((name, color), score) in enumerate(zip(self.teams, scores)):
+            if index:
+                segments.append(("  ·  ", HUD_MUTED_COLOR))
+            segments.append((f"{name} {score}", color))
+        self._set("scores", tuple(segments), anchor="center", row=1)
+        if banner is None:
+            self._fields.pop("banner", None)
+        else:
+            self._set("banner", ((banner, HUD_BANNER_COLOR),), anchor="center", row=2)
+
+    @property
+    def signature(self) -> tuple[tuple[Segment, ...], ...]:
+        """Displayed content; equal signatures draw identical pixels."""
+
+        return tuple(field.segments for field in self._fields.values())
+
+    def draw(self, frame: np.ndarray) -> None:
+        for field in self._fields.values():
+            blend_premultiplied(frame, field.rgb, field.inv_alpha, field.x0, field.y0)
+
+    def _set(self, name: str, segments: tuple[Segment, ...], anchor: str, row: int) -> None:
+        current = self._fields.get(name)
+        if current is not None and current.segments == segments:
+            return
+        self._fields[name] = self._compose(segments, anchor, row)
+        self.recompositions += 1
+
+    def _compose(self, segments: tuple[Segment, ...], anchor: str, row: int) -> HudField:
+        atlases = [glyph_atlas(self.font_path, self.font_size, color) for _, color in segments]
+        height = atlases[0].height
+        widths = [atlas.measure(text) for atlas, (text, _) in zip(atlases, segments)]
+        width = max(1, sum(widths) + self.font_size)  # room for glyph overhang
+
+        rgb = np.zeros((height, width, 3), dtype=np.float32)
+        alpha = np.zeros((height, width), dtype=np.float32)
+        coverage = np.empty((height, width), dtype=np.float32)
+        x = 0
+        for atlas, (text, color), advance in zip(atlases, segments, widths):
+            coverage.fill(0.0)
+            atlas.compose_into(coverage, text, x)
+            rgb += coverage[..., None] * np.asarray(color, dtype=np.float32)
+            np.maximum(alpha, coverage, out=alpha)
+            x += advance
+
+        frame_w, _ = self.frame_size
+        text_w = sum(widths)
+        if anchor == "left":
+            x0 = self.margin
+        elif anchor == "right":
+            x0 = frame_w - self.margin - text_w
+        else:
+            x0 = (frame_w - text_w) // 2
+        y0 = self.margin + row * int(round(height * 1.15))
+        return HudField(segments, rgb, (1.0 - alpha)[..., None], x0, y0)
@@ -0,0 +1,81 @@
+"""Cubic Hermite interpolation of ball states between two captured frames.
+
+Positions and velocities are both captured, so the curve between two frames
+matches the end positions and the end velocities: intermediate frames follow
+the ball's motion (curving through bounces) instead of a straight segment,
+and cost no simulation.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .simulation import BallState, SimulationSnapshot
+
+
+def hermite(
+    p0: np.ndarray, v0: np.ndarray, p1: np.ndarray, v1: np.ndarray, dt: np.ndarray | float, u: np.ndarray | float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Positions and velocities at fraction `u` of an interval lasting `dt`.
+
+    Arrays broadcast together, so one call interpolates every ball (and every
+    output time) at once.
+    """
+
+    u2 = u * u
+    u3 = u2 * u
+    h00 = 2.0 * u3 - 3.0 * u2 + 1.0
+    h10 = u3 - 2.0 * u2 + u
+    h01 = -2.0 * u3 + 3.0 * u2
+    h11 = u3 - u2
+    positions = h00 * p0 + h10 * dt * v0 + h01 * p1 + h11 * dt * v1
+    # Derivatives of the basis, divided by dt to get back to units/s.
+    d00 = 6.0 * u2 - 6.0 * u
+    d10 = 3.0 * u2 - 4.0 * u + 1.0
+    d11 = 3.0 * u2 - 2.0 * u
+    velocities = (d00 * p0 - d00 * p1) / np.where(dt > 0, dt, 1.0) + d10 * v0 + d11 * v1
+    return positions, velocities
+
+
+def interpolate_snapshot(before: SimulationSnapshot, after: SimulationSnapshot, u: float) -> SimulationSnapshot:
+    """Snapshot at fraction `u` between two consecutive captures.
+
+    Discrete state (scores, tokens, balls added or knocked out) switches at
+    mid-interval; events stay attached to the captured snapshots.
+    """
+
+    dt = after.time - before.time
+    late = u >= 0.5
+    balls = []
+    for index, ball in enumerate(after.balls):
+        if index >= len(before.balls):  # appeared during the interval (Life+)
+            balls.append(ball.copy() if late else _hidden(ball))
+            continue
+        start = before.balls[index]
+        position, velocity = hermite(start.position, start.velocity, ball.position, ball.velocity, dt, u)
+        balls.append(
+            BallState(
+                team_index=ball.team_index,
+                team=ball.team,
+                name=ball.name,
+                position=position.astype(ball.position.dtype),
+                velocity=velocity.astype(ball.velocity.dtype),
+                radius=ball.radius,
+                mass=ball.mass if late else start.mass,
+                active=start.active and (ball.active or not late),
+            )
+        )
+    source = after if late else before
+    return SimulationSnapshot(
+        frame_index=before.frame_index,
+        time=before.time + dt * u,
+        balls=balls,
+        scores=list(source.scores),
+        tokens=list(source.tokens),
+    )
+
+
+def _hidden(ball: BallState) -> BallState:
+    hidden = ball.copy()
+    hidden.active = False
+    return hidden
@@ -0,0 +1,261 @@
+"""Live preview: hot-reload a scene file while it plays.
+
+`LiveSession` keeps the simulation of the loaded scene plus periodic
+checkpoints (`Simulation.clone`), so every frame is at most
+`checkpoint_interval` seconds of physics away: seeking restores the closest
+earlier checkpoint and steps forward without rasterizing anything. When the
+scene file changes, only what the edit touches is rebuilt:
+
+- presentation only (names, colors, duration): the simulation and its
+  checkpoints are kept, only the sprites and the HUD are rebuilt;
+- physics (spawns, speeds, friction, buffs...): the simulation restarts, on
+  the same static arena raster;
+- arena: the background is rasterized again as well.
+
+`run_live` plays a session in the preview window in real time. After a
+reload it resumes at the playhead, catching up by simulating faster than
+real time.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .backends import PhysicsBackend, create_backend
+from .profiling import RenderProfiler
+from .render import FrameRenderer, RenderSettings, _build_projection
+from .scene import SceneConfig, load_scene_config
+from .simulation import DT, SimulationSnapshot
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_INTERVAL = 1.0  # seconds of physics between two checkpoints
+DEFAULT_POLL = 0.25  # seconds between two checks of the scene file
+SCRUB_SECONDS = 1.0  # playhead jump of the arrow keys
+SCRUB_KEYS = {"left": -SCRUB_SECONDS, "right": SCRUB_SECONDS, "home": 0.0}
+
+
+def physics_key(scene: SceneConfig) -> SceneConfig:
+    """`scene` stripped of the fields that do not change the simulation."""
+
+    teams = [dataclasses.replace(team, name="", color=(0, 0, 0)) for team in scene.teams]
+    return dataclasses.replace(scene, name="", duration_seconds=0.0, teams=teams)
+
+
+class SceneWatcher:
+    """Detect edits of a file by polling its modification time and size."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._stamp = self._read()
+
+    def changed(self) -> bool:
+        """True once per edit; a file briefly missing while an editor saves it is not one."""
+
+        stamp = self._read()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        return True
+
+    def _read(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+class LiveSession:
+    """A scene's simulation with checkpoints, and the renderer drawing it."""
+
+    def __init__(
+        self,
+        scene: SceneConfig,
+        settings: RenderSettings | None = None,
+        seed: int | None = None,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+        profiler: RenderProfiler | None = None,
+    ):
+        self.settings = settings or RenderSettings()
+        self.seed = seed
+        self.checkpoint_interval = checkpoint_interval
+        self.profiler = profiler or RenderProfiler()
+        self.scene = scene
+        self.renderer = self._build_renderer()
+        self._restart()
+
+    @property
+    def frame(self) -> int:
+        """Index of the last simulated frame (-1 before the first)."""
+
+        return self.snapshot.frame_index if self.snapshot is not None else -1
+
+    def reload(self, scene: SceneConfig) -> str:
+        """Switch to an edited `scene`; returns what was rebuilt ("visual", "physics" or "arena")."""
+
+        if scene.arena != self.scene.arena:
+            kind = "arena"
+        elif physics_key(scene) != physics_key(self.scene):
+            kind = "physics"
+        else:
+            kind = "visual"
+        self.scene = scene
+        if kind == "arena":
+            self.renderer.close()
+            self.renderer = self._build_renderer()
+        else:
+            self.renderer.retarget(scene)
+        if kind != "visual":
+            frame = self.frame
+            self._restart()
+            self.seek(frame)  # catch up with the playhead
+        self.profiler.count(f"live_reload_{kind}")
+        return kind
+
+    def seek(self, frame: int) -> SimulationSnapshot | None:
+        """Snapshot of `frame`, simulated from the closest checkpoint without rasterizing."""
+
+        frame = min(frame, self.scene.frame_count - 1)
+        if frame < 0:
+            return self.snapshot
+        if frame < self.frame or frame - self.frame > self._every:
+            base = max((index for index in self.checkpoints if index <= frame), default=None)
+            if base is not None and (base > self.frame or frame < self.frame):
+                state, snapshot = self.checkpoints[base]
+                self.simulation, self.snapshot = state.clone(), snapshot
+                self.profiler.count("live_checkpoint_restores")
+            elif frame < self.frame:
+                self.simulation, self.snapshot = create_backend(self.scene), None
+        with self.profiler.stage("simulation"):
+            while self.frame < frame:
+                self._advance()
+        return self.snapshot
+
+    def render(self) -> np.ndarray:
+        """Rasterize the current frame (the first one if nothing was simulated yet)."""
+
+        if self.snapshot is None:
+            self.seek(0)
+        assert self.snapshot is not None
+        return self.renderer.render(self.snapshot)
+
+    def _build_renderer(self) -> FrameRenderer:
+        projection = _build_projection(self.scene, self.settings)
+        return FrameRenderer(self.scene, projection, self.settings, self.profiler, seed=self.seed)
+
+    def _restart(self) -> None:
+        self.simulation: PhysicsBackend = create_backend(self.scene)
+        self.snapshot: SimulationSnapshot | None = None
+        self.checkpoints: dict[int, tuple[PhysicsBackend, SimulationSnapshot]] = {}
+        self._checkpointing = self.simulation.supports_checkpoints
+        if not self._checkpointing:
+            LOGGER.info(
+                "Backend '%s' sans checkpoints: les retours en arrière re-simulent depuis le début", self.scene.backend
+            )
+        self._steps = max(1, int(round((1.0 / self.scene.frame_rate) / DT)))
+        self._every = max(1, int(round(self.checkpoint_interval * self.scene.frame_rate)))
+
+    def _advance(self) -> None:
+        """Simulate the next frame, exactly as `simulate_frames` does."""
+
+        index = self.frame + 1
+        for _ in range(self._steps):
+            self.simulation.step()
+        self.simulation.time = (index + 1) / self.scene.frame_rate
+        self.snapshot = self.simulation.capture(index)
+        self.profiler.count("live_simulated_frames")
+        if self._checkpointing and index % self._every == 0 and index not in self.checkpoints:
+            self.checkpoints[index] = (self.simulation.clone(), self.snapshot)
+
+
+def run_live(
+    scene_path: str | Path,
+    seed: int | None = None,
+    settings: RenderSettings | None = None,
+    overrides: dict[str, Any] | None = None,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    poll: float = DEFAULT_POLL,
+) -> int:
+    """Play `scene_path` in the preview window, reloading it on every save.
+
+    Keys: space pauses, left/right move the playhead by `SCRUB_SECONDS`,
+    home goes back to the start. `overrides` are scene fields re-applied after
+    each reload (CLI options such as `backend`).
+    """
+
+    from .preview import PreviewWindow
+
+    settings = settings or RenderSettings()
+
+    def load() -> SceneConfig:
+        return dataclasses.replace(load_scene_config(scene_path, seed=seed), **(overrides or {}))
+
+    session = LiveSession(load(), settings, seed, checkpoint_interval)
+    try:
+        window = PreviewWindow(settings.frame_size, session.scene.frame_rate)
+    except RuntimeError as exc:
+        LOGGER.error("Aperçu en direct indisponible: %s", exc)
+        session.renderer.close()
+        return 1
+    watcher = SceneWatcher(scene_path)
+    LOGGER.info("Aperçu en direct de %s — espace: pause, ←/→: ±%gs, début: retour au départ", scene_path, SCRUB_SECONDS)
+
+    playhead = 0.0  # seconds
+    paused = False
+    dirty = True
+    last = next_poll = time.perf_counter()
+    try:
+        while True:
+            now = time.perf_counter()
+            if not paused:
+                playhead += now - last
+            last = now
+            if now >= next_poll:
+                next_poll = now + poll
+                if watcher.changed():
+                    try:
+                        edited = load()
+                    except Exception as exc:  # a half-written file can fail anywhere in the parser
+                        LOGGER.warning("Scène invalide, l'aperçu garde la version précédente: %s", exc)
+                    else:
+                        start = time.perf_counter()
+                        kind = session.reload(edited)
+                        session.renderer.reset()
+                        dirty = True
+                        LOGGER.info(
+                            "Scène rechargée (%s) en %.0f ms, reprise à %.2fs",
+                            kind,
+                            (time.perf_counter() - start) * 1000.0,
+                            playhead,
+                        )
+            for key in window.keys():
+                if key == "space":
+                    paused = not paused
+                elif key in SCRUB_KEYS:
+                    playhead = max(0.0, playhead + SCRUB_KEYS[key]) if key != "home" else 0.0
+                    session.renderer.reset()
+                    dirty = True
+            frame = int(playhead * session.scene.frame_rate)
+            if frame >= session.scene.frame_count:  # loop the clip
+                playhead, frame = 0.0, 0
+                session.renderer.reset()
+            if frame != session.frame or dirty:
+                session.seek(frame)
+                window.show(session.render())
+                dirty = False
+            time.sleep(max(0.0, 1.0 / session.scene.frame_rate - (time.perf_counter() - now)))
+    except RuntimeError as exc:  # window closed
+        LOGGER.info("Aperçu terminé: %s", exc)
+    except KeyboardInterrupt:
+        LOGGER.info("Aperçu interrompu")
+    finally:
+        window.close()
+        session.renderer.close()
+    return 0
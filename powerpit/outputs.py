@@ -0,0 +1,333 @@
+"""Several encoded outputs fed from a single simulation and raster pass.
+
+Each `OutputSpec` selects a resolution, a frame rate, a codec and a frame
+range; `OutputFanout` downscales each rendered frame at most once per target
+size (reusing a larger intermediate when the ratio is an integer) and hands
+it to every encoder that wants it.
+
+Besides MP4 and animated images, two raw outputs feed external encoders:
+``.y4m`` writes a YUV4MPEG2 stream to a file or a named pipe (``-`` is
+stdout), and ``.frames`` fills a memory-mapped `FrameStore` that other
+processes read while the render goes on.
+
+    python cli.py --scene ... --out out/clip.mp4 --also out/clip_540.mp4,size=540x960
+    python cli.py --scene ... --out out/clip.mp4 --also=-.y4m | ffmpeg -i - ...
+"""
+
+from __future__ import annotations
+
+import logging
+import stat
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+try:  # pragma: no cover - import guard for environments missing imageio
+    import imageio.v2 as imageio
+except ImportError:  # pragma: no cover
+    try:
+        import imageio  # type: ignore[no-redef]
+    except ImportError as exc:  # pragma: no cover
+        raise RuntimeError(
+            "Le module 'imageio' est requis pour le rendu vidéo. "
+            "Installez les dépendances avec 'pip install -e .[dev]' ou 'pip install -r requirements.txt'."
+        ) from exc
+
+import numpy as np
+from PIL import Image
+
+from .framestore import FrameStore
+from .raster import box_downscale
+
+LOGGER = logging.getLogger(__name__)
+
+ANIMATED_IMAGE_SUFFIXES = {".gif", ".webp"}
+Y4M_SUFFIX = ".y4m"
+FRAME_STORE_SUFFIX = ".frames"
+STDOUT_PATH = "-"
+# RGB -> Y'CbCr, BT.601 limited range (what encoders assume for Y4M input).
+_YUV_MATRIX = np.array(
+    [[65.481, 128.553, 24.966], [-37.797, -74.203, 112.0], [112.0, -93.786, -18.214]], dtype=np.float32
+) / 255.0
+_YUV_OFFSET = np.array([16.0, 128.0, 128.0], dtype=np.float32)
+DEFAULT_THUMBNAIL_SECONDS = 3.0
+DEFAULT_THUMBNAIL_FPS = 12
+PREVIEW_PRESET = "veryfast"
+
+
+class OutputSpecError(ValueError):
+    """Raised when an output specification is invalid."""
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """One encoded deliverable of a render.
+
+    `size` is `(width, height)` (the render size when None), `fps` must divide
+    into the output frame rate by decimation, and `frames` is a half-open
+    `[start, stop)` range of output frame indices: frames as written to the
+    master, which differ from the captured scene frames once interpolation,
+    hitstop or KO replays are on.
+    """
+
+    path: Path
+    size: tuple[int, int] | None = None
+    fps: int | None = None
+    codec: str = "libx264"
+    frames: tuple[int, int | None] = (0, None)
+    preset: str | None = None  # x264 speed/size trade-off, ffmpeg default when None
+
+    @property
+    def is_animated_image(self) -> bool:
+        return self.path.suffix.lower() in ANIMATED_IMAGE_SUFFIXES
+
+    @property
+    def is_stdout(self) -> bool:
+        return str(self.path) in {STDOUT_PATH, STDOUT_PATH + Y4M_SUFFIX}
+
+    @property
+    def is_y4m(self) -> bool:
+        return self.path.suffix.lower() == Y4M_SUFFIX or self.is_stdout
+
+    @property
+    def is_frame_store(self) -> bool:
+        return self.path.suffix.lower() == FRAME_STORE_SUFFIX
+
+
+def parse_output_spec(text: str) -> OutputSpec:
+    """Parse `PATH[,size=WxH][,fps=N][,codec=C][,preset=P][,frames=A-B]`."""
+
+    path, *options = text.split(",")
+    if not path:
+        raise OutputSpecError(f"Sortie invalide: '{text}' (chemin manquant).")
+    fields: dict[str, Any] = {}
+    for option in options:
+        name, sep, value = option.partition("=")
+        if not sep:
+            raise OutputSpecError(f"Option de sortie invalide: '{option}' (attendu nom=valeur).")
+        if name not in {"size", "fps", "codec", "preset", "frames"}:
+            raise OutputSpecError(f"Option de sortie inconnue: '{name}'.")
+        try:
+            if name == "size":
+                width, height = value.lower().split("x")
+                fields["size"] = (int(width), int(height))
+            elif name == "fps":
+                fields["fps"] = int(value)
+            elif name in ("codec", "preset"):
+                fields[name] = value
+            else:
+                start, _, stop = value.partition("-")
+                fields["frames"] = (int(start or 0), int(stop) if stop else None)
+        except ValueError as exc:
+            raise OutputSpecError(f"Valeur invalide pour '{name}': '{value}'.") from exc
+    return OutputSpec(Path(path), **fields)
+
+
+def default_deliverables(master: str | Path, frame_size: tuple[int, int], frame_rate: int) -> list[OutputSpec]:
+    """Half-resolution MP4 preview and a short quarter-resolution WebP thumbnail."""
+
+    master = Path(master)
+    width, height = frame_size
+    return [
+        OutputSpec(
+            master.with_name(f"{master.stem}_preview.mp4"),
+            size=(width // 2, height // 2),
+            preset=PREVIEW_PRESET,
+        ),
+        OutputSpec(
+            master.with_name(f"{master.stem}_thumb.webp"),
+            size=(width // 4, height // 4),
+            fps=min(DEFAULT_THUMBNAIL_FPS, frame_rate),
+            frames=(0, int(DEFAULT_THUMBNAIL_SECONDS * frame_rate)),
+        ),
+    ]
+
+
+class Y4MWriter:
+    """YUV4MPEG2 (4:2:0) stream written to a file, a named pipe or stdout."""
+
+    def __init__(self, spec: OutputSpec, size: tuple[int, int], fps: int):
+        self.size = size
+        if spec.is_stdout:
+            self._stream = sys.stdout.buffer
+            self._owned = False
+        else:
+            self._stream = open(spec.path, "wb")
+            self._owned = True
+        width, height = size
+        self._stream.write(f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 C420jpeg XCOLORRANGE=LIMITED\n".encode())
+
+    def append_data(self, frame: np.ndarray) -> None:
+        self._stream.write(b"FRAME\n")
+        for plane in rgb_to_yuv420(frame):
+            self._stream.write(plane.data)
+
+    def close(self) -> None:
+        if self._owned:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+
+def rgb_to_yuv420(frame: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Y (full size), Cb and Cr (half size, 2×2 averages) uint8 planes of an RGB frame."""
+
+    height, width = frame.shape[:2]
+    rgb = frame.astype(np.float32)
+    luma = rgb @ _YUV_MATRIX[0] + _YUV_OFFSET[0]
+    if height % 2 or width % 2:  # odd sizes: chroma covers the last row/column on its own
+        rgb = np.pad(rgb, ((0, height % 2), (0, width % 2), (0, 0)), mode="edge")
+    # Chroma is linear in RGB: average the 2×2 blocks first, then convert.
+    block = rgb.reshape(rgb.shape[0] // 2, 2, rgb.shape[1] // 2, 2, 3).mean(axis=(1, 3))
+    chroma = block @ _YUV_MATRIX[1:].T + _YUV_OFFSET[1:]
+    planes = (luma, chroma[..., 0], chroma[..., 1])
+    return tuple(np.ascontiguousarray(np.clip(np.rint(plane), 0, 255).astype(np.uint8)) for plane in planes)
+
+
+class OutputWriter:
+    """Encoder of one `OutputSpec`, with frame-range and decimation filtering.
+
+    `frame_count` (frames the render will emit, an upper bound is fine) sizes
+    frame stores whose spec has no closed frame range.
+    """
+
+    def __init__(
+        self, spec: OutputSpec, frame_size: tuple[int, int], frame_rate: int, frame_count: int | None = None
+    ):
+        fps = spec.fps or frame_rate
+        if fps <= 0 or fps > frame_rate:
+            raise OutputSpecError(f"{spec.path}: fps doit être entre 1 et {frame_rate}.")
+        size = spec.size or frame_size
+        if size[0] <= 0 or size[1] <= 0 or size[0] > frame_size[0] or size[1] > frame_size[1]:
+            raise OutputSpecError(f"{spec.path}: taille {size} hors de (1, 1)–{frame_size}.")
+        self.spec = spec
+        self.size = size
+        self.fps = fps
+        self.frame_rate = frame_rate
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.store: FrameStore | None = None
+        if spec.is_stdout:
+            self._writer: Any = Y4MWriter(spec, size, fps)
+            return
+        spec.path.parent.mkdir(parents=True, exist_ok=True)
+        if not (spec.path.exists() and stat.S_ISFIFO(spec.path.stat().st_mode)):  # keep named pipes
+            spec.path.unlink(missing_ok=True)
+        if spec.is_y4m:
+            self._writer = Y4MWriter(spec, size, fps)
+        elif spec.is_frame_store:
+            self.store = FrameStore.create(spec.path, self._capacity(frame_count), size, fps)
+        elif spec.is_animated_image:
+            self._writer = imageio.get_writer(spec.path, duration=1000.0 / fps, loop=0)
+        else:
+            self._writer = imageio.get_writer(
+                spec.path,
+                fps=fps,
+                format="mp4",
+                codec=spec.codec,
+                macro_block_size=None,
+                ffmpeg_params=["-preset", spec.preset] if spec.preset else None,
+            )
+
+    def wants(self, frame_index: int) -> bool:
+        start, stop = self.spec.frames
+        if frame_index < start or (stop is not None and frame_index >= stop):
+            return False
+        if self.fps == self.frame_rate:
+            return True
+        local = frame_index - start
+        # Keep a frame whenever the output clock crosses a new tick.
+        return (local * self.fps) // self.frame_rate != ((local - 1) * self.fps) // self.frame_rate
+
+    def write(self, frame: np.ndarray, frame_index: int | None = None) -> None:
+        if self.store is not None:
+            if not self.store.append(frame, self.frames_written if frame_index is None else frame_index):
+                self.frames_dropped += 1
+                return
+        else:
+            self._writer.append_data(frame)
+        self.frames_written += 1
+
+    def close(self) -> None:
+        if self.store is not None:
+            if self.frames_dropped:
+                LOGGER.warning("%s: frame store plein, %d frames ignorées.", self.spec.path, self.frames_dropped)
+            self.store.close()
+        else:
+            self._writer.close()
+
+    def _capacity(self, frame_count: int | None) -> int:
+        start, stop = self.spec.frames
+        end = stop if frame_count is None else (frame_count if stop is None else min(stop, frame_count))
+        if end is None:
+            raise OutputSpecError(f"{self.spec.path}: un frame store requiert un nombre de frames (frames=A-B).")
+        count = max(1, end - start)
+        if self.fps == self.frame_rate:
+            return count
+        return -(-count * self.fps // self.frame_rate) + 1
+
+
+class OutputFanout:
+    """Distribute each rendered frame to every output, downscaling once per size."""
+
+    def __init__(
+        self,
+        specs: Sequence[OutputSpec],
+        frame_size: tuple[int, int],
+        frame_rate: int,
+        frame_count: int | None = None,
+    ):
+        self.frame_size = frame_size
+        self.writers: list[OutputWriter] = []
+        try:
+            for spec in specs:
+                self.writers.append(OutputWriter(spec, frame_size, frame_rate, frame_count))
+        except Exception:
+            self.close()
+            raise
+        # Largest targets first so that smaller ones can reuse them.
+        self._sizes = sorted({writer.size for writer in self.writers}, key=lambda size: -size[0] * size[1])
+        self._scaled: dict[tuple[int, int], np.ndarray] = {}
+
+    def write(self, frame_index: int, frame: np.ndarray) -> None:
+        """Encode `frame`; passing the previous array again reuses its downscales."""
+
+        wanted = [writer for writer in self.writers if writer.wants(frame_index)]
+        if not wanted:
+            return
+        needed = {writer.size for writer in wanted}
+        if self._scaled.get(self.frame_size) is not frame:
+            self._scaled = {self.frame_size: frame}
+        scaled = self._scaled
+        for size in self._sizes:
+            if size in needed and size not in scaled:
+                scaled[size] = _downscale(_closest_source(scaled, size), size)
+        for writer in wanted:
+            writer.write(scaled[writer.size], frame_index)
+
+    def close(self) -> None:
+        for writer in self.writers:
+            writer.close()
+
+
+def _closest_source(scaled: dict[tuple[int, int], np.ndarray], size: tuple[int, int]) -> np.ndarray:
+    """Smallest already-scaled image that is an integer multiple of `size`."""
+
+    best: np.ndarray | None = None
+    for (width, height), image in scaled.items():
+        if width % size[0] == 0 and height % size[1] == 0 and width // size[0] == height // size[1]:
+            if best is None or width < best.shape[1]:
+                best = image
+    if best is not None:
+        return best
+    return max(scaled.values(), key=lambda image: image.shape[0] * image.shape[1])
+
+
+def _downscale(image: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+    width, height = size
+    src_h, src_w = image.shape[:2]
+    factor = src_w // width
+    if factor > 1 and factor * width == src_w and factor * height == src_h:
+        return box_downscale(image, factor)
+    return np.asarray(Image.fromarray(image).resize(size, Image.BILINEAR))
@@ -1,18 +1,83 @@
-"""Optional real-time preview window using pygame."""
+"""Optional real-time preview window using pygame.
+
+The window runs on its own thread and reads from a single-slot mailbox: the
+export loop only drops a downscaled copy of the latest frame and never waits
+for the display. When the preview falls behind, older frames are overwritten
+and simply never shown.
+"""
 
 from __future__ import annotations
 
+import math
+import queue
 import threading
 from typing import TYPE_CHECKING, Tuple
 
 if TYPE_CHECKING:  # pragma: no cover
     import numpy as np
 
+DEFAULT_PREVIEW_MAX_SIZE = (540, 960)  # (width, height) bounding box of the view
+
+
+class LatestFrameMailbox:
+    """Single-slot, thread-safe mailbox keeping only the most recent item."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._item: "np.ndarray | None" = None
+        self._closed = False
+        self.posted = 0
+        self.dropped = 0
+
+    def put(self, item: "np.ndarray") -> None:
+        """Store `item`, replacing (and counting as dropped) any unread one."""
+
+        with self._cond:
+            if self._closed:
+                return
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self.posted += 1
+            self._cond.notify()
+
+    def take(self, timeout: float | None = None) -> "np.ndarray | None":
+        """Return the latest item, waiting up to `timeout` seconds for one."""
+
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._item = None
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+def downscale_step(size: Tuple[int, int], max_size: Tuple[int, int]) -> int:
+    """Return the integer stride that fits `size` inside `max_size`."""
+
+    width, height = size
+    max_w, max_h = max_size
+    return max(1, math.ceil(max(width / max_w, height / max_h)))
+
 
 class PreviewWindow:
-    """Display frames in a pygame window during export."""
+    """Display frames in a pygame window during export without blocking it."""
 
-    def __init__(self, size: Tuple[int, int], fps: int):
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        fps: int,
+        max_size: Tuple[int, int] = DEFAULT_PREVIEW_MAX_SIZE,
+    ):
         try:
             import pygame
         except ImportError as exc:  # pragma: no cover - optional dependency
@@ -22,26 +87,75 @@ class PreviewWindow:
             ) from exc
 
         self._pygame = pygame
-        pygame.init()
-        self._size = size
         self._fps = fps
-        self._screen = pygame.display.set_mode(size)
-        pygame.display.set_caption("Power Pit Preview")
-        self._clock = pygame.time.Clock()
-        self._lock = threading.Lock()
+        self._step = downscale_step(size, max_size)
+        width, height = size
+        self._view_size = (-(-width // self._step), -(-height // self._step))
+        self._mailbox = LatestFrameMailbox()
+        self._keys: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._error: str | None = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="powerpit-preview", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError(self._error)
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._mailbox.dropped
+
+    def keys(self) -> list[str]:
+        """Names of the keys pressed since the last call (`"left"`, `"space"`...)."""
+
+        pressed = []
+        while not self._keys.empty():
+            pressed.append(self._keys.get_nowait())
+        return pressed
 
     def show(self, frame: "np.ndarray") -> None:
-        with self._lock:
-            for event in self._pygame.event.get():
-                if event.type == self._pygame.QUIT:
-                    self.close()
-                    raise RuntimeError("Fenêtre de prévisualisation fermée par l'utilisateur")
+        """Post a downscaled copy of `frame`; returns immediately."""
 
-            surface = self._pygame.image.frombuffer(frame.tobytes(), self._size, "RGB")
-            self._screen.blit(surface, (0, 0))
-            self._pygame.display.flip()
-            self._clock.tick(self._fps)
+        if self._error is not None:
+            raise RuntimeError(self._error)
+        view = frame[:: self._step, :: self._step]
+        self._mailbox.put(view.copy(order="C"))
 
     def close(self) -> None:
-        with self._lock:
-            self._pygame.quit()
+        self._mailbox.close()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    # ----------------------------------------------------------------- thread
+    def _run(self) -> None:
+        pygame = self._pygame
+        try:
+            pygame.init()
+            screen = pygame.display.set_mode(self._view_size)
+            pygame.display.set_caption("Power Pit Preview")
+            clock = pygame.time.Clock()
+        except Exception as exc:  # pragma: no cover - depends on the display
+            self._error = f"Impossible d'ouvrir la fenêtre de prévisualisation: {exc}"
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            while not self._mailbox.closed:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self._error = "Fenêtre de prévisualisation fermée par l'utilisateur"
+                        self._mailbox.close()
+                        return
+                    if event.type == pygame.KEYDOWN:
+                        self._keys.put(pygame.key.name(event.key))
+                frame = self._mailbox.take(timeout=1.0 / self._fps)
+                if frame is None:
+                    continue
+                height, width = frame.shape[:2]
+                surface = pygame.image.frombuffer(frame, (width, height), "RGB")
+                screen.blit(surface, (0, 0))
+                pygame.display.flip()
+                clock.tick(self._fps)
+        finally:
+            pygame.quit()
@@ -0,0 +1,77 @@
+"""Lightweight per-stage profiler for the render pipeline."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class RenderProfiler:
+    """Accumulate wall time per pipeline stage and named counters."""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        stats = self.stages.setdefault(name, StageStats())
+        stats.calls += 1
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def total(self, name: str) -> float:
+        stats = self.stages.get(name)
+        return stats.total if stats is not None else 0.0
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        report: dict[str, dict[str, float]] = {
+            name: {
+                "calls": stats.calls,
+                "total_s": stats.total,
+                "mean_ms": stats.mean * 1000.0,
+                "max_ms": stats.max * 1000.0,
+            }
+            for name, stats in self.stages.items()
+        }
+        if self.counters:
+            report["counters"] = dict(self.counters)
+        return report
+
+    def log(self, logger: logging.Logger, level: int = logging.INFO) -> None:
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].total):
+            logger.log(
+                level,
+                "Profil %-10s total=%.3fs  moy=%.2fms  max=%.2fms  (%d appels)",
+                name,
+                stats.total,
+                stats.mean * 1000.0,
+                stats.max * 1000.0,
+                stats.calls,
+            )
+        for name, value in sorted(self.counters.items()):
+            logger.log(level, "Compteur %-18s %d", name, value)
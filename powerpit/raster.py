@@ -0,0 +1,152 @@
+"""NumPy raster helpers: pre-rasterized ball sprites and buffer stamping."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+SPRITE_SUPERSAMPLE = 4
+OUTLINE_COLOR = (255, 255, 255)
+
+
+@dataclass(frozen=True)
+class BallSprite:
+    """Antialiased ball image: premultiplied `rgb` and coverage `alpha`."""
+
+    rgb: np.ndarray  # (S, S, 3) float32, premultiplied by alpha
+    alpha: np.ndarray  # (S, S, 1) float32 in [0, 1]
+    inv_alpha: np.ndarray  # (S, S, 1) float32, 1 - alpha
+
+    @property
+    def size(self) -> int:
+        return int(self.alpha.shape[0])
+
+
+def build_ball_sprite(color: tuple[int, int, int], radius_px: float, outline_px: float = 2.0) -> BallSprite:
+    """Rasterize a filled, outlined disc once, supersampled for smooth edges."""
+
+    size = max(1, math.ceil(radius_px * 2.0) + 2)
+    ss = SPRITE_SUPERSAMPLE
+    canvas = size * ss
+    center = canvas / 2.0
+    radius = radius_px * ss
+    bbox = [center - radius, center - radius, center + radius, center + radius]
+    outline = max(1, int(round(outline_px * ss)))
+
+    color_img = Image.new("RGB", (canvas, canvas), (0, 0, 0))
+    ImageDraw.Draw(color_img).ellipse(bbox, fill=color, outline=OUTLINE_COLOR, width=outline)
+    mask_img = Image.new("L", (canvas, canvas), 0)
+    ImageDraw.Draw(mask_img).ellipse(bbox, fill=255)
+
+    # Box-downsampling the colour drawn over black yields premultiplied RGB.
+    rgb = np.asarray(color_img.resize((size, size), Image.BOX), dtype=np.float32)
+    alpha = np.asarray(mask_img.resize((size, size), Image.BOX), dtype=np.float32)[..., None] / 255.0
+    return BallSprite(rgb=rgb, alpha=alpha, inv_alpha=1.0 - alpha)
+
+
+def build_token_sprite(color: tuple[int, int, int], radius_px: float, label: str) -> BallSprite:
+    """Rasterize a buff token: a ring in `color` around a centred `label`."""
+
+    size = max(1, math.ceil(radius_px * 2.0) + 2)
+    ss = SPRITE_SUPERSAMPLE
+    canvas = size * ss
+    center = canvas / 2.0
+    radius = radius_px * ss
+    bbox = [center - radius, center - radius, center + radius, center + radius]
+    ring = max(1, int(round(radius * 0.18)))
+    font = ImageFont.load_default(size=max(1, int(radius * 0.9)))
+
+    color_img = Image.new("RGB", (canvas, canvas), (0, 0, 0))
+    draw = ImageDraw.Draw(color_img)
+    draw.ellipse(bbox, fill=tuple(channel // 4 for channel in color), outline=color, width=ring)
+    draw.text((center, center), label, font=font, fill=OUTLINE_COLOR, anchor="mm")
+    mask_img = Image.new("L", (canvas, canvas), 0)
+    ImageDraw.Draw(mask_img).ellipse(bbox, fill=255)
+
+    rgb = np.asarray(color_img.resize((size, size), Image.BOX), dtype=np.float32)
+    alpha = np.asarray(mask_img.resize((size, size), Image.BOX), dtype=np.float32)[..., None] / 255.0
+    return BallSprite(rgb=rgb, alpha=alpha, inv_alpha=1.0 - alpha)
+
+
+def sprite_origin(sprite: BallSprite, center_x: float, center_y: float) -> tuple[int, int]:
+    """Top-left pixel at which `sprite` must be stamped to be centred."""
+
+    half = sprite.size / 2.0
+    return (int(math.floor(center_x - half + 0.5)), int(math.floor(center_y - half + 0.5)))
+
+
+def clip_box(
+    shape: tuple[int, ...], size: int | tuple[int, int], x0: int, y0: int
+) -> tuple[slice, slice, slice, slice] | None:
+    """Return `(dst_rows, dst_cols, src_rows, src_cols)` or None if off-screen.
+
+    `size` is the side of a square sprite or the `(height, width)` of an image.
+    """
+
+    size_h, size_w = size if isinstance(size, tuple) else (size, size)
+    height, width = shape[0], shape[1]
+    dx0, dy0 = max(x0, 0), max(y0, 0)
+    dx1, dy1 = min(x0 + size_w, width), min(y0 + size_h, height)
+    if dx0 >= dx1 or dy0 >= dy1:
+        return None
+    return (
+        slice(dy0, dy1),
+        slice(dx0, dx1),
+        slice(dy0 - y0, dy1 - y0),
+        slice(dx0 - x0, dx1 - x0),
+    )
+
+
+def stamp_sprite(frame: np.ndarray, sprite: BallSprite, x0: int, y0: int) -> None:
+    """Alpha-blend `sprite` into the uint8 `frame` at top-left `(x0, y0)`."""
+
+    blend_premultiplied(frame, sprite.rgb, sprite.inv_alpha, x0, y0)
+
+
+def blend_premultiplied(frame: np.ndarray, rgb: np.ndarray, inv_alpha: np.ndarray, x0: int, y0: int) -> None:
+    """Blend a premultiplied `(H, W, 3)` image over the uint8 `frame`."""
+
+    box = clip_box(frame.shape, (rgb.shape[0], rgb.shape[1]), x0, y0)
+    if box is None:
+        return
+    rows, cols, src_rows, src_cols = box
+    region = frame[rows, cols]
+    blended = region * inv_alpha[src_rows, src_cols] + rgb[src_rows, src_cols]
+    np.add(blended, 0.5, out=blended)
+    np.minimum(blended, 255.0, out=blended)
+    region[...] = blended
+
+
+def accumulate_sprite(buffer: np.ndarray, sprite: BallSprite, x0: int, y0: int, weight: float) -> None:
+    """Add `weight * sprite` into a float accumulation `buffer`."""
+
+    box = clip_box(buffer.shape, sprite.size, x0, y0)
+    if box is None:
+        return
+    rows, cols, src_rows, src_cols = box
+    buffer[rows, cols] += sprite.rgb[src_rows, src_cols] * weight
+
+
+def box_downscale(image: np.ndarray, factor: int) -> np.ndarray:
+    """Exact `factor`×`factor` box average of a uint8 `(H, W, 3)` image.
+
+    Both dimensions must be multiples of `factor`.
+    """
+
+    if factor == 1:
+        return image
+    height, width = image.shape[0] // factor, image.shape[1] // factor
+    rows = np.add(image[0::factor], image[1::factor], dtype=np.uint16)
+    for offset in range(2, factor):
+        rows += image[offset::factor]
+    # Horizontally adjacent pixels are contiguous: sum channel groups.
+    groups = rows.reshape(height, width, factor * 3)
+    out = np.add(groups[..., 0:3], groups[..., 3:6])
+    for offset in range(2, factor):
+        out += groups[..., 3 * offset : 3 * offset + 3]
+    out += factor * factor // 2
+    out //= factor * factor
+    return out.astype(np.uint8)
@@ -3,76 +3,609 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
-
-try:  # pragma: no cover - import guard for environments missing imageio
-    import imageio.v2 as imageio
-except ImportError:  # pragma: no cover
-    try:
-        import imageio  # type: ignore[no-redef]
-    except ImportError as exc:  # pragma: no cover
-        raise RuntimeError(
-            "Le module 'imageio' est requis pour le rendu vidéo. "
-            "Installez les dépendances avec 'pip install -e .[dev]' ou 'pip install -r requirements.txt'."
-        ) from exc
+from typing import Iterable, Iterator, Sequence
 
 import numpy as np
 from PIL import Image, ImageDraw
 
+from .cache import RenderCache, render_key
+from .effects import (
+    DEFAULT_GLOW_DOWNSAMPLE,
+    DEFAULT_GLOW_INTENSITY,
+    DEFAULT_GLOW_THRESHOLD,
+    DEFAULT_TRAIL_DECAY,
+    DEFAULT_TRAIL_STRENGTH,
+    GLOW_DOWNSAMPLES,
+    GlowStage,
+    TrailLayer,
+)
+from .holes import boundary_points
+from .highlights import FrameScorer, HighlightConfig, HighlightExport, plan_highlights
+from .hud import HudOverlay
+from .interpolation import interpolate_snapshot
+from .outputs import OutputFanout, OutputSpec
 from .preview import PreviewWindow
+from .profiling import RenderProfiler
+from .replay import DEFAULT_REPLAY_AFTER, DEFAULT_REPLAY_SPEED, DEFAULT_REPLAY_WINDOW, TrajectoryHistory
+from .raster import (
+    BallSprite,
+    box_downscale,
+    build_ball_sprite,
+    build_token_sprite,
+    sprite_origin,
+    stamp_sprite,
+)
 from .scene import SceneConfig
-from .simulation import SimulationSnapshot, simulate_frames
+from .simulation import KOEvent, SimulationSnapshot, simulate_frames
+from .tiles import DEFAULT_TILE_HEIGHT, TileGrid, tile_alignment
 
 LOGGER = logging.getLogger(__name__)
 
-FRAME_SIZE = (1920, 1080)  # (width, height)
+FRAME_SIZE = (1080, 1920)  # (width, height), vertical 9:16
+ORIENTATIONS = {"vertical": (9, 16), "horizontal": (16, 9), "square": (1, 1)}
+REFERENCE_SHORT_SIDE = 1080  # line widths below are given at this resolution
+ARENA_LINE_WIDTH = 6
+BUMPER_LINE_WIDTH = 4
+BALL_OUTLINE_WIDTH = 2
+DEFAULT_SETTLE_SPEED = 0.05
+DEFAULT_HITSTOP_IMPULSE = 6.0  # contact impulse (mass × speed) triggering a hitstop
+HITSTOP_COOLDOWN = 0.5  # seconds of play between two hitstops
+DEFAULT_SHAKE_MAX = 24.0  # pixels at REFERENCE_SHORT_SIDE
+SHAKE_DECAY = 0.75  # per output frame
 BACKGROUND_COLOR = (8, 12, 24)
 ARENA_BORDER_COLOR = (38, 168, 255)
 BUMPER_COLOR = (255, 220, 120)
+HOLE_EDGE_COLOR = (255, 80, 110)
+TOKEN_STYLES = {  # buff kind -> (colour, label)
+    "speed": ((90, 230, 255), "S+"),
+    "mass": ((255, 170, 60), "M+"),
+    "life": ((120, 255, 140), "+1"),
+}
 
 
-@dataclass
+@dataclass(frozen=True)
 class Projection:
-    scale: float
-    offset: tuple[float, float]
-
-
-def render_scene(scene: SceneConfig, output_path: str | Path, show_preview: bool = False) -> Path:
-    """Run the simulation and export an MP4 clip."""
+    """World-to-raster mapping and pixel sizes, computed once per render."""
 
+    scale: float  # raster pixels per simulation unit
+    offset: tuple[float, float]
+    frame_size: tuple[int, int] = FRAME_SIZE  # raster (width, height), supersampling included
+    pixel_scale: float = 1.0  # raster short side / REFERENCE_SHORT_SIDE
+    arena_line_px: int = ARENA_LINE_WIDTH
+    bumper_line_px: int = BUMPER_LINE_WIDTH
+    outline_px: float = BALL_OUTLINE_WIDTH
+
+
+def frame_size_for(short_side: int, orientation: str = "vertical") -> tuple[int, int]:
+    """`(width, height)` for a short side and an orientation, rounded to even sizes."""
+
+    if orientation not in ORIENTATIONS:
+        raise ValueError(f"Orientation '{orientation}' non supportée (options: {sorted(ORIENTATIONS)}).")
+    ratio_w, ratio_h = ORIENTATIONS[orientation]
+    long_side = 2 * round(short_side * max(ratio_w, ratio_h) / min(ratio_w, ratio_h) / 2)
+    return (short_side, long_side) if ratio_w <= ratio_h else (long_side, short_side)
+
+
+@dataclass(frozen=True)
+class RenderSettings:
+    """Output settings of a render; they are part of the cache key (unless marked otherwise).
+
+    Frames are rasterized at `frame_size * supersample` and box-filtered down
+    to `frame_size` before encoding.
+    """
+
+    frame_size: tuple[int, int] = FRAME_SIZE  # (width, height) of the encoded video
+    supersample: int = 1
+    codec: str = "libx264"
+    trails: bool = False
+    trail_decay: float = DEFAULT_TRAIL_DECAY
+    trail_strength: float = DEFAULT_TRAIL_STRENGTH
+    glow: bool = False
+    glow_downsample: int = DEFAULT_GLOW_DOWNSAMPLE  # at REFERENCE_SHORT_SIDE, scaled with the raster
+    glow_threshold: float = DEFAULT_GLOW_THRESHOLD
+    glow_intensity: float = DEFAULT_GLOW_INTENSITY
+    hud: bool = False
+    hud_font: str | None = None  # TrueType path; Pillow's bundled font otherwise
+    settle_after: float | None = None  # end the clip once balls rested this many seconds
+    settle_speed: float = DEFAULT_SETTLE_SPEED  # simulation units/s below which a ball rests
+    interpolate: int = 1  # output frames per captured frame (2: 60 fps from a 30 fps scene)
+    hitstop: float = 0.0  # seconds the frame freezes on a hard hit (0.08-0.12 s; 0 disables)
+    hitstop_impulse: float = DEFAULT_HITSTOP_IMPULSE
+    shake: float = 0.0  # shake pixels per unit of contact impulse, at REFERENCE_SHORT_SIDE (0 disables)
+    shake_max: float = DEFAULT_SHAKE_MAX
+    ko_replay: bool = False  # insert a slow-motion replay after each KO
+    replay_speed: float = DEFAULT_REPLAY_SPEED
+    replay_window: float = DEFAULT_REPLAY_WINDOW  # seconds of history retained (replay length)
+    replay_after: float = DEFAULT_REPLAY_AFTER  # seconds of the replay following the KO
+    # Tile-parallel raster (see `powerpit.tiles`): same pixels, so not part of the cache key.
+    raster_threads: int = field(default=1, metadata={"cache": False})  # 0: one per CPU
+    tile_height: int = field(default=DEFAULT_TILE_HEIGHT, metadata={"cache": False})  # rows, at raster resolution
+
+    @property
+    def raster_size(self) -> tuple[int, int]:
+        width, height = self.frame_size
+        return (width * self.supersample, height * self.supersample)
+
+    def output_frame_rate(self, scene: SceneConfig) -> int:
+        return scene.frame_rate * self.interpolate
+
+    def max_output_frames(self, scene: SceneConfig) -> int:
+        """Upper bound of the frames a render emits (hitstops and replays add some)."""
+
+        frame_rate = self.output_frame_rate(scene)
+        frames = scene.frame_count * self.interpolate
+        hold = int(round(self.hitstop * frame_rate))
+        if hold:
+            cooldown = int(round(HITSTOP_COOLDOWN * frame_rate))
+            frames += hold * (frames // (cooldown + 1) + 1)
+        if self.ko_replay:
+            knockouts = sum(len(team.players) for team in scene.teams)
+            if scene.buffs is not None:  # Life+ adds balls that can be knocked out too
+                knockouts += int(scene.duration_seconds / scene.buffs.spawn_every[0]) + 1
+            frames += knockouts * (int(math.ceil(self.replay_window / self.replay_speed * frame_rate)) + 1)
+        return frames
+
+
+class FrameRenderer:
+    """Rasterize snapshots, caching everything that does not change per frame.
+
+    The arena and bumpers are drawn once into a static background (with their
+    glow baked in); balls are pre-rasterized sprites stamped with NumPy, and
+    the optional trail layer is composited in a single vectorized pass. The
+    dynamic glow only processes the box around balls and trails, and the HUD
+    blends text patches re-composed only when their content changes.
+    """
+
+    def __init__(
+        self,
+        scene: SceneConfig,
+        projection: Projection,
+        settings: RenderSettings | None = None,
+        profiler: RenderProfiler | None = None,
+        seed: int | None = None,
+    ):
+        self.scene = scene
+        self.projection = projection
+        self.settings = settings or RenderSettings()
+        self.profiler = profiler or RenderProfiler()
+        self.background = _render_background(scene, projection, self.settings)
+        self._sprites: dict[tuple[int, float], BallSprite] = {}
+        self._token_sprites: dict[str, BallSprite] = {}
+        self.trails = (
+            TrailLayer(projection.frame_size, self.settings.trail_decay, self.settings.trail_strength)
+            if self.settings.trails
+            else None
+        )
+        self.glow: GlowStage | None = None
+        if self.settings.glow:
+            # Keep the halo size (and its cost) proportional to the resolution.
+            wanted = self.settings.glow_downsample * projection.pixel_scale
+            downsample = min(GLOW_DOWNSAMPLES, key=lambda factor: abs(math.log2(factor / wanted)))
+            self.glow = GlowStage(
+                projection.frame_size,
+                downsample=downsample,
+                threshold=self.settings.glow_threshold,
+                intensity=self.settings.glow_intensity,
+            )
+            with self.profiler.stage("glow_static"):
+                self.glow.apply(self.background)
+                self._background_small = self.glow.downsampled(self.background)
+        self.seed = seed
+        self.hud = self._build_hud()
+        self.tiles: TileGrid | None = None
+        if self.settings.raster_threads != 1:
+            align = tile_alignment(self.glow.downsample if self.glow is not None else 1, self.settings.supersample)
+            self.tiles = TileGrid(projection.frame_size[1], self.settings.tile_height, self.settings.raster_threads, align)
+        # Static-frame reuse: trails keep changing until they have fully faded.
+        self._settle_frames = self.trails.lifetime if self.trails is not None else 0
+        self._last_key: tuple | None = None
+        self._last_frame: np.ndarray | None = None
+        self._repeats = 0
+
+    def reset(self) -> None:
+        """Forget the frame history (trails, static-frame reuse) before a cut."""
+
+        if self.trails is not None:
+            self.trails.reset()
+        self._last_key = None
+        self._last_frame = None
+        self._repeats = 0
+
+    def close(self) -> None:
+        """Stop the tile threads, if any."""
+
+        if self.tiles is not None:
+            self.tiles.close()
+            self.tiles = None
+
+    def retarget(self, scene: SceneConfig) -> None:
+        """Draw an edited `scene` whose arena is unchanged, keeping the static background.
+
+        Sprites and HUD follow the new teams; the background, its glow and the
+        projection (which only depend on the arena) are reused as they are.
+        """
+
+        self.scene = scene
+        self._sprites.clear()
+        self._token_sprites.clear()
+        self.hud = self._build_hud()
+        self.reset()
+
+    def _build_hud(self) -> HudOverlay | None:
+        if not self.settings.hud:
+            return None
+        return HudOverlay(
+            self.projection.frame_size,
+            arena_name=self.scene.name,
+            seed=self.seed,
+            teams=[(team.name, team.color) for team in self.scene.teams],
+            duration=self.scene.duration_seconds,
+            font_path=self.settings.hud_font,
+        )
+
+    def render(self, snapshot: SimulationSnapshot, banner: str | None = None) -> np.ndarray:
+        """Rasterize `snapshot`; an unchanged, settled frame is returned as is.
+
+        Frames whose inputs (ball pixel positions and HUD text) match the
+        previous frame, once trails have had time to settle, reuse the
+        previous buffer: callers must treat returned frames as read-only.
+        `banner` is an optional HUD line (e.g. during replays).
+        """
+
+        profiler = self.profiler
+        with profiler.stage("raster"):
+            tokens = self._token_stamps(snapshot)
+            stamps = self._ball_stamps(snapshot)
+            if self.hud is not None:
+                before = self.hud.recompositions
+                self.hud.update(snapshot.time, snapshot.scores or None, banner)
+                profiler.count("hud_recompositions", self.hud.recompositions - before)
+            key = (
+                tuple((id(sprite), x0, y0) for sprite, x0, y0 in tokens + stamps),
+                self.hud.signature if self.hud is not None else None,
+            )
+            if key == self._last_key:
+                self._repeats += 1
+                if self._last_frame is not None and self._repeats >= self._settle_frames:
+                    profiler.count("static_frames")
+                    return self._last_frame
+            else:
+                self._last_key = key
+                self._repeats = 0
+
+            profiler.count("sprites", len(stamps))
+            if self.tiles is not None:
+                frame = self._render_tiles(tokens, stamps)
+                self._last_frame = frame
+                return frame
+
+            frame = self.background.copy()
+            if self.trails is not None:
+                with profiler.stage("trails"):
+                    self.trails.update(stamps)
+                    self.trails.composite(frame)
+            for sprite, x0, y0 in tokens:
+                stamp_sprite(frame, sprite, x0, y0)
+            for sprite, x0, y0 in stamps:
+                stamp_sprite(frame, sprite, x0, y0)
+            if self.glow is not None:
+                with profiler.stage("glow"):
+                    self._apply_dynamic_glow(frame, stamps)
+            if self.hud is not None:
+                with profiler.stage("hud"):
+                    self.hud.draw(frame)
+            if self.settings.supersample > 1:
+                with profiler.stage("supersample"):
+                    frame = box_downscale(frame, self.settings.supersample)
+        self._last_frame = frame
+        return frame
+
+    def _render_tiles(
+        self, tokens: list[tuple[BallSprite, int, int]], stamps: list[tuple[BallSprite, int, int]]
+    ) -> np.ndarray:
+        """`render`'s compositing, band by band on the tile threads (same pixels)."""
+
+        tiles = self.tiles
+        assert tiles is not None
+        profiler = self.profiler
+        frame = np.empty_like(self.background)
+        sprites = tiles.bucket(tokens + stamps)
+        trails = self.trails if self.trails is not None and self.trails.track(stamps) else None
+        balls = tiles.bucket(stamps) if trails is not None else None
+        glow_box = self._glow_box(stamps) if self.glow is not None else None
+        profiler.count("tiles", len(tiles))
+        profiler.count("tile_stamps", sum(len(bucket) for bucket in sprites))
+
+        def composite(index: int) -> np.ndarray | None:
+            top, bottom = tiles.bounds[index]
+            frame[top:bottom] = self.background[top:bottom]
+            if trails is not None:
+                assert balls is not None
+                trails.update_rows(balls[index], top, bottom)
+                trails.composite(frame, top, bottom)
+            band = frame[top:bottom]
+            for sprite, x0, y0 in sprites[index]:
+                stamp_sprite(band, sprite, x0, y0 - top)
+            if glow_box is None or self.glow is None:
+                return None
+            x0, y0, x1, y1 = glow_box
+            if max(top, y0) >= min(bottom, y1):
+                return None
+            return self.glow.downsampled(frame[max(top, y0) : min(bottom, y1), x0:x1])
+
+        with profiler.stage("tiles"):
+            parts = tiles.map(composite)
+        if glow_box is not None and self.glow is not None:
+            glow = self.glow
+            x0, y0, x1, y1 = glow_box
+            step = glow.downsample
+            with profiler.stage("glow"):
+                subtract = self._background_small[:, y0 // step : -(-y1 // step), x0 // step : -(-x1 // step)]
+                small = np.concatenate([part for part in parts if part is not None], axis=1)
+                levels = glow.expand(glow.blur(glow.bright_pass(small, subtract)), y1 - y0, x1 - x0)
+
+                def add_glow(index: int) -> None:
+                    top, bottom = tiles.bounds[index]
+                    top, bottom = max(top, y0), min(bottom, y1)
+                    if top < bottom:
+                        rows = levels[:, (top - y0) // 2 : -(-(bottom - y0) // 2)]
+                        glow.add_levels(frame[top:bottom, x0:x1], rows, scratch_row=top)
+
+                tiles.map(add_glow)
+        if self.hud is not None:
+            with profiler.stage("hud"):
+                self.hud.draw(frame)
+        factor = self.settings.supersample
+        if factor > 1:
+            height, width = frame.shape[:2]
+            small_frame = np.empty((height // factor, width // factor, 3), dtype=np.uint8)
+
+            def shrink(index: int) -> None:
+                top, bottom = tiles.bounds[index]
+                small_frame[top // factor : bottom // factor] = box_downscale(frame[top:bottom], factor)
+
+            with profiler.stage("supersample"):
+                tiles.map(shrink)
+            frame = small_frame
+        return frame
+
+    def _glow_box(self, stamps: list[tuple[BallSprite, int, int]]) -> tuple[int, int, int, int] | None:
+        """`(x0, y0, x1, y1)` region the dynamic glow must process, aligned on its step."""
+
+        assert self.glow is not None
+        boxes = [(x0, y0, x0 + sprite.size, y0 + sprite.size) for sprite, x0, y0 in stamps]
+        if self.trails is not None and self.trails.region is not None:
+            boxes.append(self.trails.region)
+        if not boxes:
+            return None
+        height, width = self.background.shape[:2]
+        step = self.glow.downsample
+        reach = self.glow.reach
+        x0 = max(0, (min(box[0] for box in boxes) - reach) // step * step)
+        y0 = max(0, (min(box[1] for box in boxes) - reach) // step * step)
+        x1 = min(width, -(-(max(box[2] for box in boxes) + reach) // step) * step)
+        y1 = min(height, -(-(max(box[3] for box in boxes) + reach) // step) * step)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        self.profiler.count("glow_pixels", (x1 - x0) * (y1 - y0))
+        return x0, y0, x1, y1
+
+    def _apply_dynamic_glow(self, frame: np.ndarray, stamps: list[tuple[BallSprite, int, int]]) -> None:
+        assert self.glow is not None
+        box = self._glow_box(stamps)
+        if box is None:
+            return
+        x0, y0, x1, y1 = box
+        step = self.glow.downsample
+        subtract = self._background_small[:, y0 // step : -(-y1 // step), x0 // step : -(-x1 // step)]
+        self.glow.apply(frame[y0:y1, x0:x1], subtract=subtract)
+
+    def _ball_stamps(self, snapshot: SimulationSnapshot) -> list[tuple[BallSprite, int, int]]:
+        scale = self.projection.scale
+        cx, cy = self.projection.offset
+        stamps = []
+        for ball in snapshot.balls:
+            if not ball.active:
+                continue
+            sprite = self._sprite(ball.team_index, self.scene.teams[ball.team_index].color, ball.radius)
+            bx = cx + float(ball.position[0]) * scale
+            by = cy - float(ball.position[1]) * scale
+            stamps.append((sprite, *sprite_origin(sprite, bx, by)))
+        return stamps
+
+    def _token_stamps(self, snapshot: SimulationSnapshot) -> list[tuple[BallSprite, int, int]]:
+        if not snapshot.tokens:
+            return []
+        assert self.scene.buffs is not None
+        scale = self.projection.scale
+        cx, cy = self.projection.offset
+        stamps = []
+        for kind, (x, y) in snapshot.tokens:
+            sprite = self._token_sprites.get(kind)
+            if sprite is None:
+                color, label = TOKEN_STYLES[kind]
+                sprite = build_token_sprite(color, self.scene.buffs.token_radius * scale, label)
+                self._token_sprites[kind] = sprite
+            stamps.append((sprite, *sprite_origin(sprite, cx + x * scale, cy - y * scale)))
+        return stamps
+
+    def _sprite(self, team_index: int, color: tuple[int, int, int], radius: float) -> BallSprite:
+        key = (team_index, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = build_ball_sprite(color, radius * self.projection.scale, self.projection.outline_px)
+            self._sprites[key] = sprite
+        return sprite
+
+
+class JuiceStage:
+    """Post-raster hitstop and screenshake, driven by contact impulses.
+
+    Both effects work on finished frames: a hitstop repeats the rasterized
+    buffer by reference, and a shake copies the frame once into a padded
+    canvas allocated up front and returns an integer-shifted view of it. A
+    shaken frame is only valid until the next call.
+    """
+
+    def __init__(self, settings: RenderSettings, frame_rate: int, profiler: RenderProfiler | None = None):
+        self.settings = settings
+        self.profiler = profiler or RenderProfiler()
+        self.hold_frames = int(round(settings.hitstop * frame_rate))
+        self.cooldown_frames = int(round(HITSTOP_COOLDOWN * frame_rate))
+        pixel_scale = min(settings.frame_size) / REFERENCE_SHORT_SIDE
+        self.shake_gain = settings.shake * pixel_scale
+        self.pad = int(math.ceil(settings.shake_max * pixel_scale)) if settings.shake > 0 else 0
+        width, height = settings.frame_size
+        self._canvas = np.empty((height + 2 * self.pad, width + 2 * self.pad, 3), dtype=np.uint8)
+        self._canvas[...] = BACKGROUND_COLOR
+        self._amplitude = 0.0
+        self._since_hitstop = self.cooldown_frames
+        self._phase = 0
+
+    def reset(self) -> None:
+        self._amplitude = 0.0
+        self._since_hitstop = self.cooldown_frames
+
+    def process(self, frame: np.ndarray, impulse: float = 0.0) -> tuple[np.ndarray, int]:
+        """Return the frame to emit and how many extra times to repeat it."""
+
+        with self.profiler.stage("juice"):
+            hold = 0
+            self._since_hitstop += 1
+            if (
+                self.hold_frames
+                and impulse >= self.settings.hitstop_impulse
+                and self._since_hitstop > self.cooldown_frames
+            ):
+                hold = self.hold_frames
+                self._since_hitstop = 0
+                self.profiler.count("hitstop_frames", hold)
+            if self.pad:
+                self._amplitude = min(self.pad, max(self._amplitude * SHAKE_DECAY, impulse * self.shake_gain))
+                frame = self._shake(frame)
+        return frame, hold
+
+    def _shake(self, frame: np.ndarray) -> np.ndarray:
+        if self._amplitude < 0.5:
+            return frame
+        # Deterministic, non-repeating jitter: no RNG draw per frame.
+        self._phase += 1
+        dx = int(round(self._amplitude * math.sin(self._phase * 2.399)))
+        dy = int(round(self._amplitude * math.cos(self._phase * 1.618)))
+        pad = self.pad
+        height, width = frame.shape[:2]
+        self._canvas[pad : pad + height, pad : pad + width] = frame
+        self.profiler.count("shaken_frames")
+        return self._canvas[pad - dy : pad - dy + height, pad - dx : pad - dx + width]
+
+
+def render_scene(
+    scene: SceneConfig,
+    output_path: str | Path,
+    show_preview: bool = False,
+    seed: int | None = None,
+    settings: RenderSettings | None = None,
+    cache: RenderCache | None = None,
+    profiler: RenderProfiler | None = None,
+    outputs: Sequence[OutputSpec] = (),
+    highlights: HighlightConfig | None = None,
+) -> Path:
+    """Run the simulation and export an MP4 clip.
+
+    Extra `outputs` (preview, thumbnail, excerpt...) are encoded from the same
+    rendered frames. With `highlights`, a first simulation-only pass scores
+    every frame (no snapshot is kept) so that thumbnails and a highlight
+    range can be picked before rendering; they are then written from the
+    render pass itself (see `powerpit.highlights`). With a
+    `cache`, a master clip whose scene, seed, settings and package version
+    are unchanged is reused instead of being rendered again. Stage timings
+    are accumulated into `profiler` (logged at debug level otherwise).
+    """
+
+    settings = settings or RenderSettings()
+    report = profiler is None
+    profiler = profiler or RenderProfiler()
     output = Path(output_path)
     output.parent.mkdir(parents=True, exist_ok=True)
 
-    projection = _build_projection(scene)
-    writer = imageio.get_writer(
-        output,
-        fps=scene.frame_rate,
-        format="mp4",
-        macro_block_size=None,
+    key: str | None = None
+    if cache is not None:
+        key = render_key(scene, seed, settings)
+        # Extra outputs need the frames anyway: only a master-only render can be skipped.
+        if not outputs and highlights is None and cache.fetch(key, output):
+            LOGGER.info("Clip réutilisé depuis le cache (%s): %s", key[:12], output)
+            return output
+        # The previous output may be a hard link into the cache: never write through it.
+        output.unlink(missing_ok=True)
+
+    projection = _build_projection(scene, settings)
+    frame_rate = settings.output_frame_rate(scene)
+    fanout = OutputFanout(
+        [OutputSpec(output, codec=settings.codec), *outputs],
+        settings.frame_size,
+        frame_rate,
+        frame_count=settings.max_output_frames(scene),
     )
     LOGGER.info(
-        "Export simulation — scène=%s, durée=%.2fs, fps=%d, frames=%d, preview=%s",
+        "Export simulation — scène=%s, durée=%.2fs, fps=%d, frames=%d, sorties=%d, preview=%s",
         scene.name,
         scene.duration_seconds,
-        scene.frame_rate,
-        scene.frame_count,
+        frame_rate,
+        scene.frame_count * settings.interpolate,
+        len(fanout.writers),
         show_preview,
     )
     preview: PreviewWindow | None = None
 
     if show_preview:
         try:
-            preview = PreviewWindow(FRAME_SIZE, scene.frame_rate)
+            preview = PreviewWindow(settings.frame_size, frame_rate)
         except RuntimeError as exc:  # pragma: no cover - optional dependency
             LOGGER.warning("Prévisualisation indisponible: %s", exc)
             preview = None
 
-    try:
-        for snapshot in simulate_frames(scene):
-            frame = _render_frame(scene, snapshot, projection)
-            writer.append_data(frame)
+    renderer = FrameRenderer(scene, projection, settings, profiler, seed=seed)
+    snapshots = iter(simulate_frames(scene))
+    settle_frames = (
+        max(1, math.ceil(settings.settle_after * scene.frame_rate)) if settings.settle_after is not None else None
+    )
+    export: HighlightExport | None = None
+    if highlights is not None:
+        # The plan must exist before the first highlight frame is encoded: score
+        # a simulation-only pass, then simulate again for the render.
+        scorer = FrameScorer(scene)
+        with profiler.stage("highlights"):
+            for snapshot in _until_settled(simulate_frames(scene), settle_frames, settings.settle_speed):
+                scorer.add(snapshot)
+            plan = plan_highlights(scene, scorer.scores(), highlights)
+        LOGGER.info(
+            "Highlights: miniatures aux frames %s, extrait frames %d-%d",
+            plan.thumbnails,
+            *plan.highlight,
+        )
+        export = HighlightExport(plan, output, settings.frame_size, frame_rate, highlights)
+    current = 0  # capture frame being emitted (replays belong to the frame that triggered them)
+    settled = 0
+    history = TrajectoryHistory(settings.replay_window, scene.frame_rate) if settings.ko_replay else None
+    pending: tuple[float, float] | None = None  # (start, end) of the next replay
+    previous: SimulationSnapshot | None = None
+    juice = JuiceStage(settings, frame_rate, profiler) if settings.hitstop > 0 or settings.shake > 0 else None
+    written = 0
+
+    def emit(frame: np.ndarray, impulse: float | None = None) -> None:
+        nonlocal preview, written
+        hold = 0
+        if juice is not None and impulse is not None:
+            frame, hold = juice.process(frame, impulse)
+        for _ in range(1 + hold):  # a hitstop re-sends the very same buffer
+            with profiler.stage("encode"):
+                fanout.write(written, frame)
+                if export is not None:
+                    export.write(current, written, frame)
+            written += 1
             if preview is not None:
                 try:
                     preview.show(frame)
@@ -80,24 +613,102 @@ def render_scene(scene: SceneConfig, output_path: str | Path, show_preview: bool
                     LOGGER.info("Prévisualisation interrompue: %s", exc)
                     preview.close()
                     preview = None
+
+    def play_replay(start: float, end: float) -> None:
+        assert history is not None
+        with profiler.stage("replay"):
+            replay = history.replay(start, end, settings.replay_speed, frame_rate)
+        LOGGER.info("Replay KO %.2fs → %.2fs (%d frames à ×%.2f)", start, end, len(replay), settings.replay_speed)
+        renderer.reset()
+        banner = f"REPLAY x{settings.replay_speed:g}"
+        for replayed in replay:
+            emit(renderer.render(replayed, banner=banner))
+        profiler.count("replay_frames", len(replay))
+        renderer.reset()
+        if juice is not None:
+            juice.reset()
+
+    try:
+        while True:
+            with profiler.stage("simulation"):
+                snapshot = next(snapshots, None)
+            if snapshot is None:
+                break
+            current = snapshot.frame_index
+            if previous is not None and settings.interpolate > 1:
+                # In-between frames come from the captured states: no extra physics.
+                for step in range(1, settings.interpolate):
+                    with profiler.stage("interpolate"):
+                        between = interpolate_snapshot(previous, snapshot, step / settings.interpolate)
+                    emit(renderer.render(between), impulse=0.0)
+                profiler.count("interpolated_frames", settings.interpolate - 1)
+            frame = renderer.render(snapshot)
+            if export is not None:
+                export.thumbnail(snapshot.frame_index, frame)
+            emit(frame, impulse=snapshot.impulse)
+            previous = snapshot
+            if history is not None:
+                history.push(snapshot)
+                for event in snapshot.events:
+                    if isinstance(event, KOEvent):
+                        end = event.time + settings.replay_after
+                        start = end - settings.replay_window if pending is None else pending[0]
+                        pending = (max(start, end - settings.replay_window, 0.0), end)
+                if pending is not None and snapshot.time >= pending[1]:
+                    play_replay(*pending)
+                    pending = None
+            if settle_frames is not None:
+                settled = settled + 1 if snapshot.max_speed() < settings.settle_speed else 0
+                if settled >= settle_frames:
+                    LOGGER.info(
+                        "Balles au repos depuis %.2fs: fin anticipée à la frame %d/%d",
+                        settings.settle_after,
+                        snapshot.frame_index + 1,
+                        scene.frame_count,
+                    )
+                    break
+        if pending is not None:  # KO in the last moments of the clip
+            play_replay(*pending)
     finally:
-        writer.close()
+        renderer.close()
+        fanout.close()
+        if export is not None:
+            export.close()
         if preview is not None:
             preview.close()
+            LOGGER.debug("Prévisualisation: %d frames ignorées", preview.dropped_frames)
 
+    if cache is not None and key is not None:
+        cache.store(key, output, scene=scene.name, seed=seed)
+    if report:
+        profiler.log(LOGGER, logging.DEBUG)
     LOGGER.info("Export terminé: %s", output)
     return output
 
 
-def _render_frame(scene: SceneConfig, snapshot: SimulationSnapshot, projection: Projection) -> np.ndarray:
-    image = Image.new("RGB", FRAME_SIZE, BACKGROUND_COLOR)
+def _until_settled(
+    snapshots: Iterable[SimulationSnapshot], settle_frames: int | None, speed: float
+) -> Iterator[SimulationSnapshot]:
+    """The snapshots the render keeps once the end-when-settled rule applies."""
+
+    settled = 0
+    for snapshot in snapshots:
+        yield snapshot
+        if settle_frames is not None:
+            settled = settled + 1 if snapshot.max_speed() < speed else 0
+            if settled >= settle_frames:
+                return
+
+
+def _render_background(scene: SceneConfig, projection: Projection, settings: RenderSettings) -> np.ndarray:
+    image = Image.new("RGB", projection.frame_size, BACKGROUND_COLOR)
     draw = ImageDraw.Draw(image)
 
     _draw_arena(draw, scene, projection)
+    _draw_holes(draw, scene, projection)
     _draw_bumpers(draw, scene, projection)
-    _draw_balls(draw, snapshot, projection)
 
-    return np.asarray(image)
+    return np.array(image)
 
 
 def _draw_arena(draw: ImageDraw.ImageDraw, scene: SceneConfig, projection: Projection) -> None:
@@ -113,7 +724,7 @@ def _draw_arena(draw: ImageDraw.ImageDraw, scene: SceneConfig, projection: Proje
             cx + radius_px,
             cy + radius_px,
         ]
-        draw.ellipse(bbox, outline=ARENA_BORDER_COLOR, width=6)
+        draw.ellipse(bbox, outline=ARENA_BORDER_COLOR, width=projection.arena_line_px)
     elif scene.arena.type == "stadium":
         assert scene.arena.width is not None
         assert scene.arena.height is not None
@@ -127,11 +738,28 @@ def _draw_arena(draw: ImageDraw.ImageDraw, scene: SceneConfig, projection: Proje
             cx + half_w * scale,
             cy + half_h * scale,
         ]
-        draw.rounded_rectangle(bbox, radius=corner_radius * scale, outline=ARENA_BORDER_COLOR, width=6)
+        draw.rounded_rectangle(bbox, radius=corner_radius * scale, outline=ARENA_BORDER_COLOR, width=projection.arena_line_px)
     else:  # pragma: no cover - unsupported yet
         raise RuntimeError(f"Type d'arène non géré pour le rendu: {scene.arena.type}")
 
 
+def _draw_holes(draw: ImageDraw.ImageDraw, scene: SceneConfig, projection: Projection) -> None:
+    """Cut each hole out of the arena outline and mark its edges."""
+
+    cx, cy = projection.offset
+    scale = projection.scale
+    width = projection.arena_line_px
+    for hole in scene.arena.holes:
+        wall = boundary_points(scene.arena, hole)
+        # PIL strokes outlines inside their bounding box: centre the cut on the stroke.
+        distances = np.linalg.norm(wall, axis=1, keepdims=True) * scale
+        inset = wall * ((distances - width / 2.0) / distances)
+        points = [(cx + x * scale, cy - y * scale) for x, y in inset]
+        draw.line(points, fill=BACKGROUND_COLOR, width=width + 4, joint="curve")
+        for x, y in (points[0], points[-1]):
+            draw.ellipse([x - width, y - width, x + width, y + width], fill=HOLE_EDGE_COLOR)
+
+
 def _draw_bumpers(draw: ImageDraw.ImageDraw, scene: SceneConfig, projection: Projection) -> None:
     scale = projection.scale
     cx, cy = projection.offset
@@ -140,23 +768,12 @@ def _draw_bumpers(draw: ImageDraw.ImageDraw, scene: SceneConfig, projection: Pro
         by = cy - bumper.position[1] * scale
         radius_px = bumper.radius * scale
         bbox = [bx - radius_px, by - radius_px, bx + radius_px, by + radius_px]
-        draw.ellipse(bbox, outline=BUMPER_COLOR, width=4)
-
-
-def _draw_balls(draw: ImageDraw.ImageDraw, snapshot: SimulationSnapshot, projection: Projection) -> None:
-    scale = projection.scale
-    cx, cy = projection.offset
-
-    for ball in snapshot.balls:
-        bx = cx + float(ball.position[0]) * scale
-        by = cy - float(ball.position[1]) * scale
-        radius_px = ball.radius * scale
-        bbox = [bx - radius_px, by - radius_px, bx + radius_px, by + radius_px]
-        draw.ellipse(bbox, fill=ball.team.color, outline=(255, 255, 255), width=2)
+        draw.ellipse(bbox, outline=BUMPER_COLOR, width=projection.bumper_line_px)
 
 
-def _build_projection(scene: SceneConfig) -> Projection:
-    frame_w, frame_h = FRAME_SIZE
+def _build_projection(scene: SceneConfig, settings: RenderSettings | None = None) -> Projection:
+    settings = settings or RenderSettings()
+    frame_w, frame_h = settings.raster_size
     span_x = scene.arena.horizontal_span
     span_y = scene.arena.vertical_span
     margin = 1.15
@@ -164,10 +781,28 @@ def _build_projection(scene: SceneConfig) -> Projection:
     scale_y = frame_h / (span_y * margin)
     scale = min(scale_x, scale_y)
     offset = (frame_w / 2.0, frame_h / 2.0)
-    return Projection(scale=scale, offset=offset)
+    pixel_scale = min(frame_w, frame_h) / REFERENCE_SHORT_SIDE
+    return Projection(
+        scale=scale,
+        offset=offset,
+        frame_size=(frame_w, frame_h),
+        pixel_scale=pixel_scale,
+        arena_line_px=max(1, round(ARENA_LINE_WIDTH * pixel_scale)),
+        bumper_line_px=max(1, round(BUMPER_LINE_WIDTH * pixel_scale)),
+        outline_px=max(1.0, BALL_OUTLINE_WIDTH * pixel_scale),
+    )
 
 
-def render_frames(scene: SceneConfig, snapshots: Iterable[SimulationSnapshot], projection: Projection) -> list[np.ndarray]:
+def render_frames(
+    scene: SceneConfig,
+    snapshots: Iterable[SimulationSnapshot],
+    projection: Projection,
+    settings: RenderSettings | None = None,
+) -> list[np.ndarray]:
     """Utility primarily used by tests to convert snapshots into frames."""
 
-    return [_render_frame(scene, snapshot, projection) for snapshot in snapshots]
+    renderer = FrameRenderer(scene, projection, settings)
+    try:
+        return [renderer.render(snapshot) for snapshot in snapshots]
+    finally:
+        renderer.close()
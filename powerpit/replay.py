@@ -0,0 +1,163 @@
+"""KO replays read back from a bounded trajectory history.
+
+The history keeps the last `window` seconds of captured frames in ring
+buffers (positions, velocities, active flags, scores and tokens). A replay
+never re-simulates: its frames sample the retained states at slowed-down
+times, Hermite-interpolating between the two captured frames around each
+one, so they show exactly what was played and cost no physics.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from .interpolation import hermite
+from .simulation import BallState, SimulationSnapshot
+
+DEFAULT_REPLAY_SPEED = 0.75
+DEFAULT_REPLAY_WINDOW = 2.5  # seconds of history retained
+DEFAULT_REPLAY_AFTER = 0.5  # seconds shown after the KO
+
+
+class TrajectoryHistory:
+    """Ring buffer of the captured frames of the last `window` seconds."""
+
+    def __init__(self, window: float, frame_rate: int):
+        if window <= 0:
+            raise ValueError("La fenêtre d'historique doit être positive.")
+        self.window = float(window)
+        # One spare frame: a replay ends between two captures, up to a frame ago.
+        self.capacity = math.ceil(window * frame_rate) + 2
+        self.times = np.zeros(self.capacity)
+        self.positions: np.ndarray | None = None  # (capacity, N, 2)
+        self.velocities: np.ndarray | None = None
+        self.active: np.ndarray | None = None  # (capacity, N)
+        self.scores: list[list[int]] = [[] for _ in range(self.capacity)]
+        self.tokens: list[list[tuple[str, tuple[float, float]]]] = [[] for _ in range(self.capacity)]
+        self.balls: list[BallState] = []  # latest ball descriptions (team, name, radius...)
+        self._written = 0
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    @property
+    def span(self) -> tuple[float, float]:
+        """Times of the oldest and newest retained frames."""
+
+        if not len(self):
+            raise ValueError("Historique vide.")
+        order = self._order()
+        return float(self.times[order[0]]), float(self.times[order[-1]])
+
+    def push(self, snapshot: SimulationSnapshot) -> None:
+        balls = snapshot.balls
+        if self.positions is None or len(balls) > self.positions.shape[1]:
+            self._grow(len(balls), balls[0].position.dtype if balls else np.dtype(float))
+        assert self.positions is not None and self.velocities is not None and self.active is not None
+        slot = self._written % self.capacity
+        count = len(balls)
+        self.times[slot] = snapshot.time
+        if count:
+            self.positions[slot, :count] = [ball.position for ball in balls]
+            self.velocities[slot, :count] = [ball.velocity for ball in balls]
+            self.active[slot, :count] = [ball.active for ball in balls]
+        self.active[slot, count:] = False
+        self.scores[slot] = list(snapshot.scores)
+        self.tokens[slot] = list(snapshot.tokens)
+        self.balls = balls
+        self._written += 1
+
+    def replay(
+        self, start: float, end: float, speed: float = DEFAULT_REPLAY_SPEED, frame_rate: int = 30
+    ) -> list[SimulationSnapshot]:
+        """Snapshots showing `[start, end]` slowed down to `speed`, at `frame_rate`.
+
+        The interval is clamped to the retained span; all output times are
+        interpolated in one vectorized pass.
+        """
+
+        if speed <= 0:
+            raise ValueError("La vitesse de replay doit être positive.")
+        if len(self) < 2:
+            return []
+        first, last = self.span
+        start, end = max(start, first), min(end, last)
+        if end <= start:
+            return []
+        count = max(1, int(round((end - start) / speed * frame_rate)))
+        times = start + np.arange(count) * (speed / frame_rate)
+        positions, velocities, active, base = self.sample(times)
+        snapshots = []
+        for index, time in enumerate(times):
+            balls = [
+                BallState(
+                    team_index=ball.team_index,
+                    team=ball.team,
+                    name=ball.name,
+                    position=positions[index, column],
+                    velocity=velocities[index, column],
+                    radius=ball.radius,
+                    mass=ball.mass,
+                    active=bool(active[index, column]),
+                )
+                for column, ball in enumerate(self.balls)
+            ]
+            snapshots.append(
+                SimulationSnapshot(
+                    frame_index=index,
+                    time=float(time),
+                    balls=balls,
+                    scores=list(self.scores[base[index]]),
+                    tokens=list(self.tokens[base[index]]),
+                )
+            )
+        return snapshots
+
+    def sample(self, times: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Interpolated `(positions, velocities, active, slot)` at each time.
+
+        `slot` is the ring slot of the captured frame preceding each time. A
+        ball is shown while it was active in that frame and, for the second
+        half of the interval, in the next one too (so a KO'd ball vanishes
+        where it left the arena).
+        """
+
+        assert self.positions is not None and self.velocities is not None and self.active is not None
+        order = self._order()
+        captured = self.times[order]
+        before = np.clip(np.searchsorted(captured, times, side="right") - 1, 0, len(order) - 2)
+        slot0, slot1 = order[before], order[before + 1]
+        duration = captured[before + 1] - captured[before]
+        u = np.clip((times - captured[before]) / np.where(duration > 0, duration, 1.0), 0.0, 1.0)
+        positions, velocities = hermite(
+            self.positions[slot0],
+            self.velocities[slot0],
+            self.positions[slot1],
+            self.velocities[slot1],
+            duration[:, None, None],
+            u[:, None, None],
+        )
+        positions = positions.astype(self.positions.dtype)
+        velocities = velocities.astype(self.velocities.dtype)
+        active = self.active[slot0] & (self.active[slot1] | (u < 0.5)[:, None])
+        return positions, velocities, active, slot0
+
+    def _order(self) -> np.ndarray:
+        """Ring slots from the oldest to the newest frame."""
+
+        count = len(self)
+        return (np.arange(count) + self._written - count) % self.capacity
+
+    def _grow(self, count: int, dtype: np.dtype) -> None:
+        positions = np.zeros((self.capacity, count, 2), dtype=dtype)
+        velocities = np.zeros((self.capacity, count, 2), dtype=dtype)
+        active = np.zeros((self.capacity, count), dtype=bool)
+        if self.positions is not None:
+            assert self.velocities is not None and self.active is not None
+            known = self.positions.shape[1]
+            positions[:, :known] = self.positions
+            velocities[:, :known] = self.velocities
+            active[:, :known] = self.active
+        self.positions, self.velocities, self.active = positions, velocities, active
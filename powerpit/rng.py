@@ -1,23 +1,72 @@
-"""Random utilities."""
+"""Random utilities: named, independent NumPy streams derived from one seed.
+
+Every consumer of randomness asks for its own stream by name (``"buffs"``,
+``("spawn", team, generator)``...), optionally under a scope such as a world
+or a worker (`RngStreams.child`). A stream is a `numpy.random.Generator`
+seeded from ``SeedSequence(seed, spawn_key=path)``: it depends only on the
+seed and the names, never on how many streams were created before or in which
+process, so a clip renders the same whatever the worker count or its position
+in a batch, and streams never overlap.
+"""
 from __future__ import annotations
 
-import random
+import zlib
 from dataclasses import dataclass
 
+import numpy as np
+
+DEFAULT_SEED = 0
+_NAME_TAG = 1 << 32  # keeps string keys apart from integer keys (< 2**32)
+
 
 @dataclass
 class RNGConfig:
     seed: int
 
 
-def build_rng(seed: int | None) -> random.Random:
-    """Return a seeded RNG instance.
+class RngStreams:
+    """Factory of named random streams for one seed (and one scope)."""
+
+    def __init__(self, seed: int | None = None, path: tuple[int, ...] = ()):
+        self.seed = DEFAULT_SEED if seed is None else int(seed)
+        self.path = path
+
+    def child(self, *names: str | int) -> "RngStreams":
+        """Streams scoped under `names` (e.g. ``child("world", 3)``)."""
+
+        return RngStreams(self.seed, self.path + _keys(names))
+
+    def seed_sequence(self, *names: str | int) -> np.random.SeedSequence:
+        # SeedSequence entropy must be non-negative: fold negative seeds.
+        return np.random.SeedSequence(self.seed & 0xFFFF_FFFF_FFFF_FFFF, spawn_key=self.path + _keys(names))
 
-    Si `seed` est None, on utilise un seed par défaut mais on retourne quand même
-    l'objet RNG pour conserver la reproductibilité au sein du process.
+    def stream(self, *names: str | int) -> np.random.Generator:
+        """A fresh generator for `names`; the same names always restart the same sequence."""
+
+        return np.random.Generator(np.random.PCG64(self.seed_sequence(*names)))
+
+    def __repr__(self) -> str:
+        return f"RngStreams(seed={self.seed}, path={self.path})"
+
+
+def build_rng(seed: int | None) -> RngStreams:
+    """Return the stream factory for `seed`.
+
+    Si `seed` est None, on utilise un seed par défaut (0) pour conserver la
+    reproductibilité.
     """
 
-    if seed is None:
-        seed = 0
-    rng = random.Random(seed)
-    return rng
+    return RngStreams(seed)
+
+
+def _keys(names: tuple[str | int, ...]) -> tuple[int, ...]:
+    keys = []
+    for name in names:
+        if isinstance(name, str):
+            # crc32 is stable across processes, unlike hash().
+            keys.append(_NAME_TAG + zlib.crc32(name.encode("utf-8")))
+        elif isinstance(name, (int, np.integer)) and 0 <= name < _NAME_TAG:
+            keys.append(int(name))
+        else:
+            raise ValueError(f"Nom de flux aléatoire invalide: {name!r} (texte ou entier >= 0).")
+    return tuple(keys)
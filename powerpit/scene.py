@@ -6,7 +6,9 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Iterable, Mapping, Sequence
 
+from .rng import build_rng
 from .simple_yaml import safe_load
+from .spawn import SpawnError, SpawnLayout, expand_generator
 
 
 class SceneConfigError(RuntimeError):
@@ -27,6 +29,7 @@ class ArenaConfig:
     height: float | None = None
     corner_radius: float | None = None
     bumpers: list["BumperConfig"] = field(default_factory=list)
+    holes: list["HoleConfig"] = field(default_factory=list)
 
     @property
     def horizontal_span(self) -> float:
@@ -61,6 +64,15 @@ class ArenaConfig:
         raise SceneConfigError(f"Type d'arène inconnu: {self.type}")
 
 
+@dataclass
+class HoleConfig:
+    """Exit hole: an arc of the arena wall, in degrees counter-clockwise from +x."""
+
+    id: str
+    angle: float
+    width: float
+
+
 @dataclass
 class BumperConfig:
     position: tuple[float, float]
@@ -86,6 +98,37 @@ class TeamConfig:
     players: list[PlayerConfig]
 
 
+@dataclass
+class BuffTypeConfig:
+    """One buff kind: `speed` and `mass` multiply for `duration` s (capped), `life` adds a ball."""
+
+    kind: str
+    weight: float
+    duration: float = 0.0
+    factor: float = 1.0
+    cap: float = 1.0
+
+
+@dataclass
+class BuffsConfig:
+    """Buff token spawning (every `spawn_every` seconds, at most `max_tokens` on the field)."""
+
+    types: list[BuffTypeConfig]
+    spawn_every: tuple[float, float] = (3.0, 5.0)
+    max_tokens: int = 3
+    token_radius: float = 0.35
+
+
+BUFF_KINDS = ("speed", "mass", "life")
+DEFAULT_BUFF_TYPES = {
+    "speed": BuffTypeConfig(kind="speed", weight=1.0, duration=5.0, factor=1.35, cap=1.75),
+    "mass": BuffTypeConfig(kind="mass", weight=0.8, duration=5.0, factor=1.6, cap=2.0),
+    "life": BuffTypeConfig(kind="life", weight=0.5),
+}
+DEFAULT_V_MIN_KO = 1.0
+DEFAULT_SOLVER_ITERATIONS = 4
+
+
 @dataclass
 class SceneConfig:
     """Top-level scene configuration."""
@@ -99,6 +142,13 @@ class SceneConfig:
     ball_mass: float
     friction: float
     restitution: float
+    precision: str = "float64"
+    v_min_ko: float = DEFAULT_V_MIN_KO  # minimum speed for a ball crossing a hole to be KO'd
+    buffs: BuffsConfig | None = None
+    seed: int = 0  # root of the in-match random streams (buff spawns), see powerpit.rng
+    solver: str = "sequential"  # ball-ball contacts: "sequential" pairs or "jacobi" iterations
+    solver_iterations: int = DEFAULT_SOLVER_ITERATIONS  # Jacobi iterations per tick
+    backend: str = "inhouse"  # physics engine, see powerpit.backends
 
     @property
     def frame_count(self) -> int:
@@ -106,6 +156,9 @@ class SceneConfig:
 
 
 SUPPORTED_ARENAS = {"circle", "stadium"}
+SUPPORTED_PRECISIONS = {"float32", "float64"}
+SUPPORTED_SOLVERS = {"sequential", "jacobi"}
+SUPPORTED_BACKENDS = {"inhouse", "vectorized", "pymunk"}
 DEFAULT_FRAME_RATE = 30
 DEFAULT_DURATION = 10.0
 DEFAULT_BALL_RADIUS = 0.45
@@ -115,8 +168,12 @@ DEFAULT_RESTITUTION = 0.98
 DEFAULT_BUMPER_RESTITUTION = 1.35
 
 
-def load_scene_config(path: str | Path) -> SceneConfig:
-    """Load and validate a scene configuration from YAML."""
+def load_scene_config(path: str | Path, seed: int | None = None) -> SceneConfig:
+    """Load and validate a scene configuration from YAML.
+
+    `seed` drives the procedural spawn generators, so the same file and seed
+    always expand to the same players.
+    """
 
     scene_path = Path(path)
     if not scene_path.exists():
@@ -135,13 +192,27 @@ def load_scene_config(path: str | Path) -> SceneConfig:
     arena_info = data.get("arena")
     arena = _parse_arena(arena_info)
 
+    ball_radius = _get_float(data, "ball_radius", DEFAULT_BALL_RADIUS)
     teams_info = data.get("teams")
-    teams = _parse_teams(teams_info)
+    teams = _parse_teams(teams_info, SpawnLayout(arena, ball_radius), seed)
 
-    ball_radius = _get_float(data, "ball_radius", DEFAULT_BALL_RADIUS)
     ball_mass = _get_float(data, "ball_mass", DEFAULT_BALL_MASS)
     friction = _get_float(data, "friction", DEFAULT_FRICTION)
     restitution = _get_float(data, "restitution", DEFAULT_RESTITUTION)
+    v_min_ko = _get_float(data, "v_min_ko", DEFAULT_V_MIN_KO)
+    buffs = _parse_buffs(data.get("buffs"))
+    precision = data.get("precision", "float64")
+    if precision not in SUPPORTED_PRECISIONS:
+        raise SceneConfigError(
+            f"Précision '{precision}' non supportée (options: {sorted(SUPPORTED_PRECISIONS)})."
+        )
+    solver = data.get("solver", "sequential")
+    if solver not in SUPPORTED_SOLVERS:
+        raise SceneConfigError(f"Solveur '{solver}' non supporté (options: {sorted(SUPPORTED_SOLVERS)}).")
+    solver_iterations = _get_int(data, "solver_iterations", DEFAULT_SOLVER_ITERATIONS)
+    backend = data.get("backend", "inhouse")
+    if backend not in SUPPORTED_BACKENDS:
+        raise SceneConfigError(f"Backend physique '{backend}' non supporté (options: {sorted(SUPPORTED_BACKENDS)}).")
 
     return SceneConfig(
         name=name,
@@ -153,6 +224,13 @@ def load_scene_config(path: str | Path) -> SceneConfig:
         ball_mass=ball_mass,
         friction=friction,
         restitution=restitution,
+        precision=precision,
+        v_min_ko=v_min_ko,
+        buffs=buffs,
+        seed=0 if seed is None else int(seed),
+        solver=solver,
+        solver_iterations=solver_iterations,
+        backend=backend,
     )
 
 
@@ -207,12 +285,13 @@ def _parse_arena(info: Any) -> ArenaConfig:
             radius = _get_float(raw, "radius", 0.6)
             restitution = _get_float(raw, "restitution", DEFAULT_BUMPER_RESTITUTION)
             bumpers.append(BumperConfig(position=position, radius=radius, restitution=restitution))
+    holes = _parse_holes(info.get("holes", []))
 
     if arena_type == "circle":
         radius = _get_float(info, "radius", 0.0)
         if radius <= 0:
             raise SceneConfigError("Le rayon de l'arène circulaire doit être > 0.")
-        return ArenaConfig(type=arena_type, radius=radius, bumpers=bumpers)
+        return ArenaConfig(type=arena_type, radius=radius, bumpers=bumpers, holes=holes)
 
     if arena_type == "stadium":
         width = _get_float(info, "width", 0.0)
@@ -232,24 +311,110 @@ def _parse_arena(info: Any) -> ArenaConfig:
             height=height,
             corner_radius=corner_radius,
             bumpers=bumpers,
+            holes=holes,
         )
 
     raise SceneConfigError(f"Type d'arène '{arena_type}' non géré.")
 
 
-def _parse_teams(info: Any) -> list[TeamConfig]:
+def _parse_holes(data: Any) -> list[HoleConfig]:
+    if not data:
+        return []
+    if not isinstance(data, Sequence) or isinstance(data, str):
+        raise SceneConfigError("Le champ 'holes' doit être une liste de définitions.")
+    holes: list[HoleConfig] = []
+    for idx, raw in enumerate(data):
+        if not isinstance(raw, Mapping):
+            raise SceneConfigError(f"Trou #{idx} invalide: doit être un mapping.")
+        hole_id = str(raw.get("id", f"H{idx + 1}"))
+        try:
+            angle = float(raw.get("angle"))
+        except (TypeError, ValueError) as exc:
+            raise SceneConfigError(f"Trou '{hole_id}': 'angle' doit être un nombre (degrés).") from exc
+        width = _get_float(raw, "width", 0.0) if "width" in raw else 0.0
+        if not 0.0 < width < 360.0:
+            raise SceneConfigError(f"Trou '{hole_id}': 'width' doit être dans ]0, 360[ degrés.")
+        holes.append(HoleConfig(id=hole_id, angle=angle % 360.0, width=width))
+
+    if len({hole.id for hole in holes}) != len(holes):
+        raise SceneConfigError("Les identifiants de trous doivent être uniques.")
+    for i, first in enumerate(holes):
+        for second in holes[i + 1 :]:
+            gap = abs((first.angle - second.angle + 180.0) % 360.0 - 180.0)
+            if gap < (first.width + second.width) / 2.0:
+                raise SceneConfigError(f"Les trous '{first.id}' et '{second.id}' se chevauchent.")
+    return holes
+
+
+def _parse_buffs(info: Any) -> BuffsConfig | None:
+    if info is None:
+        return None
+    if not isinstance(info, Mapping):
+        raise SceneConfigError("Le champ 'buffs' doit être un mapping.")
+
+    spawn_every = info.get("spawn_every", [3.0, 5.0])
+    try:
+        if isinstance(spawn_every, (list, tuple)):
+            if len(spawn_every) != 2:
+                raise ValueError(spawn_every)
+            low, high = float(spawn_every[0]), float(spawn_every[1])
+        else:
+            low = high = float(spawn_every)
+    except (TypeError, ValueError) as exc:
+        raise SceneConfigError("'buffs.spawn_every' doit être un nombre ou un intervalle [min, max].") from exc
+    if low <= 0 or high < low:
+        raise SceneConfigError("'buffs.spawn_every' doit vérifier 0 < min <= max.")
+
+    types_info = info.get("types")
+    types: list[BuffTypeConfig] = []
+    if types_info is None:
+        types = [DEFAULT_BUFF_TYPES[kind] for kind in BUFF_KINDS]
+    elif not isinstance(types_info, Sequence) or isinstance(types_info, str) or not types_info:
+        raise SceneConfigError("'buffs.types' doit être une liste non vide.")
+    else:
+        for idx, raw in enumerate(types_info):
+            if not isinstance(raw, Mapping):
+                raise SceneConfigError(f"Buff #{idx} invalide: doit être un mapping.")
+            kind = raw.get("id", raw.get("kind"))
+            if kind not in DEFAULT_BUFF_TYPES:
+                raise SceneConfigError(f"Buff '{kind}' non supporté (options: {list(BUFF_KINDS)}).")
+            default = DEFAULT_BUFF_TYPES[kind]
+            buff = BuffTypeConfig(
+                kind=kind,
+                weight=_get_float(raw, "weight", default.weight),
+                duration=_get_float(raw, "duration", default.duration) if kind != "life" else 0.0,
+                factor=_get_float(raw, "factor", default.factor) if kind != "life" else 1.0,
+                cap=_get_float(raw, "cap", default.cap) if kind != "life" else 1.0,
+            )
+            if buff.cap < 1.0:
+                raise SceneConfigError(f"Buff '{kind}': 'cap' doit être >= 1.")
+            types.append(buff)
+
+    return BuffsConfig(
+        types=types,
+        spawn_every=(low, high),
+        max_tokens=_get_int(info, "max_tokens", 3),
+        token_radius=_get_float(info, "token_radius", 0.35),
+    )
+
+
+def _parse_teams(info: Any, layout: SpawnLayout | None = None, seed: int | None = None) -> list[TeamConfig]:
     if not isinstance(info, Sequence) or not info:
         raise SceneConfigError("La scène doit définir au moins une équipe.")
 
-    teams: list[TeamConfig] = []
+    streams = build_rng(seed)
+    parsed: list[tuple[str, tuple[int, int, int], list[PlayerConfig], Sequence[Any]]] = []
     for team_idx, team_data in enumerate(info):
         if not isinstance(team_data, Mapping):
             raise SceneConfigError(f"Équipe #{team_idx} invalide: doit être un mapping.")
         name = _require_str(team_data, "name")
         color_value = _require_str(team_data, "color")
         color = _parse_color(color_value)
-        players_field = team_data.get("players")
-        if not isinstance(players_field, Sequence) or not players_field:
+        players_field = team_data.get("players", [])
+        generators_field = team_data.get("generators", [])
+        if not isinstance(players_field, Sequence) or not isinstance(generators_field, Sequence):
+            raise SceneConfigError(f"'players' et 'generators' de l'équipe '{name}' doivent être des listes.")
+        if not players_field and not generators_field:
             raise SceneConfigError(f"L'équipe '{name}' doit contenir au moins un joueur.")
         players: list[PlayerConfig] = []
         for player_idx, player_data in enumerate(players_field):
@@ -263,6 +428,24 @@ def _parse_teams(info: Any) -> list[TeamConfig]:
             spawn = _parse_vec2(player_data, "spawn")
             velocity = _parse_optional_vec2(player_data, "velocity")
             players.append(PlayerConfig(name=pname, spawn=spawn, velocity=velocity))
+            if layout is not None:
+                layout.add(spawn)
+        parsed.append((name, color, players, generators_field))
+
+    # Generators run once every explicit player is registered, so none lands on one.
+    teams: list[TeamConfig] = []
+    for team_idx, (name, color, players, generators_field) in enumerate(parsed):
+        for gen_idx, generator in enumerate(generators_field):
+            if not isinstance(generator, Mapping):
+                raise SceneConfigError(f"Générateur #{gen_idx} de l'équipe '{name}' invalide: doit être un mapping.")
+            if layout is None:
+                raise SceneConfigError("Les générateurs nécessitent la géométrie de l'arène.")
+            try:
+                spawns = expand_generator(generator, layout, streams.stream("spawn", team_idx, gen_idx))
+            except SpawnError as exc:
+                raise SceneConfigError(f"Équipe '{name}', générateur #{gen_idx}: {exc}") from exc
+            for spawn, velocity in spawns:
+                players.append(PlayerConfig(name=f"{name}#{len(players) + 1}", spawn=spawn, velocity=velocity))
         teams.append(TeamConfig(name=name, color=color, players=players))
 
     return teams
@@ -0,0 +1,500 @@
+"""Persistent local render service (job queue + warm worker processes).
+
+The service keeps a pool of long-lived worker processes that have already
+imported numpy/PIL/imageio and probed ffmpeg, so each submitted clip only pays
+for its own simulation and encoding. Jobs are exposed over a small JSON/HTTP
+API bound to localhost::
+
+    python -m powerpit.service --port 8765 --workers 4
+
+    POST   /jobs          {"scene": ..., "seed": ..., "output": ..., "priority": 0}
+    GET    /jobs          liste des jobs
+    GET    /jobs/<id>     statut d'un job
+    DELETE /jobs/<id>     annulation (en file ou en cours)
+
+`RenderClient` wraps these endpoints for scripts and tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+FINAL_STATES = {"done", "failed", "cancelled"}
+
+Runner = Callable[..., Any]
+
+
+class ServiceError(RuntimeError):
+    """Raised for invalid requests sent to the render service."""
+
+
+class UnknownJobError(ServiceError):
+    """Raised when a job id does not exist."""
+
+
+def run_render_job(scene: str, seed: int | None, output: str, cache_dir: str | None = None) -> str:
+    """Default job runner: load the scene and export it with `render_scene`."""
+
+    from .cache import RenderCache
+    from .render import render_scene
+    from .scene import load_scene_config
+
+    config = load_scene_config(scene, seed=seed)
+    cache = RenderCache(cache_dir) if cache_dir else None
+    return str(render_scene(config, output, seed=seed, cache=cache))
+
+
+def _warm_up() -> None:
+    """Pay the import and ffmpeg probing cost once per worker process."""
+
+    try:
+        from . import render  # noqa: F401  - numpy, PIL, imageio
+        import imageio_ffmpeg
+
+        imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception as exc:  # pragma: no cover - depends on the environment
+        LOGGER.debug("Préchauffage partiel du worker: %s", exc)
+
+
+def _worker_main(conn: Any, runner: Runner, warm: bool) -> None:
+    if warm:
+        _warm_up()
+    while True:
+        try:
+            payload = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if payload is None:
+            break
+        try:
+            result = runner(**payload)
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+        else:
+            conn.send(("ok", result))
+
+
+class WorkerProcess:
+    """A warm child process executing one job at a time.
+
+    The child is restarted transparently when it dies (crash or `kill`).
+    """
+
+    def __init__(self, runner: Runner = run_render_job, warm: bool = True, context: Any = None):
+        self._runner = runner
+        self._warm = warm
+        self._context = context or multiprocessing.get_context("spawn")
+        self._process: Any = None
+        self._conn: Any = None
+        self._spawn()
+
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self._runner, self._warm),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def run(self, payload: dict[str, Any]) -> tuple[str, Any]:
+        """Execute `payload` and return `(status, detail)`.
+
+        `status` is "ok", "error" (exception in the job) or "crashed" (the
+        process died, e.g. killed or out of memory).
+        """
+
+        if not self._process.is_alive():
+            self._spawn()
+        try:
+            self._conn.send(payload)
+            while True:
+                if self._conn.poll(0.05):
+                    return self._conn.recv()
+                if not self._process.is_alive():
+                    break
+        except (EOFError, OSError):
+            pass
+        exitcode = self._process.exitcode
+        self._process.join(timeout=1.0)
+        self._spawn()
+        return ("crashed", f"worker terminé (exit code {exitcode})")
+
+    def kill(self) -> None:
+        """Terminate the current child; the next `run` respawns it."""
+
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        self._conn.close()
+        self._process = None
+
+
+@dataclass
+class RenderJob:
+    """A queued render request and its status."""
+
+    id: str
+    scene: str
+    output: str
+    seed: int | None = None
+    priority: int = 0
+    status: str = "queued"
+    result: str | None = None
+    error: str | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        return {"scene": self.scene, "seed": self.seed, "output": self.output}
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class RenderService:
+    """Priority job queue dispatched to a pool of warm worker processes.
+
+    Higher `priority` runs first; equal priorities run in submission order.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        runner: Runner = run_render_job,
+        warm: bool = True,
+        cache_dir: str | None = None,
+    ):
+        if workers <= 0:
+            raise ServiceError("Le service doit avoir au moins un worker.")
+        self._lock = threading.Condition()
+        self._queue: list[tuple[int, int, str]] = []
+        self._counter = itertools.count()
+        self._jobs: dict[str, RenderJob] = {}
+        self._running: dict[str, WorkerProcess] = {}
+        self._stopping = False
+        self._cache_dir = cache_dir
+        self._workers = [WorkerProcess(runner, warm=warm) for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._dispatch, args=(worker,), name=f"powerpit-dispatch-{idx}", daemon=True)
+            for idx, worker in enumerate(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    # ------------------------------------------------------------------ API
+    def submit(
+        self,
+        scene: str,
+        output: str,
+        seed: int | None = None,
+        priority: int = 0,
+    ) -> RenderJob:
+        if not isinstance(scene, str) or not scene:
+            raise ServiceError("Champ 'scene' manquant ou vide.")
+        if not isinstance(output, str) or not output:
+            raise ServiceError("Champ 'output' manquant ou vide.")
+        if seed is not None and not isinstance(seed, int):
+            raise ServiceError("Champ 'seed' doit être un entier.")
+        if not isinstance(priority, int):
+            raise ServiceError("Champ 'priority' doit être un entier.")
+
+        job = RenderJob(id=uuid.uuid4().hex[:12], scene=scene, output=output, seed=seed, priority=priority)
+        with self._lock:
+            if self._stopping:
+                raise ServiceError("Le service est en cours d'arrêt.")
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (-priority, next(self._counter), job.id))
+            self._lock.notify()
+        LOGGER.info("Job %s en file — scene=%s, seed=%s, priorité=%d", job.id, scene, seed, priority)
+        return job
+
+    def get(self, job_id: str) -> RenderJob:
+        with self._lock:
+            try:
+                return self._jobs[job_id]
+            except KeyError:
+                raise UnknownJobError(f"Job inconnu: {job_id}") from None
+
+    def jobs(self) -> list[RenderJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.submitted_at)
+
+    def cancel(self, job_id: str) -> RenderJob:
+        """Cancel a queued job, or kill the worker running it."""
+
+        with self._lock:
+            job = self.get(job_id)
+            if job.status in FINAL_STATES:
+                return job
+            if job.status == "running":
+                self._running[job_id].kill()
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        LOGGER.info("Job %s annulé", job_id)
+        return job
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stopping = True
+            for job in self._jobs.values():
+                if job.status == "queued":
+                    job.status = "cancelled"
+            self._lock.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5.0)
+        for worker in self._workers:
+            worker.close()
+
+    # ------------------------------------------------------------- dispatch
+    def _next_job(self) -> RenderJob | None:
+        with self._lock:
+            while True:
+                while self._queue:
+                    _, _, job_id = heapq.heappop(self._queue)
+                    job = self._jobs[job_id]
+                    if job.status == "queued":
+                        return job
+                if self._stopping:
+                    return None
+                self._lock.wait()
+
+    def _dispatch(self, worker: WorkerProcess) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            with self._lock:
+                if job.status != "queued":
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+                self._running[job.id] = worker
+
+            payload = job.payload
+            if self._cache_dir:
+                payload["cache_dir"] = self._cache_dir
+            status, detail = worker.run(payload)
+
+            with self._lock:
+                self._running.pop(job.id, None)
+                if job.status == "cancelled":
+                    continue
+                job.finished_at = time.time()
+                if status == "ok":
+                    job.status = "done"
+                    job.result = None if detail is None else str(detail)
+                else:
+                    job.status = "failed"
+                    job.error = str(detail)
+            LOGGER.info("Job %s terminé — statut=%s", job.id, job.status)
+
+
+# ---------------------------------------------------------------------- HTTP
+def _make_handler(service: RenderService) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            parts = self._parts()
+            if parts == ["health"]:
+                self._reply(200, {"status": "ok"})
+            elif parts == ["jobs"]:
+                self._reply(200, [job.to_dict() for job in service.jobs()])
+            elif len(parts) == 2 and parts[0] == "jobs":
+                self._call(lambda: service.get(parts[1]).to_dict())
+            else:
+                self._reply(404, {"error": "route inconnue"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self._parts() != ["jobs"]:
+                self._reply(404, {"error": "route inconnue"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, json.JSONDecodeError):
+                self._reply(400, {"error": "corps JSON invalide"})
+                return
+            if not isinstance(body, dict):
+                self._reply(400, {"error": "le corps doit être un objet JSON"})
+                return
+            self._call(
+                lambda: service.submit(
+                    scene=body.get("scene"),
+                    output=body.get("output"),
+                    seed=body.get("seed"),
+                    priority=body.get("priority", 0),
+                ).to_dict(),
+                status=201,
+            )
+
+        def do_DELETE(self) -> None:  # noqa: N802
+            parts = self._parts()
+            if len(parts) == 2 and parts[0] == "jobs":
+                self._call(lambda: service.cancel(parts[1]).to_dict())
+            else:
+                self._reply(404, {"error": "route inconnue"})
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            LOGGER.debug("HTTP %s", format % args)
+
+        def _parts(self) -> list[str]:
+            return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+        def _call(self, action: Callable[[], Any], status: int = 200) -> None:
+            try:
+                payload = action()
+            except ServiceError as exc:
+                code = 404 if isinstance(exc, UnknownJobError) else 400
+                self._reply(code, {"error": str(exc)})
+                return
+            self._reply(status, payload)
+
+        def _reply(self, status: int, payload: Any) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return _Handler
+
+
+class RenderServer:
+    """HTTP front-end for a `RenderService`, bound to localhost by default."""
+
+    def __init__(self, service: RenderService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.service = service
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(service))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RenderServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="powerpit-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.service.shutdown()
+
+
+class RenderClient:
+    """Minimal JSON client for the render service."""
+
+    def __init__(self, url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout: float = 10.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def submit(self, scene: str, output: str, seed: int | None = None, priority: int = 0) -> dict[str, Any]:
+        body = {"scene": scene, "output": output, "seed": seed, "priority": priority}
+        return self._request("POST", "/jobs", body)
+
+    def status(self, job_id: str) -> dict[str, Any]:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def jobs(self) -> list[dict[str, Any]]:
+        return self._request("GET", "/jobs")
+
+    def cancel(self, job_id: str) -> dict[str, Any]:
+        return self._request("DELETE", f"/jobs/{job_id}")
+
+    def wait(self, job_id: str, timeout: float = 600.0, interval: float = 0.1) -> dict[str, Any]:
+        """Poll until the job reaches a final state."""
+
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job["status"] in FINAL_STATES:
+                return job
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} toujours '{job['status']}' après {timeout:.1f}s")
+            time.sleep(interval)
+
+    def _request(self, method: str, path: str, body: Any = None) -> Any:
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        request = urllib.request.Request(
+            self.url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            detail = json.loads(exc.read() or b"{}").get("error", exc.reason)
+            raise ServiceError(f"{method} {path}: {detail}") from None
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .logging_utils import configure_logging
+
+    parser = argparse.ArgumentParser(description="Power Pit — service de rendu local")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Adresse d'écoute (localhost par défaut)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port HTTP")
+    parser.add_argument("--workers", type=int, default=2, help="Nombre de workers préchauffés")
+    parser.add_argument("--cache-dir", default=None, help="Cache de rendu partagé par tous les jobs")
+    parser.add_argument("--verbose", action="store_true", help="Active le logging debug")
+    args = parser.parse_args(argv)
+    configure_logging(verbose=args.verbose)
+
+    service = RenderService(workers=args.workers, cache_dir=args.cache_dir)
+    server = RenderServer(service, host=args.host, port=args.port)
+    LOGGER.info("Service de rendu prêt sur %s (%d workers)", server.url, args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        LOGGER.info("Arrêt du service demandé")
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,31 @@
-"""Core physics simulation for Power Pit (M1)."""
+"""Core physics simulation for Power Pit (M1).
+
+Ball state is stored as struct-of-arrays (`Simulation.positions` and
+`Simulation.velocities`, shape `(N, 2)`, plus the per-row `inv_mass`); each
+`BallState` exposes row views into them. The arrays use the scene `precision`
+("float64" by default, or "float32" to halve memory traffic for large crowds
+and batched worlds).
+
+Determinism: within one precision mode, a scene always produces bit-identical
+states on the same platform and NumPy version, since every tick applies the
+same operations in the same order. Across precision modes no such guarantee
+holds: rounding differences are amplified by collisions, so float32 runs only
+stay close to float64 ones (see `tests/test_trajectory.py` for the bounds
+checked on the bundled scenes).
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import copy
+from dataclasses import dataclass, field
 from typing import Iterable, Sequence
 
 import numpy as np
 
+from .buffs import BuffEvent, BuffSystem
+from .contacts import broadphase_pairs, solve_contacts_jacobi
+from .holes import NO_HOLE, HoleTable, outside_arena
+from .rng import RngStreams
 from .scene import ArenaConfig, SceneConfig, TeamConfig
 
 Vec2 = np.ndarray
@@ -32,6 +51,7 @@ class BallState:
     velocity: Vec2
     radius: float
     mass: float
+    active: bool = True  # False once the ball has been knocked out
 
     def copy(self) -> "BallState":
         return BallState(
@@ -42,60 +62,168 @@ class BallState:
             velocity=self.velocity.copy(),
             radius=self.radius,
             mass=self.mass,
+            active=self.active,
         )
 
 
+@dataclass
+class KOEvent:
+    """A ball left the arena through a hole."""
+
+    time: float
+    ball_index: int
+    ball_name: str
+    team_index: int
+    hole_id: str
+    speed: float
+
+
+def bumper_contact(index: int) -> int:
+    """Code of bumper `index` in the second column of `SimulationSnapshot.contacts` (and back)."""
+
+    return -1 - index
+
+
 @dataclass
 class SimulationSnapshot:
-    """State of the simulation for a given frame."""
+    """State of the simulation for a given frame.
+
+    `events` holds the KOs and buff pickups that happened since the previous
+    snapshot, `scores` the points of each team (every KO scores for the other
+    teams) and `tokens` the buff tokens lying in the arena as `(kind, (x, y))`.
+    `impulse` is the strongest ball-ball or bumper contact impulse since the
+    previous snapshot (it drives hitstop and screenshake). `contacts` lists,
+    once each, the `(row, other)` pairs that touched since the previous
+    snapshot: `other` is a ball row (greater than `row`) or, for a bumper,
+    `bumper_contact(bumper_index)`.
+    """
 
     frame_index: int
     time: float
     balls: list[BallState]
+    events: list[KOEvent | BuffEvent] = field(default_factory=list)
+    scores: list[int] = field(default_factory=list)
+    tokens: list[tuple[str, tuple[float, float]]] = field(default_factory=list)
+    impulse: float = 0.0
+    contacts: np.ndarray = field(default_factory=lambda: np.zeros((0, 2), dtype=np.int64))
+
+    def max_speed(self) -> float:
+        """Speed of the fastest ball still in play (0 when there is none)."""
+
+        live = [ball.velocity for ball in self.balls if ball.active]
+        if not live:
+            return 0.0
+        velocities = np.stack(live)
+        return float(np.sqrt(np.max(np.einsum("ij,ij->i", velocities, velocities))))
 
 
 class Simulation:
     """Handle the physics integration for a scene."""
 
-    def __init__(self, scene: SceneConfig):
+    supports_checkpoints = True  # `clone` copies the whole state
+
+    def __init__(self, scene: SceneConfig, precision: str | None = None):
         self.scene = scene
         self.time = 0.0
         self.arena = scene.arena
         self.friction = scene.friction
         self.restitution = scene.restitution
+        self.dtype = np.dtype(precision or scene.precision)
 
+        self.positions = np.zeros((0, 2), dtype=self.dtype)
+        self.velocities = np.zeros((0, 2), dtype=self.dtype)
+        self.inv_mass = np.zeros(0)
         self.balls: list[BallState] = []
         self.bumpers: list[Bumper] = []
         self._build_balls(scene.teams, scene.ball_radius, scene.ball_mass)
         self._build_bumpers(scene.arena)
 
+        self.active = np.ones(len(self.balls), dtype=bool)
+        self._live = list(self.balls)  # balls still in play, in row order
+        self.scores = [0] * len(scene.teams)
+        self.events: list[KOEvent | BuffEvent] = []
+        self._captured_events = 0
+        self._peak_impulse = 0.0  # strongest contact since the last capture
+        self._contacts: list[np.ndarray] = []  # (k, 2) touching pairs since the last capture
+        self._holes = HoleTable(scene.arena.holes) if scene.arena.holes else None
+        self._v_min_ko_sq = float(scene.v_min_ko) ** 2
+        self._buffs = (
+            BuffSystem(scene.buffs, len(self.balls), RngStreams(scene.seed).stream("buffs"))
+            if scene.buffs is not None
+            else None
+        )
+        self._extra_balls = [0] * len(scene.teams)
+
+    @property
+    def ko_events(self) -> list[KOEvent]:
+        return [event for event in self.events if isinstance(event, KOEvent)]
+
     # ------------------------------------------------------------------ utils
     def _build_balls(self, teams: Sequence[TeamConfig], radius: float, mass: float) -> None:
-        for team_index, team in enumerate(teams):
-            for player in team.players:
-                spawn = np.array(player.spawn, dtype=float)
-                velocity = (
-                    np.array(player.velocity, dtype=float)
-                    if player.velocity is not None
-                    else np.zeros(2, dtype=float)
-                )
-                self.balls.append(
-                    BallState(
-                        team_index=team_index,
-                        team=team,
-                        name=player.name,
-                        position=spawn,
-                        velocity=velocity,
-                        radius=radius,
-                        mass=mass,
-                    )
+        entries = [(team_index, team, player) for team_index, team in enumerate(teams) for player in team.players]
+        self.positions = np.zeros((len(entries), 2), dtype=self.dtype)
+        self.velocities = np.zeros((len(entries), 2), dtype=self.dtype)
+        self.inv_mass = np.full(len(entries), 1.0 / mass)
+        for index, (team_index, team, player) in enumerate(entries):
+            self.positions[index] = player.spawn
+            if player.velocity is not None:
+                self.velocities[index] = player.velocity
+            self.balls.append(
+                BallState(
+                    team_index=team_index,
+                    team=team,
+                    name=player.name,
+                    position=self.positions[index],
+                    velocity=self.velocities[index],
+                    radius=radius,
+                    mass=mass,
                 )
+            )
+
+    def add_ball(self, team_index: int, position: tuple[float, float], velocity: tuple[float, float]) -> BallState:
+        """Append a ball to `team_index` (Life+ buff) and return it.
+
+        The state arrays are reallocated, so every `BallState` is re-pointed at
+        its new rows; the existing balls keep their indices.
+        """
+
+        self.positions = np.concatenate([self.positions, np.array([position], dtype=self.dtype)])
+        self.velocities = np.concatenate([self.velocities, np.array([velocity], dtype=self.dtype)])
+        self.inv_mass = np.append(self.inv_mass, 1.0 / self.scene.ball_mass)
+        for index, ball in enumerate(self.balls):
+            ball.position = self.positions[index]
+            ball.velocity = self.velocities[index]
+        self.active = np.append(self.active, True)
+
+        team = self.scene.teams[team_index]
+        self._extra_balls[team_index] += 1
+        index = len(self.balls)
+        ball = BallState(
+            team_index=team_index,
+            team=team,
+            name=f"{team.name}+{self._extra_balls[team_index]}",
+            position=self.positions[index],
+            velocity=self.velocities[index],
+            radius=self.scene.ball_radius,
+            mass=self.scene.ball_mass,
+        )
+        self.balls.append(ball)
+        self._live.append(ball)
+        if self._buffs is not None:
+            self._buffs.grow(1)
+        return ball
+
+    def set_mass(self, index: int, mass: float) -> None:
+        """Change the mass of ball `index`, keeping `inv_mass` in step (Mass+ buff)."""
+
+        self.balls[index].mass = mass
+        self.inv_mass[index] = 1.0 / mass
 
     def _build_bumpers(self, arena: ArenaConfig) -> None:
         for bumper in arena.bumpers:
             self.bumpers.append(
                 Bumper(
-                    position=np.array(bumper.position, dtype=float),
+                    position=np.array(bumper.position, dtype=self.dtype),
                     radius=float(bumper.radius),
                     restitution=float(bumper.restitution),
                 )
@@ -105,36 +233,124 @@ class Simulation:
     def step(self) -> None:
         """Advance the simulation by a fixed tick."""
 
-        for ball in self.balls:
-            ball.velocity *= self.friction
-            ball.position += ball.velocity * DT
-
-        self._solve_ball_ball()
-        self._solve_arena_walls()
+        self.velocities *= self.friction
+        if self._buffs is not None:  # Speed+ scales the displacement, not the stored velocity
+            self.positions += self.velocities * (self._buffs.speed_factor * DT).astype(self.dtype)[:, None]
+        else:
+            self.positions += self.velocities * DT
+
+        if self.scene.solver == "jacobi":
+            self._solve_ball_ball_jacobi()
+        else:
+            self._solve_ball_ball()
+        passing = self._classify_holes() if self._holes is not None else None
+        self._solve_arena_walls(passing)
         self._solve_bumpers()
 
         self.time += DT
+        if passing is not None and passing.any():
+            self._register_kos(passing)
+        if self._buffs is not None:
+            self.events.extend(self._buffs.step(self))
+
+    def clone(self) -> "Simulation":
+        """Independent copy of the whole state (RNG streams included), sharing the scene.
+
+        Used as a checkpoint: stepping the clone gives exactly the frames the
+        original would have produced.
+        """
+
+        if not self.supports_checkpoints:
+            raise RuntimeError(f"Le backend '{self.scene.backend}' ne sait pas copier son état.")
+
+        shared = (self.scene, self.scene.arena, *self.scene.teams)
+        twin = copy.deepcopy(self, {id(item): item for item in shared})
+        # deepcopy gives views their own buffers: point the balls back at the rows.
+        for index, ball in enumerate(twin.balls):
+            ball.position = twin.positions[index]
+            ball.velocity = twin.velocities[index]
+        return twin
 
     def capture(self, frame_index: int) -> SimulationSnapshot:
+        events = self.events[self._captured_events :]
+        self._captured_events = len(self.events)
+        impulse, self._peak_impulse = self._peak_impulse, 0.0
+        contacts = np.unique(np.concatenate(self._contacts), axis=0) if self._contacts else np.zeros((0, 2), np.int64)
+        self._contacts = []
+        balls = [ball.copy() for ball in self.balls]
+        if self._buffs is not None:  # snapshots carry the velocity the ball actually moves at
+            for index in np.flatnonzero(self._buffs.speed_factor != 1.0):
+                balls[index].velocity *= self._buffs.speed_factor[index]
         return SimulationSnapshot(
             frame_index=frame_index,
             time=self.time,
-            balls=[ball.copy() for ball in self.balls],
+            balls=balls,
+            events=events,
+            scores=list(self.scores),
+            tokens=self._buffs.tokens() if self._buffs is not None else [],
+            impulse=impulse,
+            contacts=contacts,
         )
 
+    # ------------------------------------------------------------------ holes
+    def _classify_holes(self) -> np.ndarray:
+        """Mask of the balls fast enough to leave through the hole they face.
+
+        Those balls ignore the wall this tick; one `arctan2` over all balls and
+        one angular table lookup classify them against every hole at once.
+        """
+
+        assert self._holes is not None
+        self._hole_index = self._holes.classify(self.positions)
+        speed_sq = np.einsum("ij,ij->i", self.velocities, self.velocities)
+        if self._buffs is not None:
+            speed_sq = speed_sq * self._buffs.speed_factor**2
+        return self.active & (self._hole_index != NO_HOLE) & (speed_sq > self._v_min_ko_sq)
+
+    def _register_kos(self, passing: np.ndarray) -> None:
+        knocked = passing & outside_arena(self.arena, self.positions)
+        if not knocked.any():
+            return
+        for index in np.flatnonzero(knocked):
+            ball = self.balls[index]
+            speed = float(np.linalg.norm(ball.velocity))
+            if self._buffs is not None:
+                speed *= float(self._buffs.speed_factor[index])
+            ball.active = False
+            self.active[index] = False
+            self.velocities[index] = 0.0
+            for team_index in range(len(self.scores)):
+                if team_index != ball.team_index:
+                    self.scores[team_index] += 1
+            self.events.append(
+                KOEvent(
+                    time=self.time,
+                    ball_index=int(index),
+                    ball_name=ball.name,
+                    team_index=ball.team_index,
+                    hole_id=self._holes.holes[self._hole_index[index]].id if self._holes else "",
+                    speed=speed,
+                )
+            )
+        self._live = [ball for ball in self.balls if ball.active]
+
     # ------------------------------------------------------------ collision
     def _solve_ball_ball(self) -> None:
         restitution = self.restitution
-        count = len(self.balls)
+        live = self._live
+        rows = np.flatnonzero(self.active)  # row of each live ball
+        touching: list[tuple[int, int]] = []
+        count = len(live)
         for i in range(count):
-            a = self.balls[i]
+            a = live[i]
             for j in range(i + 1, count):
-                b = self.balls[j]
+                b = live[j]
                 delta = b.position - a.position
                 dist_sq = float(np.dot(delta, delta))
                 min_dist = a.radius + b.radius
                 if dist_sq >= min_dist * min_dist:
                     continue
+                touching.append((rows[i], rows[j]))
 
                 dist = float(np.sqrt(dist_sq))
                 if dist <= 1e-9:
@@ -154,22 +370,56 @@ class Simulation:
 
                 impulse_mag = -(1.0 + restitution) * rel_vel
                 impulse_mag /= total_inv_mass
+                if impulse_mag > self._peak_impulse:
+                    self._peak_impulse = impulse_mag
                 impulse = normal * impulse_mag
                 a.velocity -= impulse * (1.0 / a.mass)
                 b.velocity += impulse * (1.0 / b.mass)
-
-    def _solve_arena_walls(self) -> None:
+        if touching:
+            self._contacts.append(np.array(touching, dtype=np.int64))
+
+    def _solve_ball_ball_jacobi(self) -> None:
+        """All contacts at once, over `scene.solver_iterations` Jacobi iterations."""
+
+        live = np.flatnonzero(self.active)
+        radius = self.scene.ball_radius
+        first, second = broadphase_pairs(self.positions, live, 2.0 * radius)
+        if not first.size:
+            return
+        delta = self.positions[second] - self.positions[first]
+        touching = np.einsum("ij,ij->i", delta, delta) < (2.0 * radius) ** 2
+        if touching.any():
+            a, b = first[touching], second[touching]
+            self._contacts.append(np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1).astype(np.int64))
+        peak = solve_contacts_jacobi(
+            self.positions,
+            self.velocities,
+            self.inv_mass,
+            first,
+            second,
+            radius,
+            self.restitution,
+            self.scene.solver_iterations,
+        )
+        if peak > self._peak_impulse:
+            self._peak_impulse = peak
+
+    def _solve_arena_walls(self, passing: np.ndarray | None = None) -> None:
+        if passing is not None and passing.any():
+            balls = [ball for ball, skip in zip(self.balls, passing) if ball.active and not skip]
+        else:
+            balls = self._live
         if self.arena.type == "circle":
-            self._solve_circle_walls()
+            self._solve_circle_walls(balls)
         elif self.arena.type == "stadium":
-            self._solve_stadium_walls()
+            self._solve_stadium_walls(balls)
         else:  # pragma: no cover - guarded earlier
             raise RuntimeError(f"Type d'arène non géré: {self.arena.type}")
 
-    def _solve_circle_walls(self) -> None:
+    def _solve_circle_walls(self, balls: list[BallState]) -> None:
         assert self.arena.radius is not None
         arena_radius = float(self.arena.radius)
-        for ball in self.balls:
+        for ball in balls:
             center_dist = float(np.linalg.norm(ball.position))
             limit = arena_radius - ball.radius
             if center_dist <= limit:
@@ -186,7 +436,7 @@ class Simulation:
             if vel_along_normal > 0:
                 ball.velocity -= normal * vel_along_normal * (1.0 + self.restitution)
 
-    def _solve_stadium_walls(self) -> None:
+    def _solve_stadium_walls(self, balls: list[BallState]) -> None:
         assert self.arena.width is not None
         assert self.arena.height is not None
         assert self.arena.corner_radius is not None
@@ -200,7 +450,7 @@ class Simulation:
         if flat_width < 0 or flat_height < 0:
             raise RuntimeError("Paramètres 'stadium' invalides: corner_radius trop grand.")
 
-        for ball in self.balls:
+        for ball in balls:
             px, py = float(ball.position[0]), float(ball.position[1])
 
             # Top/bottom flat sections
@@ -259,13 +509,16 @@ class Simulation:
             self._reflect_velocity(ball, normal)
 
     def _solve_bumpers(self) -> None:
-        for bumper in self.bumpers:
-            for ball in self.balls:
+        rows = np.flatnonzero(self.active)
+        touching: list[tuple[int, int]] = []
+        for index, bumper in enumerate(self.bumpers):
+            for row, ball in zip(rows, self._live):
                 delta = ball.position - bumper.position
                 dist = float(np.linalg.norm(delta))
                 limit = bumper.radius + ball.radius
                 if dist >= limit:
                     continue
+                touching.append((row, bumper_contact(index)))
 
                 if dist <= 1e-9:
                     normal = np.array([1.0, 0.0])
@@ -277,6 +530,11 @@ class Simulation:
                 vel_along_normal = float(np.dot(ball.velocity, normal))
                 if vel_along_normal < 0:
                     ball.velocity -= normal * vel_along_normal * (1.0 + bumper.restitution)
+                    impulse_mag = -vel_along_normal * (1.0 + bumper.restitution) * ball.mass
+                    if impulse_mag > self._peak_impulse:
+                        self._peak_impulse = impulse_mag
+        if touching:
+            self._contacts.append(np.array(touching, dtype=np.int64))
 
     def _reflect_velocity(self, ball: BallState, normal: Vec2) -> None:
         vel_along_normal = float(np.dot(ball.velocity, normal))
@@ -284,10 +542,17 @@ class Simulation:
             ball.velocity -= normal * vel_along_normal * (1.0 + self.restitution)
 
 
-def simulate_frames(scene: SceneConfig) -> Iterable[SimulationSnapshot]:
-    """Iterate over snapshots matching the scene frame rate."""
+def simulate_frames(
+    scene: SceneConfig, precision: str | None = None, backend: str | None = None
+) -> Iterable[SimulationSnapshot]:
+    """Iterate over snapshots matching the scene frame rate.
+
+    `backend` overrides the scene's physics backend (see `powerpit.backends`).
+    """
+
+    from .backends import create_backend
 
-    simulation = Simulation(scene)
+    simulation = create_backend(scene, precision=precision, backend=backend)
     steps_per_frame = max(1, int(round((1.0 / scene.frame_rate) / DT)))
     frame_time = 1.0 / scene.frame_rate
 
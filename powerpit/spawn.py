@@ -0,0 +1,285 @@
+"""Procedural spawn generators expanded into player lists at scene load time.
+
+A team may declare ``generators`` next to (or instead of) explicit
+``players``::
+
+    generators:
+      - {type: ring, count: 64, radius: 6.0, speed: 3.0, heading: inward}
+      - {type: grid, count: 100, center: [0, 0], spacing: 1.0, speed: [0, 2]}
+      - {type: random, count: 500, speed: [1.0, 4.0]}
+      - {type: fan, count: 32, origin: [0, -7], angle: 90, spread: 60, speed: [5, 8]}
+
+``speed`` is a scalar or a ``[min, max]`` range drawn from the scene RNG;
+``heading`` is one of ``random`` (default), ``inward``, ``outward`` or
+``tangent``. Every generated ball must lie inside the arena walls and must not
+overlap a bumper, an explicit player (all teams' players are placed before any
+generator runs) or a previously generated ball: random placements retry, the
+other layouts raise `SpawnError`. Each generator draws from its own stream,
+keyed by team and generator index (see `powerpit.rng`); speeds and headings are
+drawn for the whole generator at once. All generators share one occupancy
+layout, so editing a generator can still move the random spawns of the
+generators resolved after it.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .scene import ArenaConfig
+
+Vec2 = tuple[float, float]
+Spawn = tuple[Vec2, Vec2]  # (position, velocity)
+
+GENERATOR_TYPES = ("ring", "grid", "random", "fan")
+HEADINGS = ("random", "inward", "outward", "tangent")
+MAX_RANDOM_ATTEMPTS = 200
+RANDOM_BATCH = 8  # candidate positions drawn at once by the 'random' layout
+
+
+class SpawnError(ValueError):
+    """Raised when a generator definition is invalid or cannot be satisfied."""
+
+
+class SpawnLayout:
+    """Occupancy grid shared by every generator of a scene.
+
+    Ensures generated balls neither overlap each other nor previously placed
+    balls and bumpers, with O(1) neighbour lookups.
+    """
+
+    def __init__(self, arena: "ArenaConfig", ball_radius: float):
+        self.arena = arena
+        self.ball_radius = ball_radius
+        self._cell = 2.0 * ball_radius
+        self._cells: dict[tuple[int, int], list[Vec2]] = {}
+
+    def add(self, point: Vec2) -> None:
+        self._cells.setdefault(self._key(point), []).append(point)
+
+    def is_free(self, point: Vec2) -> bool:
+        min_dist_sq = (2.0 * self.ball_radius) ** 2
+        kx, ky = self._key(point)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in self._cells.get((kx + dx, ky + dy), ()):
+                    if (other[0] - point[0]) ** 2 + (other[1] - point[1]) ** 2 < min_dist_sq:
+                        return False
+        for bumper in self.arena.bumpers:
+            limit = bumper.radius + self.ball_radius
+            bx, by = bumper.position
+            if (bx - point[0]) ** 2 + (by - point[1]) ** 2 < limit * limit:
+                return False
+        return True
+
+    def contains(self, point: Vec2, clearance: float) -> bool:
+        """Return True when a ball at `point` lies inside the arena walls."""
+
+        x, y = point
+        arena = self.arena
+        if arena.type == "circle":
+            assert arena.radius is not None
+            return math.hypot(x, y) <= arena.radius - clearance
+        if arena.type == "stadium":
+            assert arena.width is not None and arena.height is not None
+            assert arena.corner_radius is not None
+            half_w, half_h = arena.width / 2.0, arena.height / 2.0
+            if abs(x) > half_w - clearance or abs(y) > half_h - clearance:
+                return False
+            flat_w = half_w - arena.corner_radius
+            flat_h = half_h - arena.corner_radius
+            dx, dy = max(abs(x) - flat_w, 0.0), max(abs(y) - flat_h, 0.0)
+            return math.hypot(dx, dy) <= arena.corner_radius - clearance
+        raise SpawnError(f"Type d'arène non géré pour les générateurs: {arena.type}")
+
+    def _key(self, point: Vec2) -> tuple[int, int]:
+        return (math.floor(point[0] / self._cell), math.floor(point[1] / self._cell))
+
+
+def expand_generator(spec: Mapping[str, Any], layout: SpawnLayout, rng: np.random.Generator) -> list[Spawn]:
+    """Expand one generator mapping into `(position, velocity)` pairs."""
+
+    kind = spec.get("type")
+    if kind not in GENERATOR_TYPES:
+        raise SpawnError(f"Type de générateur '{kind}' non supporté (options: {list(GENERATOR_TYPES)}).")
+    count = spec.get("count")
+    if not isinstance(count, int) or isinstance(count, bool) or count <= 0:
+        raise SpawnError(f"Générateur '{kind}': 'count' doit être un entier > 0.")
+
+    positions, radials = _LAYOUTS[kind](spec, count, layout, rng)
+    if kind == "fan":
+        # A fan fires along its rays, optionally jittered.
+        jitter = math.radians(_number(spec, "jitter", 0.0))
+        headings = np.asarray(radials) + (rng.normal(0.0, jitter, count) if jitter > 0 else 0.0)
+    else:
+        headings = _headings(spec, np.asarray(radials), rng)
+    low, high = _speed_range(spec)
+    speeds = rng.uniform(low, high, count) if low != high else np.full(count, low)
+    velocities = np.stack([np.cos(headings) * speeds, np.sin(headings) * speeds], axis=1).tolist()
+    return [(position, (vx, vy)) for position, (vx, vy) in zip(positions, velocities)]
+
+
+# ---------------------------------------------------------------- layouts
+# Each layout returns the positions and, per ball, its radial angle (used by
+# the inward/outward/tangent headings).
+def _ring(spec: Mapping[str, Any], count: int, layout: SpawnLayout, rng: np.random.Generator):
+    cx, cy = _vec2(spec, "center", (0.0, 0.0))
+    radius = _positive(spec, "radius")
+    start = math.radians(_number(spec, "start_angle", 0.0))
+    positions, radials = [], []
+    for index in range(count):
+        angle = start + 2.0 * math.pi * index / count
+        point = (cx + radius * math.cos(angle), cy + radius * math.sin(angle))
+        _place(layout, "ring", index, count, point)
+        positions.append(point)
+        radials.append(angle)
+    return positions, radials
+
+
+def _grid(spec: Mapping[str, Any], count: int, layout: SpawnLayout, rng: np.random.Generator):
+    cx, cy = _vec2(spec, "center", (0.0, 0.0))
+    spacing = _positive(spec, "spacing", 2.2 * layout.ball_radius)
+    try:
+        columns = int(spec.get("columns", math.ceil(math.sqrt(count))))
+    except (TypeError, ValueError) as exc:
+        raise SpawnError("Générateur 'grid': 'columns' doit être un entier.") from exc
+    if columns <= 0:
+        raise SpawnError("Générateur 'grid': 'columns' doit être > 0.")
+    rows = math.ceil(count / columns)
+    positions, radials = [], []
+    for index in range(count):
+        row, col = divmod(index, columns)
+        point = (cx + (col - (columns - 1) / 2.0) * spacing, cy + (row - (rows - 1) / 2.0) * spacing)
+        _place(layout, "grid", index, count, point)
+        positions.append(point)
+        radials.append(math.atan2(point[1] - cy, point[0] - cx))
+    return positions, radials
+
+
+def _random(spec: Mapping[str, Any], count: int, layout: SpawnLayout, rng: np.random.Generator):
+    clearance = layout.ball_radius + _number(spec, "margin", 0.0)
+    half_w = layout.arena.horizontal_span / 2.0
+    half_h = layout.arena.vertical_span / 2.0
+    positions, radials = [], []
+    for index in range(count):
+        point = None
+        for _ in range(MAX_RANDOM_ATTEMPTS // RANDOM_BATCH):
+            candidates = rng.uniform((-half_w, -half_h), (half_w, half_h), size=(RANDOM_BATCH, 2)).tolist()
+            point = next(
+                (
+                    (x, y)
+                    for x, y in candidates
+                    if layout.contains((x, y), clearance) and layout.is_free((x, y))
+                ),
+                None,
+            )
+            if point is not None:
+                break
+        if point is None:
+            raise SpawnError(
+                f"Générateur 'random': impossible de placer la balle #{index + 1}/{count} "
+                "sans chevauchement (arène trop dense)."
+            )
+        layout.add(point)
+        positions.append(point)
+        radials.append(math.atan2(point[1], point[0]))
+    return positions, radials
+
+
+def _fan(spec: Mapping[str, Any], count: int, layout: SpawnLayout, rng: np.random.Generator):
+    ox, oy = _vec2(spec, "origin", (0.0, 0.0))
+    center = math.radians(_number(spec, "angle", 90.0))
+    spread = math.radians(_number(spec, "spread", 45.0))
+    spacing = 2.2 * layout.ball_radius
+    positions, radials = [], []
+    distance = spacing
+    while len(positions) < count:
+        # Stack arcs outward from the muzzle until the fan holds every ball.
+        per_arc = max(1, min(count - len(positions), int(distance * max(spread, 1e-6) / spacing) + 1))
+        for slot in range(per_arc):
+            offset = 0.0 if per_arc == 1 else spread * (slot / (per_arc - 1) - 0.5)
+            angle = center + offset
+            point = (ox + distance * math.cos(angle), oy + distance * math.sin(angle))
+            _place(layout, "fan", len(positions), count, point)
+            positions.append(point)
+            radials.append(angle)
+        distance += spacing
+    return positions, radials
+
+
+def _place(layout: SpawnLayout, kind: str, index: int, count: int, point: Vec2) -> None:
+    """Register a computed (non-random) position, rejecting it outside the arena or on another ball."""
+
+    where = f"Générateur '{kind}': la balle #{index + 1}/{count} en ({point[0]:.2f}, {point[1]:.2f})"
+    if not layout.contains(point, layout.ball_radius):
+        raise SpawnError(f"{where} sort de l'arène (rayon, espacement ou nombre trop grand).")
+    if not layout.is_free(point):
+        raise SpawnError(f"{where} chevauche une autre balle ou un bumper.")
+    layout.add(point)
+
+
+_LAYOUTS: dict[str, Callable[..., tuple[list[Vec2], list[float]]]] = {
+    "ring": _ring,
+    "grid": _grid,
+    "random": _random,
+    "fan": _fan,
+}
+
+
+# ---------------------------------------------------------------- helpers
+def _headings(spec: Mapping[str, Any], radials: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    heading = spec.get("heading", "random")
+    if heading == "inward":
+        return radials + math.pi
+    if heading == "outward":
+        return radials
+    if heading == "tangent":
+        return radials + math.pi / 2.0
+    if heading == "random":
+        return rng.uniform(0.0, 2.0 * math.pi, len(radials))
+    raise SpawnError(f"'heading' invalide: {heading} (options: {list(HEADINGS)}).")
+
+
+def _speed_range(spec: Mapping[str, Any]) -> tuple[float, float]:
+    raw = spec.get("speed", 0.0)
+    try:
+        if isinstance(raw, (list, tuple)):
+            if len(raw) != 2:
+                raise SpawnError("'speed' doit être un nombre ou un intervalle [min, max].")
+            low, high = float(raw[0]), float(raw[1])
+        else:
+            low = high = float(raw)
+    except (TypeError, ValueError) as exc:
+        raise SpawnError("'speed' doit contenir des nombres.") from exc
+    if low < 0 or high < low:
+        raise SpawnError("'speed' doit vérifier 0 <= min <= max.")
+    return (low, high)
+
+
+def _number(spec: Mapping[str, Any], field: str, default: float) -> float:
+    try:
+        return float(spec.get(field, default))
+    except (TypeError, ValueError) as exc:
+        raise SpawnError(f"Champ '{field}' doit être un nombre réel.") from exc
+
+
+def _positive(spec: Mapping[str, Any], field: str, default: float | None = None) -> float:
+    if field not in spec and default is None:
+        raise SpawnError(f"Champ '{field}' requis pour le générateur '{spec.get('type')}'.")
+    value = _number(spec, field, default if default is not None else 0.0)
+    if value <= 0:
+        raise SpawnError(f"Champ '{field}' doit être strictement positif.")
+    return value
+
+
+def _vec2(spec: Mapping[str, Any], field: str, default: Vec2) -> Vec2:
+    raw = spec.get(field, default)
+    if not isinstance(raw, (list, tuple)) or len(raw) != 2:
+        raise SpawnError(f"Champ '{field}' doit être une séquence de 2 valeurs.")
+    try:
+        return (float(raw[0]), float(raw[1]))
+    except (TypeError, ValueError) as exc:
+        raise SpawnError(f"Champ '{field}' doit contenir des nombres.") from exc
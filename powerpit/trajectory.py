@@ -0,0 +1,75 @@
+"""Recorded ball trajectories (per-frame state arrays)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from .scene import SceneConfig
+from .simulation import SimulationSnapshot, simulate_frames
+
+
+@dataclass
+class Trajectory:
+    """Ball states captured at every frame, in the simulation precision."""
+
+    times: np.ndarray  # (F,)
+    positions: np.ndarray  # (F, N, 2)
+    velocities: np.ndarray  # (F, N, 2)
+    names: list[str]
+    team_indices: np.ndarray  # (N,)
+    active: np.ndarray | None = None  # (F, N) bool, False once a ball is KO'd
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.positions.shape[0])
+
+    @property
+    def ball_count(self) -> int:
+        return int(self.positions.shape[1])
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.positions.dtype
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[SimulationSnapshot]) -> "Trajectory":
+        """Stack snapshots; balls added mid-match (Life+) are inactive before they appear."""
+
+        snapshots = list(snapshots)
+        if not snapshots:
+            raise ValueError("Impossible de construire une trajectoire sans snapshot.")
+        last = snapshots[-1].balls
+        count = len(last)
+        dtype = last[0].position.dtype if last else np.dtype(float)
+        positions = np.zeros((len(snapshots), count, 2), dtype=dtype)
+        velocities = np.zeros((len(snapshots), count, 2), dtype=dtype)
+        active = np.zeros((len(snapshots), count), dtype=bool)
+        for frame, snapshot in enumerate(snapshots):
+            present = len(snapshot.balls)
+            if present:
+                positions[frame, :present] = np.stack([ball.position for ball in snapshot.balls])
+                velocities[frame, :present] = np.stack([ball.velocity for ball in snapshot.balls])
+                active[frame, :present] = [ball.active for ball in snapshot.balls]
+        return cls(
+            times=np.array([snapshot.time for snapshot in snapshots], dtype=float),
+            positions=positions,
+            velocities=velocities,
+            names=[ball.name for ball in last],
+            team_indices=np.array([ball.team_index for ball in last], dtype=np.int32),
+            active=active,
+        )
+
+    def max_divergence(self, other: "Trajectory") -> np.ndarray:
+        """Per-frame maximum position distance to `other`, computed in float64."""
+
+        delta = self.positions.astype(np.float64) - other.positions.astype(np.float64)
+        return np.sqrt((delta**2).sum(axis=-1)).max(axis=-1)
+
+
+def record_trajectory(scene: SceneConfig, precision: str | None = None) -> Trajectory:
+    """Simulate `scene` and return its full trajectory."""
+
+    return Trajectory.from_snapshots(simulate_frames(scene, precision=precision))
@@ -0,0 +1,239 @@
+"""Compare the trajectories of two physics backends over the same scene.
+
+The reference (`inhouse` by default) and the candidate are simulated from
+the same scene; the diff reports, for every frame, the largest position gap
+between balls active in both runs, the first frame where that gap exceeds a
+tolerance, and the events present in one run but not in the other (within a
+few frames): KOs, buff pickups and contacts, i.e. the ball/ball and
+ball/bumper pairs each backend reports touching (`SimulationSnapshot.contacts`).
+A solver regression that changes who hits whom shows up there even while
+positions stay within tolerance. `render_diff_video` puts both runs side by side.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from .buffs import BuffEvent
+from .outputs import OutputSpec, OutputWriter
+from .render import FrameRenderer, RenderSettings, _build_projection
+from .scene import SceneConfig
+from .simulation import KOEvent, SimulationSnapshot, bumper_contact, simulate_frames
+from .trajectory import Trajectory
+
+DEFAULT_TOLERANCE = 1e-3  # world units
+DEFAULT_EVENT_SLACK = 1  # frames an event may move before it counts as a mismatch
+SUMMARY_MISMATCHES = 20  # mismatches listed by `TrajectoryDiff.summary`
+
+
+@dataclass
+class EventMismatch:
+    """An event found in one run only; the missing side's frame is None."""
+
+    key: tuple[str, ...]  # ("ko", ball, hole), ("buff", kind, ball) or ("contact", ball, ball | bumper)
+    reference_frame: int | None
+    candidate_frame: int | None
+
+
+@dataclass
+class TrajectoryDiff:
+    """Outcome of a reference-vs-candidate comparison."""
+
+    reference: str
+    candidate: str
+    tolerance: float
+    divergence: np.ndarray  # (F,) max position gap per frame
+    event_mismatches: list[EventMismatch] = field(default_factory=list)
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.divergence.shape[0])
+
+    @property
+    def max_divergence(self) -> float:
+        return float(self.divergence.max()) if self.frame_count else 0.0
+
+    @property
+    def first_divergent_frame(self) -> int | None:
+        over = np.flatnonzero(self.divergence > self.tolerance)
+        return int(over[0]) if over.size else None
+
+    @property
+    def passed(self) -> bool:
+        return self.first_divergent_frame is None and not self.event_mismatches
+
+    def summary(self) -> str:
+        first = self.first_divergent_frame
+        lines = [
+            f"{self.candidate} vs {self.reference}: écart max {self.max_divergence:.3g} "
+            f"(tolérance {self.tolerance:g}), "
+            + ("aucune frame au-delà" if first is None else f"première frame au-delà: {first}"),
+        ]
+        for mismatch in self.event_mismatches[:SUMMARY_MISMATCHES]:
+            side = "référence" if mismatch.candidate_frame is None else "candidat"
+            frame = mismatch.reference_frame if mismatch.candidate_frame is None else mismatch.candidate_frame
+            lines.append(f"  événement {'/'.join(mismatch.key)} frame {frame}: seulement dans {side}")
+        hidden = len(self.event_mismatches) - SUMMARY_MISMATCHES
+        if hidden > 0:
+            lines.append(f"  … et {hidden} autres événements différents")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "reference": self.reference,
+            "candidate": self.candidate,
+            "tolerance": self.tolerance,
+            "frames": self.frame_count,
+            "max_divergence": self.max_divergence,
+            "first_divergent_frame": self.first_divergent_frame,
+            "event_mismatches": [
+                {"key": list(item.key), "reference_frame": item.reference_frame, "candidate_frame": item.candidate_frame}
+                for item in self.event_mismatches
+            ],
+            "passed": self.passed,
+        }
+
+
+def event_key(event: KOEvent | BuffEvent) -> tuple[str, ...]:
+    if isinstance(event, KOEvent):
+        return ("ko", event.ball_name, event.hole_id)
+    return ("buff", event.kind, event.ball_name)
+
+
+def contact_keys(snapshot: SimulationSnapshot) -> list[tuple[str, ...]]:
+    """`("contact", ball, other)` for every pair in `snapshot.contacts` (bumpers as "bumper<i>")."""
+
+    names = [ball.name for ball in snapshot.balls]
+    return [
+        ("contact", names[row], names[other] if other >= 0 else f"bumper{bumper_contact(other)}")
+        for row, other in snapshot.contacts.tolist()
+    ]
+
+
+def compare_snapshots(
+    reference: Sequence[SimulationSnapshot],
+    candidate: Sequence[SimulationSnapshot],
+    tolerance: float = DEFAULT_TOLERANCE,
+    event_slack: int = DEFAULT_EVENT_SLACK,
+    names: tuple[str, str] = ("reference", "candidate"),
+) -> TrajectoryDiff:
+    """Diff two captured runs of the same scene, frame by frame."""
+
+    frames = min(len(reference), len(candidate))
+    return TrajectoryDiff(
+        reference=names[0],
+        candidate=names[1],
+        tolerance=float(tolerance),
+        divergence=frame_divergence(
+            Trajectory.from_snapshots(reference[:frames]), Trajectory.from_snapshots(candidate[:frames])
+        )
+        if frames
+        else np.zeros(0),
+        event_mismatches=_match_events(reference[:frames], candidate[:frames], event_slack),
+    )
+
+
+def frame_divergence(reference: Trajectory, candidate: Trajectory) -> np.ndarray:
+    """Per-frame max distance between balls active in both trajectories.
+
+    Ball counts may differ (Life+ spawns): only the common columns are
+    compared, and a ball knocked out in one run only shows up as an event
+    mismatch rather than as a position gap.
+    """
+
+    count = min(reference.ball_count, candidate.ball_count)
+    delta = reference.positions[:, :count].astype(np.float64) - candidate.positions[:, :count].astype(np.float64)
+    distance = np.sqrt(np.einsum("fni,fni->fn", delta, delta))
+    both = np.ones(distance.shape, dtype=bool)
+    for trajectory in (reference, candidate):
+        if trajectory.active is not None:
+            both &= trajectory.active[:, :count]
+    return np.where(both, distance, 0.0).max(axis=1, initial=0.0)
+
+
+def diff_backends(
+    scene: SceneConfig,
+    candidate: str,
+    reference: str = "inhouse",
+    tolerance: float = DEFAULT_TOLERANCE,
+    event_slack: int = DEFAULT_EVENT_SLACK,
+    precision: str | None = None,
+) -> TrajectoryDiff:
+    """Simulate `scene` with both backends and diff the runs."""
+
+    return compare_snapshots(
+        list(simulate_frames(scene, precision=precision, backend=reference)),
+        list(simulate_frames(scene, precision=precision, backend=candidate)),
+        tolerance=tolerance,
+        event_slack=event_slack,
+        names=(reference, candidate),
+    )
+
+
+def render_diff_video(
+    scene: SceneConfig,
+    reference: Sequence[SimulationSnapshot],
+    candidate: Sequence[SimulationSnapshot],
+    output: str | Path,
+    diff: TrajectoryDiff,
+    settings: RenderSettings | None = None,
+) -> Path:
+    """Encode the reference (left) and the candidate (right) side by side.
+
+    The HUD banner names each backend; the candidate's also shows the frame's
+    divergence, flagged once it exceeds the tolerance.
+    """
+
+    settings = replace(settings or RenderSettings(frame_size=(540, 960)), hud=True)
+    projection = _build_projection(scene, settings)
+    left = FrameRenderer(scene, projection, settings, seed=scene.seed)
+    right = FrameRenderer(scene, projection, settings, seed=scene.seed)
+    width, height = settings.frame_size
+    canvas = np.empty((height, 2 * width, 3), dtype=np.uint8)
+    output = Path(output)
+    writer = OutputWriter(OutputSpec(output, codec=settings.codec), (2 * width, height), scene.frame_rate)
+    try:
+        for index in range(diff.frame_count):
+            gap = float(diff.divergence[index])
+            flag = "!" if gap > diff.tolerance else ""
+            canvas[:, :width] = left.render(reference[index], banner=diff.reference.upper())
+            canvas[:, width:] = right.render(candidate[index], banner=f"{diff.candidate.upper()} D={gap:.3g}{flag}")
+            writer.write(canvas)
+    finally:
+        writer.close()
+        left.close()
+        right.close()
+    return output
+
+
+def _match_events(
+    reference: Sequence[SimulationSnapshot], candidate: Sequence[SimulationSnapshot], slack: int
+) -> list[EventMismatch]:
+    """Pair equal events at most `slack` frames apart; return the unpaired ones."""
+
+    frames: dict[tuple[str, ...], tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+    for side, snapshots in enumerate((reference, candidate)):
+        for snapshot in snapshots:
+            for key in [*map(event_key, snapshot.events), *contact_keys(snapshot)]:
+                frames[key][side].append(snapshot.frame_index)
+
+    mismatches = []
+    for key, (left, right) in frames.items():
+        i = j = 0
+        while i < len(left) or j < len(right):
+            if i < len(left) and j < len(right) and abs(left[i] - right[j]) <= slack:
+                i += 1
+                j += 1
+            elif j >= len(right) or (i < len(left) and left[i] < right[j]):
+                mismatches.append(EventMismatch(key, left[i], None))
+                i += 1
+            else:
+                mismatches.append(EventMismatch(key, None, right[j]))
+                j += 1
+    mismatches.sort(key=lambda item: item.reference_frame if item.candidate_frame is None else item.candidate_frame)
+    return mismatches
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.backends import BACKENDS, create_backend
+from powerpit.scene import (
+    ArenaConfig,
+    BuffsConfig,
+    BuffTypeConfig,
+    BumperConfig,
+    HoleConfig,
+    PlayerConfig,
+    SceneConfig,
+    TeamConfig,
+    load_scene_config,
+)
+from powerpit.simulation import DT, KOEvent, simulate_frames
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _arena_scene(arena: ArenaConfig) -> SceneConfig:
+    teams = [
+        TeamConfig(
+            name="A",
+            color=(255, 0, 0),
+            players=[
+                PlayerConfig(name="A1", spawn=(2.0, 0.0), velocity=(6.0, 1.0)),
+                PlayerConfig(name="A2", spawn=(-2.0, 1.0), velocity=(-5.0, 2.0)),
+            ],
+        ),
+        TeamConfig(
+            name="B",
+            color=(0, 255, 0),
+            players=[
+                PlayerConfig(name="B1", spawn=(0.5, -2.0), velocity=(1.0, -6.0)),
+                PlayerConfig(name="B2", spawn=(-0.5, 2.5), velocity=(2.0, 5.0)),
+            ],
+        ),
+    ]
+    return SceneConfig(
+        name="Test",
+        duration_seconds=2.0,
+        frame_rate=30,
+        arena=arena,
+        teams=teams,
+        ball_radius=0.4,
+        ball_mass=1.0,
+        friction=0.999,
+        restitution=0.98,
+    )
+
+
+@pytest.mark.parametrize(
+    "arena",
+    [
+        ArenaConfig(type="circle", radius=5.0, bumpers=[BumperConfig(position=(0.0, 0.0), radius=0.6, restitution=1.35)]),
+        ArenaConfig(type="stadium", width=12.0, height=7.0, corner_radius=2.0),
+    ],
+)
+def test_vectorized_backend_matches_inhouse(arena: ArenaConfig) -> None:
+    scene = _arena_scene(arena)
+    reference = list(simulate_frames(scene, backend="inhouse"))
+    vectorized = list(simulate_frames(scene, backend="vectorized"))
+
+    # Few balls: the Jacobi contacts coincide with the pairwise ones, walls and bumpers are the same math.
+    for expected, actual in zip(reference, vectorized):
+        np.testing.assert_allclose(
+            [ball.position for ball in actual.balls], [ball.position for ball in expected.balls], atol=1e-9
+        )
+        assert actual.impulse == pytest.approx(expected.impulse)
+        np.testing.assert_array_equal(actual.contacts, expected.contacts)
+    assert sum(len(snapshot.contacts) for snapshot in reference) > 0
+
+
+def test_pymunk_backend_bounces_and_knocks_out() -> None:
+    pytest.importorskip("pymunk")
+    arena = ArenaConfig(type="circle", radius=5.0, holes=[HoleConfig(id="H1", angle=0.0, width=30.0)])
+    teams = [
+        TeamConfig(
+            name="A",
+            color=(255, 0, 0),
+            players=[
+                PlayerConfig(name="A1", spawn=(4.0, 0.0), velocity=(3.0, 0.0)),  # fast, facing the hole
+                PlayerConfig(name="A2", spawn=(-4.0, 0.0), velocity=(-3.0, 0.0)),  # fast, facing a wall
+            ],
+        ),
+        TeamConfig(
+            name="B",
+            color=(0, 255, 0),
+            players=[PlayerConfig(name="B1", spawn=(0.0, 4.0), velocity=(0.0, 0.0))],
+        ),
+    ]
+    scene = SceneConfig(
+        name="Test",
+        duration_seconds=0.5,
+        frame_rate=30,
+        arena=arena,
+        teams=teams,
+        ball_radius=0.4,
+        ball_mass=1.0,
+        friction=0.999,
+        restitution=0.98,
+        backend="pymunk",
+    )
+    snapshots = list(simulate_frames(scene))
+
+    kos = [event for snapshot in snapshots for event in snapshot.events if isinstance(event, KOEvent)]
+    assert [(event.ball_name, event.hole_id) for event in kos] == [("A1", "H1")]
+    assert snapshots[-1].scores == [0, 1]
+    bounced = snapshots[-1].balls[1]
+    assert bounced.active and bounced.velocity[0] > 0
+    assert np.linalg.norm(bounced.position) < arena.radius
+
+
+def test_pymunk_backend_pushes_only_the_buffed_bodies() -> None:
+    pymunk = pytest.importorskip("pymunk")
+    buffs = BuffsConfig(
+        types=[
+            BuffTypeConfig(kind="speed", weight=1.0, duration=0.5, factor=2.0, cap=3.0),
+            BuffTypeConfig(kind="mass", weight=1.0, duration=0.5, factor=1.5, cap=2.0),
+        ],
+        spawn_every=(100.0, 100.0),  # only the tokens placed below
+        max_tokens=2,
+    )
+    scene = dataclasses.replace(
+        _arena_scene(ArenaConfig(type="circle", radius=8.0)), friction=1.0, buffs=buffs, backend="pymunk"
+    )
+    sim = create_backend(scene)
+    system = sim._buffs
+    system.token_positions[:2] = [sim.positions[0], sim.positions[1]]
+    system.token_kinds[:2] = [0, 1]  # speed for A1, mass for A2
+
+    sim.step()
+    assert system.changed == [0, 1]
+    assert sim._bodies[1].mass == pytest.approx(1.5)
+    assert sim._bodies[2].position_func is pymunk.Body.update_position
+    start = sim.positions[0].copy()
+    sim.step()
+    assert system.changed == []
+    np.testing.assert_allclose(sim.positions[0] - start, 2.0 * DT * sim.velocities[0], rtol=1e-6)
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backends_agree_on_bundled_scene_outcome(backend: str) -> None:
+    if backend == "pymunk":
+        pytest.importorskip("pymunk")
+    scene = load_scene_config(ROOT / "scenes" / "circle_holes.yaml")
+    snapshots = list(simulate_frames(scene, backend=backend))
+
+    assert len(snapshots) == scene.frame_count
+    kos = [event for snapshot in snapshots for event in snapshot.events if isinstance(event, KOEvent)]
+    assert len(kos) == 3
+    contacts = np.concatenate([snapshot.contacts for snapshot in snapshots])
+    assert (contacts[:, 1] < 0).any() and (contacts[:, 1] > contacts[:, 0]).any()  # bumper and ball/ball
+
+
+def test_unknown_backend_is_rejected() -> None:
+    scene = _arena_scene(ArenaConfig(type="circle", radius=5.0))
+    with pytest.raises(ValueError):
+        create_backend(scene, backend="box2d")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.batch import BatchJob, BatchManifest, expand_jobs, run_batch
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _fake_runner(scene: str, seed: int | None, output: str) -> dict:
+    """Write the output and log each attempt; "crash" dies twice, "boom" raises."""
+
+    target = Path(output)
+    attempts = target.with_suffix(".attempts")
+    count = int(attempts.read_text()) + 1 if attempts.exists() else 1
+    attempts.write_text(str(count))
+    if scene == "crash" and count <= 2:
+        os._exit(3)
+    if scene == "always-crash":
+        os._exit(3)
+    if scene == "boom":
+        raise ValueError("scène cassée")
+    target.write_text(f"{scene}:{seed}", encoding="utf-8")
+    return {"sim_s": 0.5, "raster_s": 1.0, "encode_s": 0.25, "frames": 10, "output_bytes": 7, "peak_rss_mb": 42.0}
+
+
+def _sized_runner(scene: str, seed: int | None, output: str, resolution: int) -> dict:
+    Path(output).write_text(f"{scene}:{resolution}", encoding="utf-8")
+    return {"frames": 1}
+
+
+def _attempts(path: Path) -> int:
+    return int(path.with_suffix(".attempts").read_text())
+
+
+def test_batch_retries_crashes_and_resumes_from_the_manifest(tmp_path: Path) -> None:
+    jobs = [
+        BatchJob("ok", str(tmp_path / "ok.mp4"), seed=1),
+        BatchJob("crash", str(tmp_path / "crash.mp4")),
+        BatchJob("always-crash", str(tmp_path / "dead.mp4")),
+        BatchJob("boom", str(tmp_path / "boom.mp4")),
+    ]
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+
+    report = run_batch(jobs, manifest, workers=2, retries=2, runner=_fake_runner, warm=False)
+
+    assert (report.done, report.failed, report.skipped) == (2, 2, 0)
+    assert report.retries == 4  # two for "crash", two for "always-crash"
+    assert report.frames == 20 and report.sim_s == pytest.approx(1.0)
+    assert report.peak_rss_mb == 42.0
+    assert _attempts(tmp_path / "crash.mp4") == 3
+    assert _attempts(tmp_path / "dead.mp4") == 3  # 1 + retries, then given up
+    assert _attempts(tmp_path / "boom.mp4") == 1  # exceptions are not retried
+    states = {record["scene"]: record for record in manifest.load().values()}
+    assert {scene: record["status"] for scene, record in states.items()} == {
+        "ok": "done",
+        "crash": "done",
+        "always-crash": "failed",
+        "boom": "failed",
+    }
+    assert "scène cassée" in states["boom"]["error"]
+    assert states["ok"]["raster_s"] == 1.0
+
+    # A restart skips completed clips, keeps failures, and re-renders a deleted output.
+    (tmp_path / "ok.mp4").unlink()
+    report = run_batch(jobs, manifest, workers=2, runner=_fake_runner, warm=False)
+    assert (report.rendered, report.skipped, report.failed) == (1, 1, 2)
+    assert _attempts(tmp_path / "ok.mp4") == 2
+    assert _attempts(tmp_path / "crash.mp4") == 3
+
+
+def test_interrupted_run_resumes_with_its_attempt_counted(tmp_path: Path) -> None:
+    job = BatchJob("ok", str(tmp_path / "ok.mp4"))
+    path = tmp_path / "manifest.jsonl"
+    BatchManifest(path).record(job, "running", 1)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"id": "cut sh')  # line torn by the crash of the batch itself
+    manifest = BatchManifest(path)
+
+    report = run_batch([job], manifest, workers=1, retries=0, runner=_fake_runner, warm=False)
+    assert report.failed == 1 and not (tmp_path / "ok.mp4").exists()
+
+    report = run_batch([job], manifest, workers=1, retries=0, runner=_fake_runner, warm=False, retry_failed=True)
+    assert report.rendered == 1
+    assert manifest.load()[job.id]["attempt"] == 1
+
+
+def test_rerun_with_other_options_renders_again(tmp_path: Path) -> None:
+    jobs = [BatchJob("a", str(tmp_path / "a.mp4"))]
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+
+    def run(resolution: int):
+        options = {"resolution": resolution}
+        return run_batch(jobs, manifest, workers=1, runner=_sized_runner, warm=False, options=options)
+
+    assert run(540).rendered == 1
+    assert run(540).skipped == 1
+    assert run(1080).rendered == 1  # same scene, seed and output, but another clip
+    assert (tmp_path / "a.mp4").read_text(encoding="utf-8") == "a:1080"
+    assert manifest.load()[jobs[0].id]["options"] == {"resolution": 1080}
+
+
+def test_expand_jobs_names_outputs_after_scene_and_seed(tmp_path: Path) -> None:
+    jobs = expand_jobs(["scenes/a.yaml", "scenes/b.yaml"], [1, 2], tmp_path)
+
+    assert [Path(job.output).name for job in jobs] == ["a_s1.mp4", "a_s2.mp4", "b_s1.mp4", "b_s2.mp4"]
+    assert len({job.id for job in jobs}) == 4
+    assert expand_jobs(["scenes/a.yaml"], [1], tmp_path)[0].id == jobs[0].id
+
+
+def test_default_runner_records_render_metrics(tmp_path: Path) -> None:
+    scene = tmp_path / "short.yaml"
+    text = (ROOT / "scenes" / "circle_basic.yaml").read_text(encoding="utf-8")
+    scene.write_text(text.replace("duration_seconds: 12", "duration_seconds: 0.2"), encoding="utf-8")
+    manifest = tmp_path / "manifest.jsonl"
+
+    report = run_batch(expand_jobs([scene], [3], tmp_path), manifest, workers=1, options={"resolution": 96})
+
+    assert report.done == 1, report
+    record = json.loads(manifest.read_text(encoding="utf-8").splitlines()[-1])
+    assert record["status"] == "done"
+    assert record["frames"] == 6
+    assert record["output_bytes"] == (tmp_path / "short_s3.mp4").stat().st_size > 0
+    assert record["peak_rss_mb"] > 0
+    assert all(record[key] > 0 for key in ("sim_s", "raster_s", "encode_s"))
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit import render
+from powerpit import cache as cache_module
+from powerpit.cache import RenderCache, render_key, source_fingerprint
+from powerpit.render import RenderSettings, render_scene
+from powerpit.scene import load_scene_config
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _short_scene(tmp_path: Path):
+    text = (ROOT / "scenes" / "circle_basic.yaml").read_text(encoding="utf-8")
+    path = tmp_path / "short.yaml"
+    path.write_text(text.replace("duration_seconds: 12", "duration_seconds: 0.1"), encoding="utf-8")
+    return load_scene_config(path)
+
+
+def test_render_key_tracks_scene_seed_and_settings(tmp_path: Path) -> None:
+    scene = _short_scene(tmp_path)
+    settings = RenderSettings()
+    key = render_key(scene, 42, settings)
+
+    assert key == render_key(_short_scene(tmp_path), 42, RenderSettings())
+    assert key != render_key(scene, 43, settings)
+    assert key != render_key(dataclasses.replace(scene, friction=0.99), 42, settings)
+    assert key != render_key(scene, 42, RenderSettings(frame_size=(640, 360)))
+    assert render_key(scene, None, settings) == render_key(scene, 0, settings)
+
+
+def test_render_key_tracks_package_sources(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scene = _short_scene(tmp_path)
+    key = render_key(scene, 42, RenderSettings())
+    assert source_fingerprint() == source_fingerprint()  # computed once
+
+    monkeypatch.setattr(cache_module, "source_fingerprint", lambda: "edited")
+    assert render_key(scene, 42, RenderSettings()) != key
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = RenderCache(tmp_path / "cache", max_bytes=25)
+    for name in ("a", "b", "c"):
+        clip = tmp_path / f"{name}.mp4"
+        clip.write_bytes(b"x" * 10)
+        cache.store(name * 64, clip)
+        if name == "b":
+            assert cache.fetch("a" * 64, tmp_path / "again.mp4")
+
+    entries = cache.entries()
+    assert set(entries) == {"a" * 64, "c" * 64}
+    assert cache.total_bytes == 20
+    assert not cache.fetch("b" * 64, tmp_path / "missing.mp4")
+
+
+def test_render_scene_reuses_cached_clip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scene = _short_scene(tmp_path)
+    cache = RenderCache(tmp_path / "cache")
+    settings = RenderSettings(frame_size=(320, 180))
+
+    first = render_scene(scene, tmp_path / "first.mp4", seed=1, settings=settings, cache=cache)
+    assert len(cache.entries()) == 1
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("la simulation ne doit pas être relancée")
+
+    monkeypatch.setattr(render, "simulate_frames", _fail)
+    second = render_scene(scene, tmp_path / "second.mp4", seed=1, settings=settings, cache=cache)
+    assert second.read_bytes() == first.read_bytes()
+    assert cache.entries()[render_key(scene, 1, settings)]["hits"] == 1
+
+    with pytest.raises(AssertionError):
+        render_scene(scene, tmp_path / "third.mp4", seed=2, settings=settings, cache=cache)
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
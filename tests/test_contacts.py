@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.contacts import broadphase_pairs, solve_contacts_jacobi
+from powerpit.scene import ArenaConfig, PlayerConfig, SceneConfig, TeamConfig
+from powerpit.simulation import Simulation
+
+
+def _pile(solver: str, iterations: int = 4) -> SceneConfig:
+    # A tight hexagonal pile squeezed inward: every ball touches several others.
+    players = []
+    for row in range(-4, 5):
+        for col in range(-4, 5):
+            x = (col + 0.5 * (row % 2)) * 0.78
+            y = row * 0.78 * np.sqrt(3) / 2
+            players.append(PlayerConfig(name=f"P{len(players)}", spawn=(x, y), velocity=(-x, -y)))
+    return SceneConfig(
+        name="Pile",
+        duration_seconds=1.0,
+        frame_rate=30,
+        arena=ArenaConfig(type="circle", radius=8.0),
+        teams=[TeamConfig(name="A", color=(255, 0, 0), players=players)],
+        ball_radius=0.4,
+        ball_mass=1.0,
+        friction=0.995,
+        restitution=0.5,
+        solver=solver,
+        solver_iterations=iterations,
+    )
+
+
+def _max_overlap(simulation: Simulation) -> float:
+    delta = simulation.positions[:, None] - simulation.positions[None]
+    dist = np.sqrt((delta**2).sum(axis=-1))
+    np.fill_diagonal(dist, np.inf)
+    return float(max(0.0, 2 * simulation.scene.ball_radius - dist.min()))
+
+
+def test_broadphase_finds_every_touching_pair_once() -> None:
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(-5, 5, size=(400, 2))
+    indices = np.arange(0, 400, 2)  # inactive balls are left out
+    first, second = broadphase_pairs(positions, indices, cell=0.8)
+
+    found = {tuple(sorted(pair)) for pair in zip(first.tolist(), second.tolist())}
+    assert len(found) == first.size  # no duplicate
+    delta = positions[indices, None] - positions[None, indices]
+    close = np.argwhere(np.triu(np.sqrt((delta**2).sum(axis=-1)) < 0.8, k=1))
+    expected = {tuple(sorted((int(indices[i]), int(indices[j])))) for i, j in close}
+    assert expected <= found
+
+
+def test_jacobi_head_on_collision_matches_the_sequential_solver() -> None:
+    positions = np.array([[-0.39, 0.0], [0.39, 0.0]])
+    velocities = np.array([[2.0, 0.0], [-2.0, 0.0]])
+    peak = solve_contacts_jacobi(
+        positions, velocities, np.ones(2), np.array([0]), np.array([1]), 0.4, restitution=1.0, iterations=4
+    )
+    np.testing.assert_allclose(velocities, [[-2.0, 0.0], [2.0, 0.0]])
+    np.testing.assert_allclose(positions, [[-0.4, 0.0], [0.4, 0.0]])
+    assert peak == pytest.approx(4.0)
+
+
+def test_jacobi_iterations_keep_dense_piles_apart() -> None:
+    overlaps = {}
+    for iterations in (1, 8):
+        simulation = Simulation(_pile("jacobi", iterations))
+        for _ in range(60):
+            simulation.step()
+        overlaps[iterations] = _max_overlap(simulation)
+    assert overlaps[8] < overlaps[1] / 2
+    assert overlaps[8] < 0.02
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+import imageio.v3 as iio
+import numpy as np
+import pytest
+from PIL import Image
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.highlights import HighlightConfig, score_frames, select_highlights
+from powerpit.render import RenderSettings, render_scene
+from powerpit.scene import ArenaConfig, PlayerConfig, SceneConfig, TeamConfig, load_scene_config
+from powerpit.simulation import simulate_frames
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_near_miss_scores_fast_balls_skimming_the_wall() -> None:
+    players = [
+        # Tangent to the wall 0.2 units away from touching it, then closing in: a fast skim.
+        PlayerConfig(name="A1", spawn=(0.0, -4.4), velocity=(6.0, 0.0)),
+        PlayerConfig(name="A2", spawn=(0.0, 0.0), velocity=(0.0, 0.0)),
+    ]
+    scene = SceneConfig(
+        name="Skim",
+        duration_seconds=0.1,
+        frame_rate=30,
+        arena=ArenaConfig(type="circle", radius=5.0),
+        teams=[TeamConfig(name="A", color=(255, 0, 0), players=players)],
+        ball_radius=0.4,
+        ball_mass=1.0,
+        friction=1.0,
+        restitution=1.0,
+    )
+    scores = score_frames(scene, simulate_frames(scene))  # streamed: no snapshot list needed
+
+    assert (np.diff(scores.near_miss) > 0).all()
+    assert scores.near_miss[-1] == pytest.approx(1.0)
+    assert (scores.impulse == 0).all()
+    assert scores.reason(len(scores.near_miss) - 1) == "near-miss"
+
+
+def test_select_highlights_prefers_knockouts_and_spaces_thumbnails() -> None:
+    scene = load_scene_config(ROOT / "scenes" / "circle_holes.yaml")
+    snapshots = list(simulate_frames(scene))
+    plan = select_highlights(scene, snapshots, HighlightConfig(thumbnails=3, duration=3.0, min_gap=1.0))
+
+    ko_frames = np.flatnonzero(plan.scores.knockouts)
+    assert ko_frames.size
+    assert plan.scores.reason(plan.thumbnails[0]) == "ko" or ko_frames[0] in plan.thumbnails
+    assert all(b - a >= scene.frame_rate for a, b in zip(plan.thumbnails, plan.thumbnails[1:]))
+    start, stop = plan.highlight
+    assert stop - start == 90
+    assert all(start <= frame < stop for frame in ko_frames)
+
+
+def test_render_scene_writes_thumbnails_and_highlight_in_the_same_pass(tmp_path: Path) -> None:
+    scene = load_scene_config(ROOT / "scenes" / "circle_holes.yaml")
+    scene = dataclasses.replace(scene, duration_seconds=3.0)
+    settings = RenderSettings(frame_size=(96, 160))
+    config = HighlightConfig(thumbnails=2, thumbnail_format="webp", thumbnail_size=(48, 80), duration=1.0)
+
+    render_scene(scene, tmp_path / "clip.mp4", settings=settings, highlights=config)
+
+    report = json.loads((tmp_path / "clip_highlights.json").read_text(encoding="utf-8"))
+    paths = [Path(entry["path"]) for entry in report["thumbnails"]]
+    assert [path.name for path in paths] == ["clip_thumb1.webp", "clip_thumb2.webp"]
+    for path in paths:
+        assert Image.open(path).size == (48, 80)
+    assert Path(report["highlight"]["path"]).name == "clip_highlight.mp4"
+    start, stop = report["highlight"]["frames"]
+    assert stop - start == 30
+    assert report["highlight"]["output_frames"] == [start, stop]  # no hitstop/replay: same clock
+    assert iio.imread(tmp_path / "clip_highlight.mp4").shape[0] == 30
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
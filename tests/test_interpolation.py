@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.interpolation import hermite, interpolate_snapshot
+from powerpit.profiling import RenderProfiler
+from powerpit.render import RenderSettings, render_scene
+from powerpit.scene import ArenaConfig, PlayerConfig, SceneConfig, TeamConfig
+from powerpit.simulation import simulate_frames
+
+
+def _scene(velocity: tuple[float, float] = (1.5, 0.5)) -> SceneConfig:
+    return SceneConfig(
+        name="Interpolation",
+        duration_seconds=1.0,
+        frame_rate=30,
+        arena=ArenaConfig(type="circle", radius=5.0),
+        teams=[
+            TeamConfig(
+                name="A",
+                color=(255, 0, 0),
+                players=[PlayerConfig(name="A1", spawn=(-1.0, 0.0), velocity=velocity)],
+            )
+        ],
+        ball_radius=0.5,
+        ball_mass=1.0,
+        friction=1.0,
+        restitution=1.0,
+    )
+
+
+def test_hermite_matches_end_states_and_follows_accelerated_motion() -> None:
+    # x(t) = 1 + 2t - 3t², sampled at t=0 and t=0.5: a cubic fit is exact.
+    p0, v0 = np.array([1.0]), np.array([2.0])
+    p1, v1 = np.array([1.25]), np.array([-1.0])
+    u = np.array([0.0, 0.3, 1.0])[:, None]
+    positions, velocities = hermite(p0, v0, p1, v1, 0.5, u)
+    t = 0.5 * u
+    np.testing.assert_allclose(positions, 1 + 2 * t - 3 * t * t)
+    np.testing.assert_allclose(velocities, 2 - 6 * t)
+
+
+def test_interpolated_snapshot_lies_between_captures() -> None:
+    before, after = list(simulate_frames(_scene()))[:2]
+    middle = interpolate_snapshot(before, after, 0.5)
+    assert middle.time == pytest.approx((before.time + after.time) / 2)
+    np.testing.assert_allclose(middle.balls[0].position, (before.balls[0].position + after.balls[0].position) / 2)
+    np.testing.assert_allclose(middle.balls[0].velocity, after.balls[0].velocity)
+
+
+def test_interpolated_output_doubles_frames_without_extra_physics(tmp_path: Path) -> None:
+    scene = _scene()
+    profiler = RenderProfiler()
+    settings = RenderSettings(frame_size=(160, 120), interpolate=2)
+    render_scene(scene, tmp_path / "smooth.mp4", settings=settings, profiler=profiler)
+
+    reader = imageio.get_reader(tmp_path / "smooth.mp4")
+    assert reader.get_meta_data()["fps"] == 60
+    assert reader.count_frames() == 2 * scene.frame_count - 1
+    assert profiler.stages["simulation"].calls == scene.frame_count + 1
+    assert profiler.counters["interpolated_frames"] == scene.frame_count - 1
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.live import LiveSession, SceneWatcher
+from powerpit.render import RenderSettings
+from powerpit.scene import load_scene_config
+from powerpit.simulation import simulate_frames
+
+ROOT = Path(__file__).resolve().parents[1]
+SETTINGS = RenderSettings(frame_size=(96, 160))
+
+
+def _positions(snapshot) -> np.ndarray:
+    return np.stack([ball.position for ball in snapshot.balls])
+
+
+def test_seek_from_checkpoints_matches_a_straight_run() -> None:
+    # Buff tokens come from an RNG stream: checkpoints must carry its state too.
+    scene = load_scene_config(ROOT / "scenes" / "circle_buffs.yaml", seed=4)
+    reference = list(simulate_frames(scene))
+    session = LiveSession(scene, SETTINGS, checkpoint_interval=0.5)
+
+    for frame in (200, 37, 150, 151, 0):
+        snapshot = session.seek(frame)
+        assert snapshot is not None and snapshot.frame_index == frame
+        np.testing.assert_array_equal(_positions(snapshot), _positions(reference[frame]))
+        assert snapshot.scores == reference[frame].scores
+        assert snapshot.tokens == reference[frame].tokens
+
+    counters = session.profiler.counters
+    # Going back never re-simulates from frame 0: at most one interval per seek.
+    assert counters["live_simulated_frames"] <= 201 + 2 * 15 + 1
+    assert counters["live_checkpoint_restores"] >= 2
+
+
+def test_backends_without_checkpoints_seek_by_simulating_again() -> None:
+    pytest.importorskip("pymunk")
+    scene = dataclasses.replace(load_scene_config(ROOT / "scenes" / "circle_holes.yaml"), backend="pymunk")
+    reference = list(simulate_frames(scene))
+    session = LiveSession(scene, SETTINGS, checkpoint_interval=0.5)
+
+    for frame in (60, 20):
+        snapshot = session.seek(frame)
+        assert snapshot is not None
+        np.testing.assert_array_equal(_positions(snapshot), _positions(reference[frame]))
+    assert session.checkpoints == {}
+    assert session.profiler.counters["live_simulated_frames"] == 61 + 21
+
+
+def test_reload_rebuilds_only_what_the_edit_touches() -> None:
+    scene = load_scene_config(ROOT / "scenes" / "circle_holes.yaml")
+    session = LiveSession(scene, SETTINGS)
+    session.seek(90)
+    background = session.renderer.background
+    checkpoints = dict(session.checkpoints)
+
+    recolored = dataclasses.replace(
+        scene, teams=[dataclasses.replace(scene.teams[0], color=(0, 255, 0)), *scene.teams[1:]]
+    )
+    assert session.reload(recolored) == "visual"
+    assert session.checkpoints == checkpoints and session.frame == 90
+    assert session.renderer.background is background
+    frame = session.render()
+    assert ((frame[..., 1] > 200) & (frame[..., 0] < 80) & (frame[..., 2] < 80)).any()  # team A drawn green
+
+    slower = dataclasses.replace(recolored, friction=0.99)
+    assert session.reload(slower) == "physics"
+    assert session.frame == 90  # caught up with the playhead
+    assert session.renderer.background is background
+    expected = list(simulate_frames(slower))[90]
+    np.testing.assert_array_equal(_positions(session.snapshot), _positions(expected))
+
+    assert scene.arena.radius is not None
+    wider = dataclasses.replace(slower, arena=dataclasses.replace(scene.arena, radius=scene.arena.radius * 1.1))
+    assert session.reload(wider) == "arena"
+    assert session.renderer.background is not background
+
+
+def test_scene_watcher_reports_each_edit_once(tmp_path: Path) -> None:
+    path = tmp_path / "scene.yaml"
+    path.write_text("name: a\n", encoding="utf-8")
+    watcher = SceneWatcher(path)
+    assert not watcher.changed()
+
+    path.write_text("name: b\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert watcher.changed()
+    assert not watcher.changed()
+
+    path.unlink()  # editors often replace the file: a missing file is not an edit
+    assert not watcher.changed()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.framestore import FrameStore, FrameStoreError
+from powerpit.outputs import OutputFanout, OutputSpec, OutputSpecError, parse_output_spec
+
+
+def test_parse_output_spec_options() -> None:
+    spec = parse_output_spec("out/thumb.webp,size=270x480,fps=10,frames=0-90")
+    assert spec == OutputSpec(Path("out/thumb.webp"), size=(270, 480), fps=10, frames=(0, 90))
+    assert spec.is_animated_image
+    with pytest.raises(OutputSpecError):
+        parse_output_spec("out/clip.mp4,scale=2")
+    with pytest.raises(OutputSpecError):
+        parse_output_spec("out/clip.mp4,size=big")
+
+
+def test_fanout_encodes_ranges_rates_and_shared_downscales(tmp_path: Path) -> None:
+    frame_rate = 30
+    specs = [
+        OutputSpec(tmp_path / "master.gif"),
+        OutputSpec(tmp_path / "half.gif", size=(32, 24)),
+        OutputSpec(tmp_path / "quarter.gif", size=(16, 12), fps=10, frames=(6, 18)),
+    ]
+    fanout = OutputFanout(specs, (64, 48), frame_rate)
+    for index in range(30):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        frame[:, :32] = 200  # left half bright, right half dark
+        frame[:4, 32:] = index * 8  # distinct frames (GIF merges duplicates)
+        fanout.write(index, frame)
+    fanout.close()
+
+    assert [writer.frames_written for writer in fanout.writers] == [30, 30, 4]
+    quarter = imageio.mimread(tmp_path / "quarter.gif")
+    assert len(quarter) == 4
+    assert quarter[0].shape[:2] == (12, 16)
+    # Exact box filter: both halves keep their value after two shared 2× steps.
+    assert int(quarter[0][6, 2, 0]) == 200
+    assert int(quarter[0][6, 13, 0]) == 0
+
+
+def _solid(color: tuple[int, int, int], size: tuple[int, int] = (8, 6)) -> np.ndarray:
+    frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    frame[...] = color
+    return frame
+
+
+def test_y4m_output_writes_limited_range_420_frames(tmp_path: Path) -> None:
+    fanout = OutputFanout([OutputSpec(tmp_path / "clip.y4m")], (8, 6), 30)
+    for index, color in enumerate([(0, 0, 0), (255, 255, 255), (255, 0, 0)]):
+        fanout.write(index, _solid(color))
+    fanout.close()
+
+    data = (tmp_path / "clip.y4m").read_bytes()
+    header, _, body = data.partition(b"\n")
+    assert header.split()[:4] == [b"YUV4MPEG2", b"W8", b"H6", b"F30:1"]
+    plane = 8 * 6
+    frame_bytes = len(b"FRAME\n") + plane + 2 * (plane // 4)
+    assert len(body) == 3 * frame_bytes
+    frames = [body[i * frame_bytes : (i + 1) * frame_bytes] for i in range(3)]
+    assert all(frame.startswith(b"FRAME\n") for frame in frames)
+    luma = [frame[6] for frame in frames]
+    assert luma[:2] == [16, 235]
+    red_cr = frames[2][6 + plane + plane // 4]
+    assert red_cr == 240
+
+
+def test_frame_store_is_readable_zero_copy_while_written(tmp_path: Path) -> None:
+    path = tmp_path / "clip.frames"
+    # Every other frame of [4, 24): 10 slots, sized from the spec's own range.
+    fanout = OutputFanout([OutputSpec(path, fps=15, frames=(4, 24))], (8, 6), 30)
+    writer = fanout.writers[0].store
+    assert writer is not None and writer.capacity == 11
+
+    seen: list[tuple[int, int]] = []
+
+    def consume() -> None:
+        reader = FrameStore.open(path)
+        slot = 0
+        while reader.wait(slot, timeout=5.0):
+            frame = reader.frame(slot)
+            assert not frame.flags.owndata and not frame.flags.writeable  # a view of the mapping
+            seen.append((int(reader.index[slot]), int(frame[0, 0, 0])))
+            slot += 1
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    for index in range(30):
+        fanout.write(index, _solid((index, 0, 0)))
+    fanout.close()
+    consumer.join(timeout=10.0)
+
+    assert seen == [(index, index) for index in range(4, 24, 2)]
+    store = FrameStore.open(path)
+    assert store.complete and store.ready == 10
+    assert store.frames.shape == (10, 6, 8, 3)
+    with pytest.raises(FrameStoreError):
+        store.frame(10)
+
+
+def test_frame_store_needs_a_frame_count(tmp_path: Path) -> None:
+    with pytest.raises(OutputSpecError):
+        OutputFanout([OutputSpec(tmp_path / "clip.frames")], (8, 6), 30)
+    fanout = OutputFanout([OutputSpec(tmp_path / "clip.frames")], (8, 6), 30, frame_count=3)
+    for index in range(5):  # frames beyond the capacity are dropped
+        fanout.write(index, _solid((index, 0, 0)))
+    fanout.close()
+    assert fanout.writers[0].frames_written == 3
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.preview import LatestFrameMailbox, downscale_step
+
+
+def test_mailbox_keeps_only_latest_frame() -> None:
+    mailbox = LatestFrameMailbox()
+    for value in range(5):
+        mailbox.put(np.full((2, 2, 3), value, dtype=np.uint8))
+
+    frame = mailbox.take(timeout=0)
+    assert frame is not None
+    assert int(frame[0, 0, 0]) == 4
+    assert mailbox.dropped == 4
+    assert mailbox.take(timeout=0) is None
+
+
+def test_mailbox_close_wakes_reader() -> None:
+    mailbox = LatestFrameMailbox()
+    result: list[object] = []
+    reader = threading.Thread(target=lambda: result.append(mailbox.take(timeout=5.0)))
+    reader.start()
+    mailbox.close()
+    reader.join(timeout=1.0)
+
+    assert not reader.is_alive()
+    assert result == [None]
+    mailbox.put(np.zeros((1, 1, 3), dtype=np.uint8))
+    assert mailbox.posted == 0
+
+
+def test_downscale_step_fits_bounding_box() -> None:
+    assert downscale_step((1080, 1920), (540, 960)) == 2
+    assert downscale_step((1920, 1080), (540, 960)) == 4
+    assert downscale_step((320, 240), (540, 960)) == 1
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    import pytest
+
+    raise SystemExit(pytest.main([__file__]))
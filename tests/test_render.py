@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.render import (
+    BACKGROUND_COLOR,
+    FRAME_SIZE,
+    FrameRenderer,
+    JuiceStage,
+    RenderSettings,
+    _build_projection,
+    frame_size_for,
+    render_scene,
+)
+from powerpit.effects import TrailLayer
+from powerpit.profiling import RenderProfiler
+from powerpit.raster import build_ball_sprite
+from powerpit.scene import ArenaConfig, PlayerConfig, SceneConfig, TeamConfig
+from powerpit.simulation import Simulation
+
+SMALL = RenderSettings(frame_size=(320, 240))
+
+
+def _scene(velocity: tuple[float, float] = (0.0, 0.0)) -> SceneConfig:
+    return SceneConfig(
+        name="Render",
+        duration_seconds=1.0,
+        frame_rate=30,
+        arena=ArenaConfig(type="circle", radius=5.0),
+        teams=[
+            TeamConfig(
+                name="A",
+                color=(255, 0, 0),
+                players=[PlayerConfig(name="A1", spawn=(-2.0, 0.0), velocity=velocity)],
+            )
+        ],
+        ball_radius=0.5,
+        ball_mass=1.0,
+        friction=1.0,
+        restitution=1.0,
+    )
+
+
+def _pixel(scene: SceneConfig, settings: RenderSettings, x: float, y: float) -> tuple[int, int]:
+    projection = _build_projection(scene, settings)
+    cx, cy = projection.offset
+    return int(round(cy - y * projection.scale)), int(round(cx + x * projection.scale))
+
+
+def test_ball_sprite_is_drawn_at_projected_position() -> None:
+    scene = _scene()
+    renderer = FrameRenderer(scene, _build_projection(scene, SMALL), SMALL)
+    frame = renderer.render(Simulation(scene).capture(0))
+
+    row, col = _pixel(scene, SMALL, -2.0, 0.0)
+    assert frame.shape == (240, 320, 3)
+    assert tuple(frame[row, col]) == (255, 0, 0)
+    assert tuple(frame[5, 5]) == BACKGROUND_COLOR
+
+
+def test_projection_follows_resolution_orientation_and_supersampling() -> None:
+    scene = _scene()
+    assert FRAME_SIZE == frame_size_for(1080, "vertical") == (1080, 1920)
+    assert frame_size_for(540, "horizontal") == (960, 540)
+
+    full = _build_projection(scene, RenderSettings())
+    draft = _build_projection(scene, RenderSettings(frame_size=frame_size_for(540)))
+    assert draft.scale == pytest.approx(full.scale / 2)
+    assert draft.arena_line_px == full.arena_line_px // 2
+
+    settings = RenderSettings(frame_size=(160, 120), supersample=2)
+    projection = _build_projection(scene, settings)
+    assert projection.frame_size == (320, 240)
+    frame = FrameRenderer(scene, projection, settings).render(Simulation(scene).capture(0))
+    assert frame.shape == (120, 160, 3)
+    row, col = _pixel(scene, settings, -2.0, 0.0)
+    assert tuple(frame[row // 2, col // 2]) == (255, 0, 0)
+
+
+def test_trails_fade_exponentially_behind_moving_ball() -> None:
+    scene = _scene(velocity=(60.0, 0.0))
+    settings = RenderSettings(frame_size=(320, 240), trails=True, trail_decay=0.5, trail_strength=0.5)
+    renderer = FrameRenderer(scene, _build_projection(scene, settings), settings)
+    simulation = Simulation(scene)
+
+    frames = []
+    for index in range(3):
+        frames.append(renderer.render(simulation.capture(index)))
+        for _ in range(4):
+            simulation.step()
+
+    row, col = _pixel(scene, settings, -2.0, 0.0)
+    # The ball left its spawn: only the decaying trail remains there.
+    first_trail = int(frames[1][row, col, 0]) - BACKGROUND_COLOR[0]
+    second_trail = int(frames[2][row, col, 0]) - BACKGROUND_COLOR[0]
+    assert first_trail == pytest.approx(255 * 0.5 * 0.5, abs=2)
+    assert second_trail == pytest.approx(first_trail * 0.5, abs=2)
+    assert renderer.trails is not None
+    assert renderer.trails.buffer.dtype == np.float32
+
+
+def test_trail_of_a_resting_ball_fades_out_before_its_region_is_dropped() -> None:
+    sprite = build_ball_sprite((255, 255, 255), 6.0)
+    trails = TrailLayer((64, 64), decay=0.9, strength=0.35)
+    for _ in range(200):  # the buffer saturates at 255 * 0.35 / (1 - 0.9)
+        trails.update([(sprite, 20, 20)])
+    assert trails.buffer.max() > 255.0
+
+    while trails.region is not None:
+        remaining = float(trails.buffer.max())
+        trails.update([])
+    assert remaining < 1.0  # nothing visible was cut off
+
+
+def test_glow_brightens_surroundings_and_reports_cost() -> None:
+    scene = _scene()
+    settings = RenderSettings(frame_size=(320, 240), glow=True, glow_downsample=4)
+    plain = FrameRenderer(scene, _build_projection(scene, SMALL), SMALL)
+    glowing = FrameRenderer(scene, _build_projection(scene, settings), settings)
+    snapshot = Simulation(scene).capture(0)
+    base = plain.render(snapshot)
+    frame = glowing.render(snapshot)
+
+    row, col = _pixel(scene, settings, -2.0, 0.0)
+    radius_px = int(0.5 * _build_projection(scene, settings).scale)
+    halo = (row, col + radius_px + 4)
+    assert frame[halo][0] > base[halo][0]
+    assert (frame.astype(np.int16) >= base).all()
+    # The static glow is baked once into the cached background.
+    assert glowing.profiler.stages["glow_static"].calls == 1
+    moved = Simulation(scene).capture(1)
+    moved.balls[0].position[0] += 1.0
+    glowing.render(moved)
+    assert glowing.profiler.stages["glow"].calls == 2
+    assert 0 < glowing.profiler.counters["glow_pixels"] < 2 * 320 * 240
+
+
+def test_static_frames_are_reused_and_settled_clips_end_early(tmp_path: Path) -> None:
+    scene = _scene()
+    settings = RenderSettings(frame_size=(160, 120), hud=True)
+    renderer = FrameRenderer(scene, _build_projection(scene, settings), settings)
+    simulation = Simulation(scene)
+    first = renderer.render(simulation.capture(0))
+    assert renderer.render(simulation.capture(1)) is first
+    assert renderer.profiler.counters["static_frames"] == 1
+    ticking = simulation.capture(2)
+    ticking.time = 1.0  # the HUD timer changes: the frame is rasterized again
+    assert renderer.render(ticking) is not first
+
+    settings = RenderSettings(frame_size=(160, 120), settle_after=0.2)
+    profiler = RenderProfiler()
+    render_scene(scene, tmp_path / "settled.mp4", settings=settings, profiler=profiler)
+    frames = imageio.mimread(tmp_path / "settled.mp4")
+    assert len(frames) == 6 < scene.frame_count
+    assert profiler.counters["static_frames"] == 5
+
+
+def test_hud_recomposes_only_when_text_changes() -> None:
+    scene = _scene()
+    settings = RenderSettings(frame_size=(320, 240), hud=True)
+    renderer = FrameRenderer(scene, _build_projection(scene, settings), settings, seed=7)
+    simulation = Simulation(scene)
+    assert renderer.hud is not None
+
+    frame = renderer.render(simulation.capture(0))
+    initial = renderer.hud.recompositions  # arena, seed, timer, scores
+    assert initial == 4
+    assert (frame[:30] != BACKGROUND_COLOR).any()
+
+    snapshot = simulation.capture(1)
+    snapshot.time = 0.5  # same displayed second
+    renderer.render(snapshot)
+    assert renderer.hud.recompositions == initial
+    snapshot.time = 1.0  # the timer ticks down
+    renderer.render(snapshot)
+    assert renderer.hud.recompositions == initial + 1
+
+
+def test_hitstop_repeats_buffer_and_shake_shifts_a_padded_view() -> None:
+    settings = RenderSettings(frame_size=(108, 192), hitstop=0.1, shake=10.0, shake_max=50.0)
+    juice = JuiceStage(settings, frame_rate=30)
+    assert juice.hold_frames == 3 and juice.pad == 5
+    frame = np.zeros((192, 108, 3), dtype=np.uint8)
+    frame[90:100, 50:60] = 255
+
+    calm, hold = juice.process(frame, impulse=1.0)
+    assert hold == 0
+    shaken, hold = juice.process(frame, impulse=8.0)
+    assert hold == 3  # the caller re-sends `shaken` itself three more times
+    assert shaken.shape == frame.shape and np.shares_memory(shaken, juice._canvas)
+    assert not np.array_equal(shaken, frame)
+    ys, xs = np.nonzero(shaken[..., 0] == 255)
+    assert max(abs(ys.min() - 90), abs(xs.min() - 50)) <= juice.pad
+    assert juice.process(frame, impulse=8.0)[1] == 0  # cooldown
+
+    for _ in range(30):  # the shake decays back to the untouched buffer
+        settled, _ = juice.process(frame)
+    assert settled is frame
+    assert juice.profiler.counters["hitstop_frames"] == 3
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.profiling import RenderProfiler
+from powerpit.render import RenderSettings, render_scene
+from powerpit.replay import TrajectoryHistory
+from powerpit.scene import ArenaConfig, HoleConfig, PlayerConfig, SceneConfig, TeamConfig
+from powerpit.simulation import simulate_frames
+
+
+def _scene() -> SceneConfig:
+    arena = ArenaConfig(type="circle", radius=5.0, holes=[HoleConfig(id="H1", angle=0.0, width=30.0)])
+    teams = [
+        TeamConfig(
+            name="A",
+            color=(255, 0, 0),
+            players=[
+                PlayerConfig(name="A1", spawn=(2.0, 0.0), velocity=(3.0, 0.0)),  # leaves through H1 at ~1 s
+                PlayerConfig(name="A2", spawn=(-2.0, 0.0), velocity=(0.0, 1.0)),
+            ],
+        ),
+        TeamConfig(name="B", color=(0, 255, 0), players=[PlayerConfig(name="B1", spawn=(0.0, -3.0))]),
+    ]
+    return SceneConfig(
+        name="Replay",
+        duration_seconds=2.0,
+        frame_rate=30,
+        arena=arena,
+        teams=teams,
+        ball_radius=0.4,
+        ball_mass=1.0,
+        friction=1.0,
+        restitution=1.0,
+    )
+
+
+def test_history_is_bounded_and_interpolates_captured_frames() -> None:
+    scene = _scene()
+    history = TrajectoryHistory(window=0.5, frame_rate=scene.frame_rate)
+    snapshots = list(simulate_frames(scene))
+    for snapshot in snapshots:
+        history.push(snapshot)
+
+    assert len(history) == history.capacity == 17
+    first, last = history.span
+    assert last == pytest.approx(scene.duration_seconds)
+    assert first == pytest.approx(last - 16 / scene.frame_rate)
+
+    replay = history.replay(last - 0.5, last, speed=0.5, frame_rate=scene.frame_rate)
+    assert len(replay) == 30  # 0.5 s shown at half speed
+    # Every other replay frame falls between two captured frames.
+    before, after = snapshots[-16], snapshots[-15]
+    halfway = (before.balls[1].position + after.balls[1].position) / 2
+    np.testing.assert_allclose(replay[1].balls[1].position, halfway)
+    assert replay[1].time == pytest.approx((before.time + after.time) / 2)
+    assert not replay[0].balls[0].active  # A1 was knocked out long before
+    assert replay[0].scores == [0, 1]
+
+
+def test_ko_is_replayed_in_slow_motion_without_resimulating(tmp_path: Path) -> None:
+    scene = _scene()
+    settings = RenderSettings(frame_size=(160, 120), ko_replay=True, replay_window=1.0, replay_after=0.25)
+    profiler = RenderProfiler()
+    render_scene(scene, tmp_path / "replay.mp4", settings=settings, profiler=profiler)
+
+    replayed = profiler.counters["replay_frames"]
+    assert replayed == round(1.0 / 0.75 * scene.frame_rate)
+    assert profiler.stages["simulation"].calls == scene.frame_count + 1  # no extra physics
+    assert len(imageio.mimread(tmp_path / "replay.mp4")) == scene.frame_count + replayed
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.rng import RngStreams, build_rng
+
+
+def _world_draws(seed: int, world: int) -> list[float]:
+    return build_rng(seed).child("world", world).stream("buffs").uniform(size=4).tolist()
+
+
+def test_named_streams_are_reproducible_and_independent() -> None:
+    streams = build_rng(7)
+    assert isinstance(streams, RngStreams) and streams.seed == 7
+    first = streams.stream("spawn", 0, 1).uniform(size=8)
+    streams.stream("buffs").uniform(size=1000)  # other streams do not shift it
+    np.testing.assert_array_equal(streams.stream("spawn", 0, 1).uniform(size=8), first)
+    assert not np.array_equal(streams.stream("spawn", 0, 2).uniform(size=8), first)
+    assert not np.array_equal(build_rng(8).stream("spawn", 0, 1).uniform(size=8), first)
+    assert build_rng(None).seed == 0
+
+    scoped = streams.child("world", 3)
+    np.testing.assert_array_equal(scoped.stream("buffs").normal(size=3), streams.stream("world", 3, "buffs").normal(size=3))
+    with pytest.raises(ValueError):
+        streams.stream(-1)
+
+
+def test_world_streams_do_not_depend_on_worker_count_or_order() -> None:
+    expected = [_world_draws(11, world) for world in range(4)]
+    assert [_world_draws(11, world) for world in reversed(range(4))][::-1] == expected
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert list(pool.map(_world_draws, [11] * 4, range(4))) == expected
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 import sys
 
+import numpy as np
 import pytest
 
 if __package__ is None or __package__ == "":  # Direct execution support
@@ -90,5 +91,153 @@ teams:
         load_scene_config(yaml_file)
 
 
+GENERATED_SCENE = """
+name: Crowd
+arena:
+  type: circle
+  radius: 10
+  bumpers:
+    - position: [0.0, 0.0]
+      radius: 1.0
+teams:
+  - name: A
+    color: "#FF0000"
+    players:
+      - spawn: [0.0, 5.0]
+    generators:
+      - {type: ring, count: 24, radius: 8.0, speed: 3.0, heading: inward}
+      - {type: fan, count: 10, origin: [3.0, -5.0], angle: 90, spread: 40, speed: 5.0}
+  - name: B
+    color: "#00FF00"
+    generators:
+      - {type: random, count: 150, speed: [1.0, 2.0]}
+ball_radius: 0.3
+"""
+
+
+def test_generators_expand_deterministically(tmp_path: Path) -> None:
+    yaml_file = tmp_path / "crowd.yaml"
+    yaml_file.write_text(GENERATED_SCENE, encoding="utf-8")
+
+    scene = load_scene_config(yaml_file, seed=7)
+    team_a, team_b = scene.teams
+    assert len(team_a.players) == 35
+    assert len(team_b.players) == 150
+    assert team_a.players[1].name == "A#2"
+    assert scene == load_scene_config(yaml_file, seed=7)
+    assert scene != load_scene_config(yaml_file, seed=8)
+
+    spawns = np.array([player.spawn for team in scene.teams for player in team.players])
+    dist = np.sqrt(((spawns[:, None] - spawns[None]) ** 2).sum(axis=-1))
+    np.fill_diagonal(dist, np.inf)
+    assert dist.min() >= 2 * scene.ball_radius - 1e-9
+    assert np.linalg.norm(spawns, axis=1).max() <= 10 - scene.ball_radius + 1e-9
+
+    # Each generator has its own stream: changing team B's leaves team A's spawns alone.
+    yaml_file.write_text(GENERATED_SCENE.replace("count: 150", "count: 120"), encoding="utf-8")
+    edited = load_scene_config(yaml_file, seed=7)
+    assert edited.teams[0] == team_a
+    assert [player.spawn for player in edited.teams[1].players] == [player.spawn for player in team_b.players[:120]]
+
+    ring_speed = np.linalg.norm(team_a.players[1].velocity)
+    assert ring_speed == pytest.approx(3.0)
+    assert team_a.players[1].velocity[0] < 0  # inward from angle 0
+
+
+def test_generators_reject_overcrowded_arena(tmp_path: Path) -> None:
+    yaml_file = tmp_path / "crowd.yaml"
+    yaml_file.write_text(GENERATED_SCENE.replace("count: 150", "count: 5000"), encoding="utf-8")
+
+    with pytest.raises(SceneConfigError, match="trop dense"):
+        load_scene_config(yaml_file, seed=1)
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "message"),
+    [
+        ("radius: 8.0", "radius: 9.9", "sort de l'arène"),  # ring past the wall
+        ("count: 24", "count: 100", "chevauche"),  # ring denser than a ball diameter
+        ("origin: [3.0, -5.0]", "origin: [0.0, -2.2]", "chevauche"),  # fan fired into the bumper
+        ('"#00FF00"\n', '"#00FF00"\n    players:\n      - spawn: [8.0, 0.0]\n', "chevauche"),  # later team's player
+        ("{type: random, count: 150, speed: [1.0, 2.0]}", "{type: grid, count: 4, columns: abc}", "entier"),
+    ],
+)
+def test_computed_layouts_are_validated(tmp_path: Path, old: str, new: str, message: str) -> None:
+    yaml_file = tmp_path / "crowd.yaml"
+    yaml_file.write_text(GENERATED_SCENE.replace(old, new), encoding="utf-8")
+
+    with pytest.raises(SceneConfigError, match=message):
+        load_scene_config(yaml_file, seed=1)
+
+
+def test_buffs_are_parsed_with_defaults(tmp_path: Path) -> None:
+    base = """
+name: Buffs
+arena:
+  type: circle
+  radius: 8
+buffs:
+{buffs}
+teams:
+  - name: A
+    color: "#FFFFFF"
+    players:
+      - spawn: [0, 0]
+"""
+    yaml_file = tmp_path / "scene.yaml"
+    yaml_file.write_text(base.format(buffs="  spawn_every: [2, 4]\n  max_tokens: 2"), encoding="utf-8")
+    scene = load_scene_config(yaml_file, seed=5)
+    assert scene.seed == 5
+    assert scene.buffs is not None
+    assert scene.buffs.spawn_every == (2.0, 4.0)
+    assert scene.buffs.max_tokens == 2
+    assert [buff.kind for buff in scene.buffs.types] == ["speed", "mass", "life"]
+
+    yaml_file.write_text(
+        base.format(buffs="  spawn_every: 3\n  types:\n    - {id: speed, factor: 2, cap: 3, duration: 1}"),
+        encoding="utf-8",
+    )
+    buffs = load_scene_config(yaml_file).buffs
+    assert buffs is not None and buffs.spawn_every == (3.0, 3.0)
+    assert [(buff.kind, buff.factor, buff.cap, buff.duration) for buff in buffs.types] == [("speed", 2.0, 3.0, 1.0)]
+
+    yaml_file.write_text(base.format(buffs="  types:\n    - {id: teleport}"), encoding="utf-8")
+    with pytest.raises(SceneConfigError, match="teleport"):
+        load_scene_config(yaml_file)
+
+
 if __name__ == "__main__":  # pragma: no cover - convenience execution
     raise SystemExit(pytest.main([__file__]))
+
+
+def test_holes_are_parsed_and_validated(tmp_path: Path) -> None:
+    base = """
+name: Holes
+v_min_ko: 2.5
+arena:
+  type: circle
+  radius: 8
+  holes:
+{holes}
+teams:
+  - name: A
+    color: "#FFFFFF"
+    players:
+      - spawn: [0, 0]
+"""
+    yaml_file = tmp_path / "scene.yaml"
+    yaml_file.write_text(
+        base.format(holes="    - {id: H1, angle: -20, width: 28}\n    - {angle: 160, width: 32}"), encoding="utf-8"
+    )
+    scene = load_scene_config(yaml_file)
+    assert scene.v_min_ko == 2.5
+    assert [(hole.id, hole.angle, hole.width) for hole in scene.arena.holes] == [
+        ("H1", 340.0, 28.0),
+        ("H2", 160.0, 32.0),
+    ]
+
+    yaml_file.write_text(
+        base.format(holes="    - {angle: 10, width: 30}\n    - {angle: 35, width: 30}"), encoding="utf-8"
+    )
+    with pytest.raises(SceneConfigError, match="chevauchent"):
+        load_scene_config(yaml_file)
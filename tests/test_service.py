@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.service import RenderClient, RenderServer, RenderService, ServiceError
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _fake_runner(scene: str, seed: int | None, output: str) -> str:
+    """Record the start order in the output directory instead of rendering."""
+
+    target = Path(output)
+    if scene == "slow":
+        time.sleep(30)
+    if scene == "boom":
+        raise ValueError("scène cassée")
+    target.write_text(f"{scene}:{seed}:{time.monotonic()}", encoding="utf-8")
+    return str(target)
+
+
+@pytest.fixture
+def client():
+    server = RenderServer(RenderService(workers=1, runner=_fake_runner, warm=False), port=0).start()
+    try:
+        yield RenderClient(server.url)
+    finally:
+        server.close()
+
+
+def test_priority_order_and_failure_reporting(client: RenderClient, tmp_path: Path) -> None:
+    blocker = client.submit("slow", str(tmp_path / "blocker"))
+    while client.status(blocker["id"])["status"] != "running":
+        time.sleep(0.02)
+
+    low = client.submit("low", str(tmp_path / "low"), priority=0)
+    high = client.submit("high", str(tmp_path / "high"), seed=7, priority=5)
+    broken = client.submit("boom", str(tmp_path / "boom"), priority=-1)
+
+    cancelled = client.cancel(blocker["id"])
+    assert cancelled["status"] == "cancelled"
+
+    assert client.wait(low["id"], timeout=30)["status"] == "done"
+    assert client.wait(high["id"], timeout=30)["status"] == "done"
+    failed = client.wait(broken["id"], timeout=30)
+    assert failed["status"] == "failed"
+    assert "scène cassée" in failed["error"]
+
+    high_time = float((tmp_path / "high").read_text().split(":")[2])
+    low_time = float((tmp_path / "low").read_text().split(":")[2])
+    assert high_time < low_time
+    assert not (tmp_path / "blocker").exists()
+
+
+def test_cancel_queued_job_and_unknown_job(client: RenderClient, tmp_path: Path) -> None:
+    blocker = client.submit("slow", str(tmp_path / "blocker"))
+    queued = client.submit("later", str(tmp_path / "later"))
+    assert client.cancel(queued["id"])["status"] == "cancelled"
+    client.cancel(blocker["id"])
+
+    with pytest.raises(ServiceError):
+        client.status("missing")
+    assert {job["status"] for job in client.jobs()} == {"cancelled"}
+
+
+def test_default_runner_renders_bundled_scene(tmp_path: Path) -> None:
+    scene = tmp_path / "short.yaml"
+    text = (ROOT / "scenes" / "circle_basic.yaml").read_text(encoding="utf-8")
+    scene.write_text(text.replace("duration_seconds: 12", "duration_seconds: 0.2"), encoding="utf-8")
+
+    server = RenderServer(RenderService(workers=1), port=0).start()
+    try:
+        client = RenderClient(server.url)
+        job = client.submit(str(scene), str(tmp_path / "clip.mp4"), seed=3)
+        result = client.wait(job["id"], timeout=120)
+    finally:
+        server.close()
+
+    assert result["status"] == "done", result
+    assert (tmp_path / "clip.mp4").stat().st_size > 0
+
+
+if __name__ == "__main__":  # pragma: no cover - convenience execution
+    raise SystemExit(pytest.main([__file__]))
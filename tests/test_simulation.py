@@ -9,27 +9,28 @@ import pytest
 if __package__ is None or __package__ == "":  # Direct execution support
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from powerpit.buffs import BuffEvent
 from powerpit.scene import (
     ArenaConfig,
+    BuffsConfig,
+    BuffTypeConfig,
+    HoleConfig,
     PlayerConfig,
     SceneConfig,
     TeamConfig,
 )
-from powerpit.simulation import Simulation
-
-
-def _make_scene(arena: ArenaConfig, teams: list[TeamConfig]) -> SceneConfig:
-    return SceneConfig(
-        name="Test",
-        duration_seconds=2.0,
-        frame_rate=30,
-        arena=arena,
-        teams=teams,
-        ball_radius=0.4,
-        ball_mass=1.0,
-        friction=0.999,
-        restitution=0.98,
-    )
+from powerpit.simulation import DT, Simulation
+
+
+def _make_scene(arena: ArenaConfig, teams: list[TeamConfig], **overrides: object) -> SceneConfig:
+    settings: dict[str, object] = {
+        "ball_radius": 0.4,
+        "ball_mass": 1.0,
+        "friction": 0.999,
+        "restitution": 0.98,
+        **overrides,
+    }
+    return SceneConfig(name="Test", duration_seconds=2.0, frame_rate=30, arena=arena, teams=teams, **settings)
 
 
 def test_circle_wall_bounce() -> None:
@@ -60,6 +61,126 @@ def test_circle_wall_bounce() -> None:
     assert left.velocity[0] > 0
 
 
+def test_fast_ball_through_hole_is_knocked_out_and_scores() -> None:
+    arena = ArenaConfig(type="circle", radius=5.0, holes=[HoleConfig(id="H1", angle=0.0, width=30.0)])
+    teams = [
+        TeamConfig(
+            name="A",
+            color=(255, 0, 0),
+            players=[
+                PlayerConfig(name="A1", spawn=(4.0, 0.0), velocity=(3.0, 0.0)),  # fast, facing the hole
+                PlayerConfig(name="A2", spawn=(-4.0, 0.0), velocity=(-3.0, 0.0)),  # fast, facing a wall
+            ],
+        ),
+        TeamConfig(
+            name="B",
+            color=(0, 255, 0),
+            players=[PlayerConfig(name="B1", spawn=(0.0, 4.0), velocity=(0.0, 0.0))],
+        ),
+    ]
+    sim = Simulation(_make_scene(arena, teams, v_min_ko=1.0))
+
+    for _ in range(60):
+        sim.step()
+    snapshot = sim.capture(0)
+
+    assert [event.ball_name for event in snapshot.events] == ["A1"]
+    assert snapshot.events[0].hole_id == "H1"
+    assert snapshot.events[0].speed > 1.0
+    assert snapshot.scores == [0, 1]
+    assert not snapshot.balls[0].active and snapshot.balls[1].active
+    assert np.linalg.norm(sim.balls[1].position) < arena.radius  # bounced off the wall
+    assert sim.capture(1).events == []  # events are reported once
+
+
+def test_slow_ball_bounces_off_hole() -> None:
+    arena = ArenaConfig(type="circle", radius=5.0, holes=[HoleConfig(id="H1", angle=0.0, width=30.0)])
+    teams = [
+        TeamConfig(
+            name="A",
+            color=(255, 0, 0),
+            players=[PlayerConfig(name="A1", spawn=(4.4, 0.0), velocity=(0.8, 0.0))],
+        )
+    ]
+    sim = Simulation(_make_scene(arena, teams, v_min_ko=1.0))
+    for _ in range(120):
+        sim.step()
+    assert sim.ko_events == []
+    assert sim.balls[0].velocity[0] < 0
+
+
+def test_buff_tokens_apply_timed_effects_and_extra_lives() -> None:
+    arena = ArenaConfig(type="circle", radius=5.0)
+    teams = [
+        TeamConfig(
+            name="A",
+            color=(255, 0, 0),
+            players=[
+                PlayerConfig(name="A1", spawn=(-2.0, 0.0), velocity=(1.0, 0.0)),
+                PlayerConfig(name="A2", spawn=(2.0, 0.0), velocity=(0.0, 1.0)),
+            ],
+        )
+    ]
+    buffs = BuffsConfig(
+        types=[
+            BuffTypeConfig(kind="speed", weight=1.0, duration=0.5, factor=2.0, cap=3.0),
+            BuffTypeConfig(kind="mass", weight=1.0, duration=0.5, factor=1.5, cap=2.0),
+            BuffTypeConfig(kind="life", weight=1.0),
+        ],
+        spawn_every=(100.0, 100.0),  # only the tokens placed below
+        max_tokens=3,
+    )
+    sim = Simulation(_make_scene(arena, teams, friction=1.0, buffs=buffs))
+    system = sim._buffs
+    assert system is not None
+    system.token_positions[:2] = [(-2.0, 0.0), (2.0, 0.0)]
+    system.token_kinds[:2] = [0, 1]  # speed for A1, mass for A2
+
+    sim.step()
+    snapshot = sim.capture(0)
+    assert [(event.kind, event.ball_name) for event in snapshot.events] == [("speed", "A1"), ("mass", "A2")]
+    assert all(isinstance(event, BuffEvent) for event in snapshot.events)
+    assert sim.balls[0].velocity[0] == pytest.approx(1.0)  # Speed+ leaves the stored velocity alone...
+    assert snapshot.balls[0].velocity[0] == pytest.approx(2.0)  # ...and scales the motion
+    start = float(sim.balls[0].position[0])
+    sim.step()
+    assert sim.balls[0].position[0] - start == pytest.approx(2.0 * DT)
+    assert sim.balls[1].mass == pytest.approx(1.5)
+    assert sim.inv_mass[1] == pytest.approx(1.0 / 1.5)
+    assert snapshot.tokens == []
+
+    for _ in range(61):  # just over 0.5 s: both effects expire
+        sim.step()
+    assert sim.balls[0].velocity[0] == pytest.approx(1.0)
+    assert sim.capture(1).balls[0].velocity[0] == pytest.approx(1.0)
+    assert sim.balls[1].mass == pytest.approx(1.0)
+    assert sim.inv_mass[1] == pytest.approx(1.0)
+
+    system.token_positions[2] = sim.balls[0].position
+    system.token_kinds[2] = 2  # life
+    sim.step()
+    assert len(sim.balls) == 3 and sim.balls[2].name == "A+1" and sim.inv_mass.shape == (3,)
+    assert sim.balls[2].team_index == 0
+    assert np.linalg.norm(sim.balls[2].velocity) == pytest.approx(1.0)
+    assert np.shares_memory(sim.balls[0].position, sim.positions)  # views re-pointed
+    assert sim.capture(2).events[0].kind == "life"
+
+
+def test_buff_tokens_spawn_on_schedule_inside_the_arena() -> None:
+    arena = ArenaConfig(type="circle", radius=5.0)
+    teams = [TeamConfig(name="A", color=(255, 0, 0), players=[PlayerConfig(name="A1", spawn=(0.0, 0.0))])]
+    buffs = BuffsConfig(types=[BuffTypeConfig(kind="speed", weight=1.0)], spawn_every=(0.25, 0.25), max_tokens=2)
+    sim = Simulation(_make_scene(arena, teams, buffs=buffs))
+    for _ in range(120):
+        sim.step()
+    tokens = sim.capture(0).tokens
+    assert len(tokens) == 2  # capped by max_tokens
+    for kind, (x, y) in tokens:
+        assert kind == "speed"
+        assert np.hypot(x, y) < arena.radius - buffs.token_radius
+        assert np.hypot(x, y) >= 0.4 + buffs.token_radius
+
+
 def test_ball_ball_collision_exchanges_velocity() -> None:
     arena = ArenaConfig(type="circle", radius=6.0)
     teams = [
@@ -84,6 +205,9 @@ def test_ball_ball_collision_exchanges_velocity() -> None:
     vel_b = sim.balls[1].velocity[0]
     assert vel_a < 0  # A should head left after collision
     assert vel_b > 0  # B should head right
+    # Head-on at ~6 units/s between unit masses: impulse (1 + e) * 6 / 2.
+    assert sim.capture(0).impulse == pytest.approx(1.98 * 3.0, rel=0.05)
+    assert sim.capture(1).impulse == 0.0
 
 
 def test_stadium_corner_collision() -> None:
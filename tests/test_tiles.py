@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.cache import render_key
+from powerpit.raster import BallSprite
+from powerpit.render import FrameRenderer, RenderSettings, _build_projection
+from powerpit.scene import load_scene_config
+from powerpit.simulation import simulate_frames
+from powerpit.tiles import TileGrid, tile_alignment
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _sprite(size: int) -> BallSprite:
+    alpha = np.zeros((size, size, 1), dtype=np.float32)
+    return BallSprite(rgb=np.zeros((size, size, 3), dtype=np.float32), alpha=alpha, inv_alpha=1.0 - alpha)
+
+
+def test_stamps_land_only_in_the_tiles_they_overlap() -> None:
+    grid = TileGrid(100, tile_height=30, threads=2, align=4)  # rounded up to 32-row bands
+    try:
+        assert grid.bounds == [(0, 32), (32, 64), (64, 96), (96, 100)]
+        small, tall = _sprite(8), _sprite(40)
+        stamps = [(small, 0, 10), (tall, 5, 20), (small, 7, 60), (small, 1, -4), (small, 2, 98)]
+        buckets = grid.bucket(stamps)
+        assert buckets[0] == [stamps[0], stamps[1], stamps[3]]
+        assert buckets[1] == [stamps[1], stamps[2]]  # spans two bands, drawn in the original order
+        assert buckets[2] == [stamps[2]]
+        assert buckets[3] == [stamps[4]]
+        assert grid.map(lambda index: grid.bounds[index][0]) == [0, 32, 64, 96]
+    finally:
+        grid.close()
+    assert tile_alignment(3, 2) == 6
+
+
+@pytest.mark.parametrize("threads", [2, 4])
+def test_tiled_render_matches_the_serial_one(threads: int) -> None:
+    scene = load_scene_config(ROOT / "scenes" / "crowd" / "ring_256.yaml")
+    serial = RenderSettings(frame_size=(180, 320), supersample=2, trails=True, glow=True, hud=True)
+    tiled = dataclasses.replace(serial, raster_threads=threads, tile_height=40)
+    renderers = [FrameRenderer(scene, _build_projection(scene, settings), settings) for settings in (serial, tiled)]
+    grid = renderers[1].tiles
+    assert grid is not None and grid.tile_height == 40 and len(grid) == 16
+    try:
+        for snapshot in islice(simulate_frames(scene), 0, 24, 3):
+            expected, frame = (renderer.render(snapshot) for renderer in renderers)
+            np.testing.assert_array_equal(frame, expected)
+    finally:
+        for renderer in renderers:
+            renderer.close()
+
+    counters = renderers[1].profiler.counters
+    assert counters["tiles"] == 8 * 16
+    # Bucketing: each ball is stamped in one or two bands, not in all of them.
+    assert counters["sprites"] <= counters["tile_stamps"] < 2 * counters["sprites"]
+    assert render_key(scene, 1, tiled) == render_key(scene, 1, serial)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
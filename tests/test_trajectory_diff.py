@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from pathlib import Path
+
+import imageio.v3 as iio
+import numpy as np
+import pytest
+
+if __package__ is None or __package__ == "":  # Direct execution support
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from powerpit.render import RenderSettings
+from powerpit.scene import load_scene_config
+from powerpit.simulation import KOEvent, simulate_frames
+from powerpit.trajectory_diff import compare_snapshots, diff_backends, render_diff_video
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _holes_run() -> list:
+    return list(simulate_frames(load_scene_config(ROOT / "scenes" / "circle_holes.yaml")))
+
+
+def test_vectorized_backend_passes_against_reference() -> None:
+    diff = diff_backends(load_scene_config(ROOT / "scenes" / "circle_holes.yaml"), "vectorized")
+
+    assert diff.passed
+    assert diff.frame_count == 360
+    assert diff.first_divergent_frame is None
+    assert diff.max_divergence < 1e-9
+
+
+def test_diff_reports_first_divergent_frame_and_missing_events() -> None:
+    reference = _holes_run()
+    candidate = _holes_run()
+    ko_frames = [snapshot.frame_index for snapshot in reference if snapshot.events]
+    assert ko_frames
+
+    nudged = candidate[50].balls[2]
+    nudged.position = nudged.position + np.array([0.0, 0.01])
+    dropped = candidate[ko_frames[0]]
+    dropped.events = []
+
+    diff = compare_snapshots(reference, candidate, tolerance=1e-3)
+
+    assert not diff.passed
+    assert diff.first_divergent_frame == 50
+    assert diff.divergence[50] == pytest.approx(0.01)
+    assert len(diff.event_mismatches) == 1
+    mismatch = diff.event_mismatches[0]
+    assert mismatch.key[0] == "ko"
+    assert (mismatch.reference_frame, mismatch.candidate_frame) == (ko_frames[0], None)
+
+
+def test_events_within_slack_still_match() -> None:
+    reference = _holes_run()
+    candidate = _holes_run()
+    frame = next(snapshot.frame_index for snapshot in reference if snapshot.events)
+    ko = [event for event in candidate[frame].events if isinstance(event, KOEvent)]
+    candidate[frame].events = []
+    candidate[frame + 1].events = ko + candidate[frame + 1].events
+
+    assert compare_snapshots(reference, candidate, event_slack=1).event_mismatches == []
+    assert len(compare_snapshots(reference, candidate, event_slack=0).event_mismatches) == 2
+
+
+def test_contacts_found_in_one_run_only_are_reported() -> None:
+    reference = _holes_run()
+    candidate = _holes_run()
+    touched = [snapshot for snapshot in reference if len(snapshot.contacts)]
+    bumper = next(snapshot for snapshot in touched if (snapshot.contacts[:, 1] < 0).any())
+    for snapshot in (touched[0], bumper):
+        candidate[snapshot.frame_index].contacts = snapshot.contacts[:0]
+
+    mismatches = compare_snapshots(reference, candidate, event_slack=0).event_mismatches
+
+    assert {item.key[0] for item in mismatches} == {"contact"}
+    assert {item.reference_frame for item in mismatches} == {touched[0].frame_index, bumper.frame_index}
+    assert all(item.candidate_frame is None for item in mismatches)
+    assert any(item.key[2].startswith("bumper") for item in mismatches)
+
+
+def test_side_by_side_video(tmp_path: Path) -> None:
+    scene = dataclasses.replace(load_scene_config(ROOT / "scenes" / "circle_basic.yaml"), duration_seconds=0.5)
+    reference = list(simulate_frames(scene))
+    candidate = list(simulate_frames(scene, backend="vectorized"))
+    diff = compare_snapshots(reference, candidate, names=("inhouse", "vectorized"))
+
+    output = render_diff_video(
+        scene, reference, candidate, tmp_path / "diff.mp4", diff, RenderSettings(frame_size=(96, 160))
+    )
+
+    frames = iio.imread(output)
+    assert frames.shape == (scene.frame_count, 160, 192, 3)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))